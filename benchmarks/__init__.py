@@ -0,0 +1 @@
+"""Offline benchmarks for the LightRAG MCP server against a mock LightRAG API."""
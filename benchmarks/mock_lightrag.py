@@ -0,0 +1,263 @@
+"""Stand-in LightRAG HTTP server with configurable latency, payloads and failures."""
+
+import asyncio
+import hashlib
+import json
+import random
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+_REASONS = {200: "OK", 304: "Not Modified", 404: "Not Found", 503: "Service Unavailable"}
+
+
+class MockConfig:
+    """Behaviour of the mock server."""
+
+    def __init__(
+        self,
+        latency: float = 0.005,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        response_bytes: int = 2048,
+        stream_chunks: int = 20,
+        stream_interval: float = 0.002,
+        graph_nodes: int = 2000,
+        graph_edges_per_node: int = 3,
+        documents: int = 1000,
+        seed: int = 0,
+    ):
+        """
+        Configure the mock.
+
+        Args:
+            latency: Base delay before each response, in seconds
+            jitter: Extra uniformly random delay of up to this many seconds
+            failure_rate: Fraction of requests answered with 503
+            response_bytes: Size of the ``response`` text of a query
+            stream_chunks: Number of NDJSON frames in a streamed query
+            stream_interval: Delay between streamed frames, in seconds
+            graph_nodes: Entities in the knowledge graph
+            graph_edges_per_node: Relations per entity
+            documents: Documents returned by the document listing endpoints
+            seed: Random seed for payloads, latency and failures
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.response_bytes = response_bytes
+        self.stream_chunks = stream_chunks
+        self.stream_interval = stream_interval
+        self.graph_nodes = graph_nodes
+        self.graph_edges_per_node = graph_edges_per_node
+        self.documents = documents
+        self.seed = seed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Configuration as a dict, for reports."""
+        return dict(vars(self))
+
+
+class MockLightRAG:
+    """Asyncio HTTP/1.1 server answering the LightRAG endpoints the MCP server uses."""
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1"):
+        """
+        Build payloads for the mock.
+
+        Args:
+            config: Behaviour settings (default: MockConfig())
+            host: Interface to listen on
+        """
+        self.config = config or MockConfig()
+        self.host = host
+        self.port = 0
+        self.requests: Dict[str, int] = {}
+        self.failures = 0
+        self._random = random.Random(self.config.seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._inserted = 0
+
+        rng = random.Random(self.config.seed)
+        count = self.config.graph_nodes
+        nodes = [{"id": f"Entity {i}", "labels": ["CONCEPT"]} for i in range(count)]
+        edges = [
+            {"source": f"Entity {i}", "target": f"Entity {rng.randrange(count)}"}
+            for i in range(count)
+            for _ in range(self.config.graph_edges_per_node)
+        ]
+        self.graph_body = json.dumps({"nodes": nodes, "edges": edges}).encode("utf-8")
+        self.graph_etag = '"' + hashlib.blake2b(self.graph_body, digest_size=8).hexdigest() + '"'
+        self.document_list = [
+            {"id": f"doc-{i}", "status": "processed", "summary": f"Document {i}"}
+            for i in range(self.config.documents)
+        ]
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """Start listening on a free port."""
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle keep-alive requests on one connection."""
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                await self._respond(writer, *request)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(
+        reader: asyncio.StreamReader,
+    ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Read one request, or return None when the client closed the connection."""
+        line = await reader.readline()
+        if not line:
+            return None
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks: List[bytes] = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            body = b"".join(chunks)
+        else:
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+        return method, target, headers, body
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> None:
+        """Route a request and write its response."""
+        url = urlsplit(target)
+        path = url.path
+        key = f"{method} {path}"
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        config = self.config
+        delay = config.latency + (self._random.uniform(0, config.jitter) if config.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < config.failure_rate:
+            self.failures += 1
+            await self._send(writer, 503, b'{"detail":"injected failure"}')
+            return
+
+        data: Any = None
+        if body and headers.get("content-type", "").startswith("application/json"):
+            data = json.loads(body)
+
+        if method == "POST" and path == "/query":
+            if data and data.get("stream"):
+                await self._stream_query(writer)
+                return
+            await self._send_json(writer, {"response": "x" * config.response_bytes})
+        elif method == "GET" and path == "/graph":
+            if headers.get("if-none-match") == self.graph_etag:
+                await self._send(writer, 304, b"")
+            else:
+                await self._send(writer, 200, self.graph_body, {"ETag": self.graph_etag})
+        elif method == "POST" and path == "/documents/text":
+            self._inserted += 1
+            await self._send_json(writer, {"status": "success", "id": f"new-{self._inserted}"})
+        elif method == "POST" and path == "/documents/texts":
+            texts = (data or {}).get("texts", [])
+            ids = [f"new-{self._inserted + i + 1}" for i in range(len(texts))]
+            self._inserted += len(texts)
+            await self._send_json(writer, {"status": "success", "ids": ids})
+        elif method == "POST" and path.startswith("/documents/upload"):
+            await self._send_json(writer, {"status": "success"})
+        elif method == "GET" and path == "/documents":
+            await self._send_json(writer, {"documents": self.document_list})
+        elif method == "GET" and path == "/documents/paginated":
+            query = parse_qs(url.query)
+            page = int(query.get("page", ["1"])[0])
+            size = int(query.get("page_size", ["100"])[0])
+            documents = self.document_list[(page - 1) * size : page * size]
+            await self._send_json(
+                writer,
+                {
+                    "documents": documents,
+                    "pagination": {
+                        "page": page,
+                        "page_size": size,
+                        "total_count": len(self.document_list),
+                        "has_next": page * size < len(self.document_list),
+                    },
+                },
+            )
+        elif method == "GET" and path == "/health":
+            await self._send_json(writer, {"status": "healthy"})
+        elif path.startswith("/graph/entity/") or path.startswith("/graph/relation/"):
+            await self._send_json(writer, {"status": "success", "exists": True})
+        else:
+            await self._send(writer, 404, b'{"detail":"not found"}')
+
+    async def _stream_query(self, writer: asyncio.StreamWriter) -> None:
+        """Write a chunked NDJSON query response."""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        piece = "x" * max(1, self.config.response_bytes // max(1, self.config.stream_chunks))
+        for _ in range(self.config.stream_chunks):
+            frame = (json.dumps({"response": piece}) + "\n").encode("utf-8")
+            writer.write(f"{len(frame):x}\r\n".encode("ascii") + frame + b"\r\n")
+            await writer.drain()
+            if self.config.stream_interval:
+                await asyncio.sleep(self.config.stream_interval)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, payload: Any) -> None:
+        """Write a 200 JSON response."""
+        await self._send(writer, 200, json.dumps(payload).encode("utf-8"))
+
+    @staticmethod
+    async def _send(
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Write a response with a fixed-length body."""
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+        lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(body)}")
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
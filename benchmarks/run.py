@@ -0,0 +1,300 @@
+"""Benchmark the MCP server over stdio against the mock LightRAG server.
+
+Usage:
+    python -m benchmarks.run [--workloads query,graph] [--save PATH] [--compare PATH]
+
+Each workload starts a fresh ``python -m lightrag_mcp_server`` process, drives
+it through a real MCP client session and reports startup time, throughput,
+latency percentiles and the server's peak resident memory.
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import math
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from .mock_lightrag import MockConfig, MockLightRAG
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+Call = Tuple[str, Dict[str, Any]]
+
+# name -> (extra server environment, builder of the i-th tool call)
+WORKLOADS: Dict[str, Tuple[Dict[str, str], Callable[[int, MockConfig], Call]]] = {
+    "ingest": (
+        {},
+        lambda i, config: ("insert_text", {"text": f"Benchmark document {i}. " * 20}),
+    ),
+    "query": (
+        {},
+        lambda i, config: ("query_text", {"query": f"What is entity {i}?", "mode": "hybrid"}),
+    ),
+    "stream": (
+        {},
+        lambda i, config: ("query_text_stream", {"query": f"Summarize topic {i}"}),
+    ),
+    "graph": (
+        {"LIGHTRAG_GRAPH_SNAPSHOT": "true"},
+        lambda i, config: [
+            ("get_entity_neighbors", {"entity": f"Entity {i % config.graph_nodes}", "depth": 2}),
+            (
+                "find_shortest_path",
+                {"source": "Entity 0", "target": f"Entity {i % config.graph_nodes}"},
+            ),
+            ("get_entities", {"limit": 50}),
+        ][i % 3],
+    ),
+    "documents": (
+        {},
+        lambda i, config: ("get_documents", {"limit": 200}),
+    ),
+}
+
+# Metrics compared against a baseline, and whether higher values are better
+COMPARED = {
+    "throughput_rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "startup_s": False,
+    "peak_rss_mb": False,
+}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(q * len(ordered))))
+    return ordered[rank - 1]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process's children (Linux only)."""
+    peak = None
+    for path in glob.glob(f"/proc/{os.getpid()}/task/*/children"):
+        with open(path) as f:
+            pids = f.read().split()
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmHWM:"):
+                            value = int(line.split()[1]) / 1024
+                            peak = value if peak is None else max(peak, value)
+            except OSError:
+                continue
+    return peak
+
+
+def _is_error(result: Any) -> bool:
+    """Whether a tool result reports a failure."""
+    if result.isError:
+        return True
+    text = result.content[0].text if result.content else ""
+    return text.startswith(("Error executing", "Invalid arguments", "Unknown tool"))
+
+
+async def run_workload(
+    name: str,
+    requests: int,
+    concurrency: int,
+    config: MockConfig,
+    warmup: int = 5,
+) -> Dict[str, Any]:
+    """
+    Run one workload against a fresh server process.
+
+    Args:
+        name: Workload name from WORKLOADS
+        requests: Measured tool calls
+        concurrency: Tool calls in flight at once
+        config: Mock server behaviour
+        warmup: Unmeasured calls made first
+
+    Returns:
+        Report with startup time, throughput, latency percentiles and memory
+    """
+    extra_env, build = WORKLOADS[name]
+    mock = MockLightRAG(config)
+    await mock.start()
+    env = {
+        "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+        "LIGHTRAG_SERVER_URL": mock.url,
+        "LIGHTRAG_RETRY_BACKOFF": "0.01",
+        **extra_env,
+    }
+    params = StdioServerParameters(
+        command=sys.executable, args=["-m", "lightrag_mcp_server"], env=env, cwd=ROOT
+    )
+
+    latencies: List[float] = []
+    first_chunk: List[float] = []
+    errors = 0
+    try:
+        started = time.perf_counter()
+        async with stdio_client(params) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                await session.list_tools()
+                startup = time.perf_counter() - started
+
+                for i in range(warmup):
+                    await session.call_tool(*build(requests + i, config))
+
+                semaphore = asyncio.Semaphore(concurrency)
+
+                async def call(i: int) -> None:
+                    nonlocal errors
+                    tool, arguments = build(i, config)
+                    async with semaphore:
+                        sent = time.perf_counter()
+                        chunk_at: List[float] = []
+
+                        async def progress(done: float, total: Optional[float], msg: Any) -> None:
+                            if not chunk_at:
+                                chunk_at.append(time.perf_counter() - sent)
+
+                        result = await session.call_tool(
+                            tool, arguments, progress_callback=progress
+                        )
+                        latencies.append(time.perf_counter() - sent)
+                        first_chunk.extend(chunk_at)
+                        if _is_error(result):
+                            errors += 1
+
+                begin = time.perf_counter()
+                await asyncio.gather(*(call(i) for i in range(requests)))
+                elapsed = time.perf_counter() - begin
+                peak_rss = _peak_rss_mb()
+    finally:
+        await mock.close()
+
+    report: Dict[str, Any] = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "startup_s": round(startup, 4),
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+        "upstream_requests": sum(mock.requests.values()),
+        "injected_failures": mock.failures,
+    }
+    if first_chunk:
+        report["first_chunk_p50_ms"] = round(percentile(first_chunk, 0.50) * 1000, 3)
+    return report
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Find metrics that regressed by more than ``threshold`` against ``baseline``.
+
+    Returns:
+        One line per regression
+    """
+    regressions = []
+    for name, current in report["workloads"].items():
+        previous = baseline.get("workloads", {}).get(name)
+        if not previous:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(f"{name}.{metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    """Print a summary table of a report."""
+    columns = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms", "startup_s", "peak_rss_mb", "errors"]
+    print(f"{'workload':<10}" + "".join(f"{c:>16}" for c in columns))
+    for name, result in report["workloads"].items():
+        print(f"{name:<10}" + "".join(f"{str(result.get(c)):>16}" for c in columns))
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    """Run the selected workloads and handle baselines."""
+    config = MockConfig(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        failure_rate=args.failure_rate,
+        response_bytes=args.response_bytes,
+        graph_nodes=args.graph_nodes,
+    )
+    report: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "mock": config.to_dict(),
+        },
+        "workloads": {},
+    }
+    for name in args.workloads.split(","):
+        report["workloads"][name] = await run_workload(
+            name, args.requests, args.concurrency, config
+        )
+
+    _print_table(report)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Saved report to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse arguments and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workloads", default=",".join(WORKLOADS))
+    parser.add_argument("--requests", type=int, default=200, help="measured calls per workload")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=5.0, help="mock latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency in ms")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--response-bytes", type=int, default=2048)
+    parser.add_argument("--graph-nodes", type=int, default=2000)
+    parser.add_argument("--save", help="write the report as JSON")
+    parser.add_argument("--compare", help="baseline report to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed relative regression"
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.workloads.split(",")) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown))}")
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
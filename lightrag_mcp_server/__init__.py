@@ -4,6 +4,18 @@ __version__ = "1.0.0"
 __author__ = "Lalit Suryan"
 __description__ = "Model Context Protocol server for LightRAG"
 
-from .server import create_server
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .server import create_server
 
 __all__ = ["create_server", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the server lazily so importing the package stays cheap."""
+    if name == "create_server":
+        from .server import create_server
+
+        return create_server
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
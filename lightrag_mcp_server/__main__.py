@@ -1,16 +1,41 @@
 """Main entry point for LightRAG MCP Server."""
 
+import argparse
 import asyncio
+import os
 import sys
-from .server import create_server
+from typing import List, Optional
 
+from .server import TRANSPORTS, create_server
 
-def main():
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options, defaulting to the environment configuration."""
+    parser = argparse.ArgumentParser(
+        prog="lightrag-mcp-server", description="Model Context Protocol server for LightRAG"
+    )
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=os.getenv("LIGHTRAG_MCP_TRANSPORT", "stdio"),
+        help="stdio for one client, http to serve many sessions over streamable HTTP",
+    )
+    parser.add_argument("--host", help="HTTP bind address (default: LIGHTRAG_MCP_HOST)")
+    parser.add_argument("--port", type=int, help="HTTP port (default: LIGHTRAG_MCP_PORT)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point."""
+    args = parse_args(argv)
     try:
         # Create and run the server
         server = create_server()
-        asyncio.run(server.run())
+        if args.host:
+            server.http_host = args.host
+        if args.port:
+            server.http_port = args.port
+        asyncio.run(server.run(transport=args.transport))
     except KeyboardInterrupt:
         print("\nShutting down LightRAG MCP Server...")
         sys.exit(0)
@@ -0,0 +1,147 @@
+"""Client-side batching of single-text inserts."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+BatchSender = Callable[[List[Dict[str, Any]]], Awaitable[Any]]
+
+
+class InsertBatcher:
+    """Coalesce ``insert_text`` calls into ``/documents/texts`` requests.
+
+    Documents are buffered until the window elapses or the current batch size
+    or byte limit is reached. The batch size adapts to flush latency with
+    additive increase / multiplicative decrease.
+    """
+
+    def __init__(
+        self,
+        send: BatchSender,
+        window: float = 0.05,
+        max_batch: int = 64,
+        max_bytes: int = 4 * 1024 * 1024,
+        max_pending: int = 1024,
+        target_latency: float = 1.0,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            send: Coroutine that posts a list of text items and returns the response
+            window: Seconds to wait for more documents before flushing
+            max_batch: Upper bound for documents per request
+            max_bytes: Flush once buffered text reaches this many bytes
+            max_pending: Documents buffered or in flight before submitters wait
+            target_latency: Flush latency in seconds the batch size adapts to
+        """
+        self._send = send
+        self.window = window
+        self.max_batch = max_batch
+        self.max_bytes = max_bytes
+        self.target_latency = target_latency
+        self.batch_size = max(1, max_batch // 4)
+        self._buffer: List[Tuple[Dict[str, Any], "asyncio.Future[Any]"]] = []
+        self._buffer_bytes = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set["asyncio.Task[None]"] = set()
+        self._slots = asyncio.Semaphore(max_pending)
+        self.documents = 0
+        self.batches = 0
+
+    async def submit(self, text: str, description: Optional[str] = None) -> Any:
+        """
+        Queue one document and wait for its own result.
+
+        Args:
+            text: Text content to insert
+            description: Optional description of the text
+
+        Returns:
+            Per-document view of the batch response
+        """
+        await self._slots.acquire()
+        item: Dict[str, Any] = {"content": text}
+        if description:
+            item["description"] = description
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._buffer.append((item, future))
+        self._buffer_bytes += len(text.encode("utf-8"))
+        self.documents += 1
+
+        if len(self._buffer) >= self.batch_size or self._buffer_bytes >= self.max_bytes:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush_now)
+        return await future
+
+    def _flush_now(self) -> None:
+        """Start sending the current buffer in the background."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        batch, self._buffer, self._buffer_bytes = self._buffer, [], 0
+        task = asyncio.ensure_future(self._send_batch(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send_batch(
+        self, batch: List[Tuple[Dict[str, Any], "asyncio.Future[Any]"]]
+    ) -> None:
+        """Send one batch and resolve each document's future."""
+        started = time.perf_counter()
+        try:
+            result = await self._send([item for item, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e if isinstance(e, Exception) else Exception(str(e)))
+            if not isinstance(e, Exception):
+                raise
+            self._adapt(None)
+        else:
+            self._adapt(time.perf_counter() - started)
+            for index, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result(self._split(result, index, len(batch)))
+        finally:
+            self.batches += 1
+            for _ in batch:
+                self._slots.release()
+
+    @staticmethod
+    def _split(result: Any, index: int, size: int) -> Dict[str, Any]:
+        """Build the result for one document of a batch."""
+        if not isinstance(result, dict):
+            return {"response": result, "batch_size": size}
+        item = {k: v for k, v in result.items() if k != "document_ids"}
+        ids = result.get("document_ids")
+        if isinstance(ids, list) and len(ids) == size:
+            item["document_id"] = ids[index]
+        item["batch_size"] = size
+        return item
+
+    def _adapt(self, latency: Optional[float]) -> None:
+        """Grow the batch size while flushes are fast, halve it when slow or failing."""
+        if latency is not None and latency <= self.target_latency:
+            self.batch_size = min(self.max_batch, self.batch_size + 1)
+        else:
+            self.batch_size = max(1, self.batch_size // 2)
+
+    async def flush(self) -> None:
+        """Send everything buffered and wait for all in-flight batches."""
+        self._flush_now()
+        if self._flushes:
+            await asyncio.gather(*list(self._flushes), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching counters."""
+        return {
+            "documents": self.documents,
+            "batches": self.batches,
+            "batch_size": self.batch_size,
+            "buffered": len(self._buffer),
+            "in_flight_batches": len(self._flushes),
+        }
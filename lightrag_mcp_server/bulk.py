@@ -0,0 +1,90 @@
+"""Bounded-concurrency execution of many independent API operations."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+# One unit of work: (item ID, description of the request, call that performs it)
+Operation = Tuple[str, str, Callable[[], Awaitable[Any]]]
+
+
+def batch_status(succeeded: int, failed: int) -> str:
+    """Overall status of a batch from its numbers of succeeded and failed items."""
+    if not failed:
+        return "success"
+    if succeeded:
+        return "partial_success"
+    return "error"
+
+
+async def run_bulk(
+    operations: Sequence[Operation],
+    key: str,
+    max_concurrency: int = 8,
+    dry_run: bool = False,
+    stop_on_error: bool = False,
+    skip_duplicates: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run operations through a fixed pool of workers.
+
+    Operations on the same ID run one after another in input order, so later
+    changes to an item are never overtaken by earlier ones; different IDs run
+    concurrently with at most ``max_concurrency`` requests in flight.
+
+    Args:
+        operations: Work items in input order
+        key: Result field holding each item's ID
+        max_concurrency: Number of workers
+        dry_run: Only report the requests that would be sent
+        stop_on_error: Skip items not yet started once any item fails
+        skip_duplicates: Run only the first operation for a repeated ID
+
+    Returns:
+        Overall status, counts and per-item results in input order
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+    groups: Dict[str, List[int]] = {}
+    for position, (item_id, _, _) in enumerate(operations):
+        if skip_duplicates and item_id in groups:
+            results[position] = {key: item_id, "status": "skipped", "reason": "duplicate"}
+            continue
+        groups.setdefault(item_id, []).append(position)
+
+    failed = False
+
+    async def run(position: int) -> Dict[str, Any]:
+        nonlocal failed
+        item_id, request, call = operations[position]
+        if dry_run:
+            return {key: item_id, "status": "dry_run", "request": request}
+        if failed and stop_on_error:
+            return {key: item_id, "status": "skipped", "reason": "stopped after error"}
+        try:
+            return {key: item_id, "status": "success", "response": await call()}
+        except Exception as e:
+            failed = True
+            return {key: item_id, "status": "error", "error": str(e)}
+
+    pending = iter(groups.values())
+
+    async def worker() -> None:
+        # Workers share one iterator, so each group is taken by exactly one worker
+        for positions in pending:
+            for position in positions:
+                results[position] = await run(position)
+
+    workers = min(max(1, max_concurrency), len(groups))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+    done = [result for result in results if result is not None]
+    counts = {
+        status: sum(1 for r in done if r["status"] == status)
+        for status in ("success", "error", "skipped")
+    }
+    return {
+        "status": "dry_run" if dry_run else batch_status(counts["success"], counts["error"]),
+        "succeeded": counts["success"],
+        "failed": counts["error"],
+        "skipped": counts["skipped"],
+        "results": done,
+    }
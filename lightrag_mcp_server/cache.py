@@ -0,0 +1,89 @@
+"""In-process result cache for LightRAG query calls."""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class QueryCache:
+    """Size-bounded LRU cache with per-entry TTL for query results."""
+
+    def __init__(self, max_size: int = 128, ttl: float = 300.0):
+        """
+        Initialize the query cache.
+
+        Args:
+            max_size: Maximum number of cached entries (0 disables the cache)
+            ttl: Time-to-live of each entry in seconds
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.max_size > 0 and self.ttl > 0
+
+    @staticmethod
+    def make_key(
+        endpoint: str, data: Optional[Dict[str, Any]], workspace: Optional[str]
+    ) -> str:
+        """Build a cache key from the normalized request body and workspace."""
+        body = json.dumps(data or {}, sort_keys=True, separators=(",", ":"))
+        return f"{workspace or ''}|{endpoint}|{body}"
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached value.
+
+        Returns:
+            Tuple of (found, value)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop every cached entry."""
+        if self._entries:
+            self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -1,9 +1,47 @@
 """HTTP client for LightRAG API."""
 
+import asyncio
+import codecs
+import copy
+import hashlib
 import json
-from typing import Any, Optional, Dict, List
+import os
+import time
+from contextlib import aclosing, asynccontextmanager
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Optional, Dict, List, Tuple
+)
 import httpx
 
+from .batching import InsertBatcher
+from .bulk import Operation, batch_status, run_bulk
+from .cache import QueryCache
+from .hedging import Hedger
+from .jsonstream import ItemSink, JsonItemDecoder, iter_json_items
+from .metrics import Metrics, endpoint_label
+from .multiquery import gather_quorum, merge_results
+from .pool import PoolMonitor, build_timeout, http2_available
+from .replicas import Backend, ReplicaPool
+from .resilience import RETRY_STATUSES, CircuitOpenError, Resilience
+from .scheduler import RequestScheduler, request_lane
+from .singleflight import SingleFlight
+from .tracing import Span, Tracer
+from .upload import MultipartUpload, UploadProgress
+
+if TYPE_CHECKING:
+    from .dedup import DedupIndex
+
+# Top-level keys of graph and document responses that hold item arrays
+ITEM_LIST_KEYS = (
+    "nodes", "entities", "edges", "relationships", "relations",
+    "documents", "docs", "items", "data",
+)
+
+# Marks the end of a streamed response
+_DONE = object()
+# Marks a bare line that is not JSON, i.e. a plain-text stream
+_TEXT = object()
+
 
 class LightRAGClient:
     """Client for interacting with LightRAG API."""
@@ -14,23 +52,253 @@ class LightRAGClient:
         api_key: Optional[str] = None,
         workspace: Optional[str] = None,
         timeout: float = 300.0,
+        cache_size: int = 128,
+        cache_ttl: float = 300.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        write_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 30.0,
+        breaker_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0,
+        insert_batch_window: float = 0.0,
+        insert_batch_size: int = 64,
+        insert_batch_max_bytes: int = 4 * 1024 * 1024,
+        dedup_index: Optional["DedupIndex"] = None,
+        metrics: Optional[Metrics] = None,
+        tracer: Optional[Tracer] = None,
+        max_in_flight: Optional[int] = None,
+        lane_limits: Optional[Dict[str, int]] = None,
+        lane_aging: float = 5.0,
+        scheduler: Optional[RequestScheduler] = None,
+        stream_decode: bool = False,
+        stream_max_bytes: int = 0,
+        replica_urls: Optional[List[str]] = None,
+        balancing: str = "least_outstanding",
+        eject_after: int = 3,
+        health_probe_interval: float = 5.0,
+        hedge_queries: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_budget: float = 0.1,
     ):
         """
         Initialize LightRAG client.
 
         Args:
-            base_url: Base URL of the LightRAG server
+            base_url: Base URL of the LightRAG server; the primary that receives writes
             api_key: Optional API key for authentication
             workspace: Optional workspace name for data isolation
             timeout: Request timeout in seconds
+            cache_size: Maximum number of cached query results (0 disables caching)
+            cache_ttl: Time-to-live of cached query results in seconds
+            max_connections: Maximum number of pooled connections
+            max_keepalive_connections: Maximum number of idle keep-alive connections
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Negotiate HTTP/2 when the optional ``h2`` package is installed
+            connect_timeout: Connect timeout in seconds (default: timeout)
+            read_timeout: Read timeout in seconds (default: timeout)
+            write_timeout: Write timeout in seconds (default: timeout)
+            pool_timeout: Seconds to wait for a free pooled connection (default: timeout)
+            max_retries: Maximum retries of a failed request (0 disables retrying)
+            retry_backoff: Base delay in seconds for exponential retry backoff
+            retry_backoff_max: Upper bound for a single retry delay in seconds
+            breaker_threshold: Consecutive failures that open an endpoint group's circuit
+            breaker_reset_timeout: Seconds an open circuit waits before probing again
+            insert_batch_window: Seconds to buffer insert_text calls into one
+                /documents/texts request (0 disables batching)
+            insert_batch_size: Maximum documents per batched insert
+            insert_batch_max_bytes: Flush a batch once its text reaches this many bytes
+            dedup_index: Optional content-hash index used to skip already indexed
+                texts and files; owned and closed by the client
+            metrics: Metrics to record requests in (default: a new instance)
+            tracer: Tracer for request spans (default: tracing disabled)
+            max_in_flight: Requests in flight across all scheduler lanes
+                (default: max_connections, 0 = unlimited)
+            lane_limits: Concurrency caps per lane ("query", "read", "write",
+                "bulk"; default: {"bulk": 8})
+            lane_aging: Seconds after which a queued lower-priority request is
+                served ahead of higher-priority lanes
+            scheduler: Scheduler shared with other clients; overrides the
+                max_in_flight, lane_limits and lane_aging settings
+            stream_decode: Decode graph and document list responses item by item
+                instead of buffering the whole body
+            stream_max_bytes: Encoded size of the items kept from one
+                stream-decoded response (0 = unlimited)
+            replica_urls: Base URLs of read replicas; queries and other reads are
+                balanced across them and the primary
+            balancing: Read balancing strategy, "least_outstanding" or "ewma"
+            eject_after: Consecutive failed requests that take a node out of read
+                rotation (0 disables ejection)
+            health_probe_interval: Seconds between /health probes of all nodes,
+                which eject failed ones and bring recovered ones back
+            hedge_queries: Send a duplicate of a query_text or query_with_citation
+                request that is slower than hedge_percentile of recent queries
+            hedge_percentile: Latency percentile that triggers a hedge
+            hedge_budget: Hedges allowed per query on average
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.workspace = workspace
+        # Identity that cache and single-flight keys are scoped to
+        self.cache_scope = workspace or ""
         self.timeout = timeout
+        self.http2 = http2 and http2_available()
+
+        # HTTP client is created on first use; building its SSL context is slow
+        self._client: Optional[httpx.AsyncClient] = None
+        # Client owning the shared pool and state; views from for_session() point here
+        self._root = self
+        self._client_options: Dict[str, Any] = {
+            "timeout": build_timeout(
+                timeout,
+                connect=connect_timeout,
+                read=read_timeout,
+                write=write_timeout,
+                pool=pool_timeout,
+            ),
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            "http2": self.http2,
+        }
+        self.pool_monitor = PoolMonitor()
+
+        # Writes go to base_url; reads are balanced across it and any replicas
+        self.replicas = ReplicaPool(
+            self.base_url,
+            replica_urls,
+            strategy=balancing,
+            eject_after=eject_after,
+            probe_interval=health_probe_interval,
+        )
+
+        # Priority lanes and concurrency caps in front of the connection pool
+        self.scheduler = scheduler or RequestScheduler(
+            max_in_flight=max_connections if max_in_flight is None else max_in_flight,
+            lane_limits={"bulk": 8} if lane_limits is None else lane_limits,
+            aging=lane_aging,
+        )
+
+        # Retries and circuit breakers per endpoint group (documents, query, graph)
+        self.resilience = Resilience(
+            max_retries=max_retries,
+            backoff=retry_backoff,
+            backoff_max=retry_backoff_max,
+            breaker_threshold=breaker_threshold,
+            breaker_reset_timeout=breaker_reset_timeout,
+        )
+
+        # Optional coalescing of single-text inserts into batch requests
+        self.insert_batcher: Optional[InsertBatcher] = None
+        if insert_batch_window > 0:
+            self.insert_batcher = InsertBatcher(
+                self._post_texts,
+                window=insert_batch_window,
+                max_batch=insert_batch_size,
+                max_bytes=insert_batch_max_bytes,
+            )
+
+        self.dedup_index = dedup_index
+
+        # Incremental decoding of large list responses into bounded results
+        self.stream_decode = stream_decode
+        self.stream_max_bytes = stream_max_bytes
+
+        # Query result cache, invalidated by any write through this client or its views
+        self.query_cache = QueryCache(max_size=cache_size, ttl=cache_ttl)
+
+        # Concurrent identical reads share one upstream request
+        self.single_flight = SingleFlight()
 
-        # Create HTTP client
-        self.client = httpx.AsyncClient(timeout=timeout)
+        # Optional duplicate of slow queries; the first response wins
+        self.hedger: Optional[Hedger] = None
+        if hedge_queries:
+            self.hedger = Hedger(percentile=hedge_percentile, budget=hedge_budget)
+
+        # Request latency, status and byte counts plus component statistics
+        self.metrics = metrics or Metrics()
+        self.metrics.register("query_cache", self.query_cache.stats)
+        self.metrics.register("single_flight", self.single_flight.stats)
+        self.metrics.register("pool", self.pool_stats)
+        self.metrics.register("scheduler", self.scheduler.stats)
+        if self.replicas.replicated:
+            self.metrics.register("replicas", self.replicas.stats)
+        if self.hedger is not None:
+            self.metrics.register("hedging", self.hedger.stats)
+        self.metrics.register("resilience", self.resilience.stats)
+        if self.insert_batcher is not None:
+            self.metrics.register("insert_batcher", self.insert_batcher.stats)
+        if self.dedup_index is not None:
+            self.metrics.register("dedup", self.dedup_index.stats)
+
+        # Spans per request attempt, with trace context sent to LightRAG
+        self.tracer = tracer or Tracer()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client, created on first access and shared with session views."""
+        root = self._root
+        if root._client is None:
+            root._client = httpx.AsyncClient(**root._client_options)
+        return root._client
+
+    @client.setter
+    def client(self, value: httpx.AsyncClient) -> None:
+        self._root._client = value
+
+    @property
+    def _cache_generation(self) -> int:
+        """Number of writes seen by the shared query cache."""
+        return self.query_cache.invalidations
+
+    def for_session(
+        self,
+        workspace: Optional[str] = None,
+        api_key: Optional[str] = None,
+        dedup_index: Optional["DedupIndex"] = None,
+    ) -> "LightRAGClient":
+        """
+        Create a view of this client for another workspace or API key.
+
+        The view sends its own workspace and credentials but shares the
+        connection pool, scheduler, replicas, resilience state, metrics and
+        caches; cache and single-flight keys are scoped to its identity, so
+        results never leak between identities.
+
+        Args:
+            workspace: Workspace of the view (default: this client's workspace)
+            api_key: API key of the view (default: this client's API key)
+            dedup_index: Content-hash index of the view's workspace, owned by the view
+
+        Returns:
+            Client view; closing it only flushes its own inserts and dedup index
+        """
+        view = copy.copy(self)
+        view.workspace = workspace or self.workspace
+        view.api_key = api_key or self.api_key
+        view.cache_scope = view.workspace or ""
+        if view.api_key != self._root.api_key:
+            digest = hashlib.sha256((view.api_key or "").encode("utf-8")).hexdigest()[:16]
+            view.cache_scope = f"{view.cache_scope}|{digest}"
+        if view.workspace != self.workspace:
+            view.dedup_index = dedup_index
+        if self.insert_batcher is not None:
+            batcher = self.insert_batcher
+            view.insert_batcher = InsertBatcher(
+                view._post_texts,
+                window=batcher.window,
+                max_batch=batcher.max_batch,
+                max_bytes=batcher.max_bytes,
+            )
+        return view
 
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with authentication and workspace."""
@@ -43,13 +311,24 @@ class LightRAGClient:
             headers["LIGHTRAG-WORKSPACE"] = self.workspace
         return headers
 
+    @staticmethod
+    def _is_write(method: str, endpoint: str) -> bool:
+        """Whether a request may change server-side data."""
+        return method != "GET" and endpoint != "/query"
+
+    @classmethod
+    def _is_idempotent(cls, method: str, endpoint: str) -> bool:
+        """Whether a request may safely be sent more than once."""
+        return method in ("PUT", "DELETE") or not cls._is_write(method, endpoint)
+
     async def _request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
-        stream: bool = False,
+        upload: Optional[MultipartUpload] = None,
+        hedge: bool = False,
     ) -> Any:
         """
         Make HTTP request to LightRAG API.
@@ -59,7 +338,8 @@ class LightRAGClient:
             endpoint: API endpoint
             data: Request body data
             params: Query parameters
-            stream: Whether to stream the response
+            upload: Streaming multipart body sent instead of ``data``
+            hedge: Race a duplicate against a slow read when hedging is enabled
 
         Returns:
             Response data
@@ -67,59 +347,607 @@ class LightRAGClient:
         Raises:
             httpx.HTTPError: If request fails
         """
-        url = f"{self.base_url}{endpoint}"
+        if self._is_write(method, endpoint):
+            try:
+                return await self._send(method, endpoint, data, params, upload)
+            finally:
+                self.query_cache.invalidate()
+
+        key = json.dumps(
+            [self.cache_scope, method, endpoint, params, data],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+        def send() -> Awaitable[Any]:
+            return self._send(method, endpoint, data, params)
+
+        hedger = self.hedger
+        if hedge and hedger is not None:
+            return await self.single_flight.do(key, lambda: hedger.run(send))
+        return await self.single_flight.do(key, send)
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        upload: Optional[MultipartUpload] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        raw: bool = False,
+    ) -> Any:
+        """
+        Send an HTTP request to the LightRAG API, retrying transient failures.
+
+        With ``raw`` the response object is returned instead of its decoded JSON,
+        and 304 Not Modified is not treated as an error.
+        """
         headers = self._get_headers()
+        if extra_headers:
+            headers.update(extra_headers)
+        body: Dict[str, Any] = {"json": data}
+        if upload is not None:
+            headers.update(upload.headers)
+            body = {"content": upload}
+        breaker = self.resilience.breaker(endpoint)
+        idempotent = self._is_idempotent(method, endpoint)
+        attempt = 0
+
+        while True:
+            try:
+                probe = breaker.before_request()
+            except CircuitOpenError as e:
+                raise Exception(f"LightRAG API request failed: {endpoint} {e}")
 
+            backend = self._backend(method, endpoint)
+            try:
+                response = await self._send_once(
+                    method, endpoint, headers, backend, params=params, **body
+                )
+                if raw and response.status_code == 304:
+                    breaker.record_success()
+                    return response
+                response.raise_for_status()
+                breaker.record_success()
+                return response if raw else response.json()
+
+            except httpx.HTTPError as e:
+                if self.resilience.is_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                delay = self.resilience.retry_delay(e, attempt, idempotent)
+                if delay is None:
+                    raise Exception(f"LightRAG API request failed: {str(e)}")
+                attempt += 1
+                await asyncio.sleep(delay)
+
+            except BaseException:
+                # Cancelled or failed for a local reason: the probe says nothing about the server
+                if probe:
+                    breaker.release_probe()
+                raise
+
+    async def _send_once(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Dict[str, str],
+        backend: Backend,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a single request attempt to ``backend``, recording it in metrics and a span."""
+        async with self._slot(method, endpoint) as (lane, wait):
+            with self._attempt_span(method, endpoint, lane, wait) as span:
+                if span is not None:
+                    headers = dict(headers)
+                    self.tracer.inject(headers, span)
+                    span.set_attribute("server.address", backend.url)
+                self.metrics.request_started(endpoint)
+                self.replicas.started(backend)
+                started = time.perf_counter()
+                response: Optional[httpx.Response] = None
+                cancelled = False
+                try:
+                    response = await self.client.request(
+                        method=method,
+                        url=f"{backend.url}{endpoint}",
+                        headers=headers,
+                        extensions={"trace": self._http_trace(span)},
+                        **kwargs,
+                    )
+                    return response
+                except asyncio.CancelledError:
+                    # e.g. the losing half of a hedged query; not a backend failure
+                    cancelled = True
+                    raise
+                finally:
+                    self._record_attempt(
+                        method, endpoint, started, response, span, backend, cancelled
+                    )
+
+    def _backend(self, method: str, endpoint: str) -> Backend:
+        """Choose the node for one request attempt, starting health probes on first use."""
+        self.replicas.start(self._check_health)
+        return self.replicas.pick(write=self._is_write(method, endpoint))
+
+    async def _check_health(self, url: str) -> bool:
+        """Probe one node's /health endpoint."""
         try:
-            if stream:
-                async with self.client.stream(
-                    method=method,
-                    url=url,
-                    json=data,
-                    params=params,
-                    headers=headers,
-                ) as response:
-                    response.raise_for_status()
-                    chunks = []
-                    async for chunk in response.aiter_text():
-                        chunks.append(chunk)
-                    return "".join(chunks)
+            response = await self.client.get(
+                f"{url}/health",
+                headers=self._get_headers(),
+                timeout=max(1.0, self.replicas.probe_interval),
+            )
+        except httpx.HTTPError:
+            return False
+        return response.status_code < 400
+
+    @asynccontextmanager
+    async def _slot(self, method: str, endpoint: str) -> AsyncIterator[Tuple[str, float]]:
+        """Hold a scheduler slot for one request attempt, yielding its lane and wait."""
+        lane = request_lane(method, endpoint)
+        async with self.scheduler.slot(lane, self.workspace or "") as wait:
+            self.metrics.request_scheduled(lane, wait)
+            yield lane, wait
+
+    def _attempt_span(
+        self, method: str, endpoint: str, lane: str, wait: float, current: bool = True
+    ) -> Any:
+        """Open a tracing span for one request attempt."""
+        attributes = {
+            "http.request.method": method,
+            "lightrag.endpoint": endpoint,
+            "lightrag.scheduler.lane": lane,
+            "lightrag.scheduler.wait_ms": round(wait * 1000, 3),
+        }
+        return self.tracer.span(
+            f"{method} {endpoint_label(endpoint)}", attributes, current=current
+        )
+
+    def _http_trace(
+        self, span: Optional[Span]
+    ) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+        """Build the httpcore trace callback for the pool monitor and ``span``."""
+        pool_trace = self.pool_monitor.tracer()
+        if span is None:
+            return pool_trace
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            span.mark(event)
+            await pool_trace(event, info)
+
+        return trace
+
+    def _record_attempt(
+        self,
+        method: str,
+        endpoint: str,
+        started: float,
+        response: Optional[httpx.Response],
+        span: Optional[Span] = None,
+        backend: Optional[Backend] = None,
+        cancelled: bool = False,
+    ) -> None:
+        """
+        Record a finished request attempt.
+
+        ``response`` is None on transport errors and when the caller cancelled
+        the attempt, which is not counted against the backend.
+        """
+        status = response.status_code if response is not None else None
+        if backend is not None:
+            if cancelled:
+                self.replicas.cancelled(backend)
             else:
-                response = await self.client.request(
-                    method=method,
-                    url=url,
-                    json=data,
-                    params=params,
-                    headers=headers,
+                self.replicas.finished(
+                    backend,
+                    time.perf_counter() - started,
+                    ok=status is not None and status < 500 and status not in RETRY_STATUSES,
                 )
-                response.raise_for_status()
-                return response.json()
+        self.metrics.request_finished(
+            method,
+            endpoint,
+            status,
+            time.perf_counter() - started,
+            sent=int(response.request.headers.get("Content-Length", 0)) if response else 0,
+            received=response.num_bytes_downloaded if response is not None else 0,
+            cancelled=cancelled,
+        )
+        if span is not None and status is not None:
+            span.set_attribute("http.response.status_code", status)
+            if status >= 400:
+                span.status = "error"
 
-        except httpx.HTTPError as e:
-            raise Exception(f"LightRAG API request failed: {str(e)}")
+    async def _stream(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream NDJSON or SSE frames from the LightRAG API as they arrive.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            data: Request body data
+
+        Yields:
+            Decoded frames; from the first bare non-JSON line on, the body is
+            treated as plain text and every line is wrapped as {"response": line}
+            with its line break and indentation kept
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        pending = ""
+        text = False
+        chunks = self._stream_bytes(method, endpoint, data)
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                lines = (pending + decoder.decode(chunk)).split("\n")
+                pending = lines.pop()
+                for line in lines:
+                    frame = None if text else self._parse_frame(line)
+                    if frame is _DONE:
+                        return
+                    if text or frame is _TEXT:
+                        text = True
+                        frame = {"response": line + "\n"}
+                    if frame is not None:
+                        yield frame
+        line = pending + decoder.decode(b"", final=True)
+        frame = None if text else self._parse_frame(line)
+        if (text or frame is _TEXT) and line:
+            yield {"response": line}
+        elif frame is not None and frame is not _DONE:
+            yield frame
+
+    @staticmethod
+    def _parse_frame(line: str) -> Any:
+        """
+        Decode one NDJSON or SSE line.
+
+        Returns:
+            The frame; None for lines without data, _DONE at the end, or _TEXT for
+            a bare line that is not JSON
+        """
+        line = line.strip()
+        sse = line.startswith("data:")
+        if sse:
+            line = line[5:].strip()
+        elif line.startswith(("event:", "id:", "retry:", ":")):
+            return None
+        if not line:
+            return None
+        if line == "[DONE]":
+            return _DONE
+        try:
+            frame = json.loads(line)
+        except ValueError:
+            if not sse:
+                return _TEXT
+            frame = {"response": line}
+        if not isinstance(frame, dict):
+            frame = {"response": frame}
+        return frame
+
+    async def _stream_bytes(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        on_response: Optional[Callable[[httpx.Response], None]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a response body from the LightRAG API as it arrives.
+
+        Failed attempts are retried until the first chunk has been yielded.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            data: Request body data
+            params: Query parameters
+            extra_headers: Headers added to the defaults
+            on_response: Called with the response once its headers arrived; a
+                304 Not Modified is then returned without body instead of failing
+
+        Yields:
+            Raw body chunks
+        """
+        headers = self._get_headers()
+        if extra_headers:
+            headers.update(extra_headers)
+        breaker = self.resilience.breaker(endpoint)
+        idempotent = self._is_idempotent(method, endpoint)
+        attempt = 0
+        yielded = False
+
+        while True:
+            try:
+                probe = breaker.before_request()
+            except CircuitOpenError as e:
+                raise Exception(f"LightRAG API request failed: {endpoint} {e}")
+
+            try:
+                async with self._slot(method, endpoint) as (lane, wait):
+                    with self._attempt_span(method, endpoint, lane, wait, current=False) as span:
+                        backend = self._backend(method, endpoint)
+                        attempt_headers = headers
+                        if span is not None:
+                            attempt_headers = dict(headers)
+                            self.tracer.inject(attempt_headers, span)
+                            span.set_attribute("server.address", backend.url)
+                        self.metrics.request_started(endpoint)
+                        self.replicas.started(backend)
+                        started = time.perf_counter()
+                        response: Optional[httpx.Response] = None
+                        try:
+                            async with self.client.stream(
+                                method=method,
+                                url=f"{backend.url}{endpoint}",
+                                json=data,
+                                params=params,
+                                headers=attempt_headers,
+                                extensions={"trace": self._http_trace(span)},
+                            ) as response:
+                                if on_response is None or response.status_code != 304:
+                                    response.raise_for_status()
+                                breaker.record_success()
+                                if on_response is not None:
+                                    on_response(response)
+                                async for chunk in response.aiter_bytes():
+                                    yielded = True
+                                    yield chunk
+                                return
+
+                        except httpx.HTTPError as e:
+                            if self.resilience.is_failure(e):
+                                breaker.record_failure()
+                            else:
+                                breaker.record_success()
+                            # Chunks already handed to the caller cannot be replayed
+                            delay = None
+                            if not yielded:
+                                delay = self.resilience.retry_delay(e, attempt, idempotent)
+                            if delay is None:
+                                raise Exception(f"LightRAG API request failed: {str(e)}")
+
+                        finally:
+                            # Completed, failed and abandoned streams are all recorded
+                            self._record_attempt(
+                                method, endpoint, started, response, span, backend
+                            )
+            except BaseException:
+                # Cancelled or failed for a local reason, possibly while queued for a slot
+                if probe:
+                    breaker.release_probe()
+                raise
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _read(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_items: int = 0,
+        max_bytes: Optional[int] = None,
+    ) -> Any:
+        """
+        GET a list-heavy endpoint, decoding its item arrays incrementally if enabled.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            max_items: Items kept per array when stream decoding (0 = all)
+            max_bytes: Encoded size of kept items (default: stream_max_bytes)
+
+        Returns:
+            Response data; stream-decoded results that hit ``max_items`` or the
+            byte budget carry a ``_truncated`` entry
+        """
+        if not self.stream_decode:
+            return await self._request("GET", endpoint, params=params)
+
+        if max_bytes is None:
+            max_bytes = self.stream_max_bytes
+        key = json.dumps(
+            [self.cache_scope, "GET", endpoint, params, max_items, max_bytes],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return await self.single_flight.do(
+            key, lambda: self._collect_items(endpoint, params, max_items, max_bytes)
+        )
+
+    async def _collect_items(
+        self, endpoint: str, params: Optional[Dict[str, Any]], max_items: int, max_bytes: int
+    ) -> Any:
+        """Decode a response item by item into a bounded sink."""
+        decoder = JsonItemDecoder(ITEM_LIST_KEYS)
+        sink = ItemSink(max_items=max_items, max_bytes=max_bytes)
+        items = iter_json_items(self._stream_bytes("GET", endpoint, params=params), decoder)
+        async with aclosing(items):
+            async for key, item in items:
+                sink.add(key, item)
+        return sink.result(decoder)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Get HTTP connection pool occupancy and acquisition wait times."""
+        return self.pool_monitor.stats(self._client)
+
+    async def _cached_query(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a query, serving repeated identical requests from the cache."""
+        if not self.query_cache.enabled:
+            return await self._request("POST", "/query", data=data, hedge=True)
+
+        key = QueryCache.make_key("/query", data, self.cache_scope)
+        found, value = self.query_cache.get(key)
+        if found:
+            return value
+
+        generation = self._cache_generation
+        result = await self._request("POST", "/query", data=data, hedge=True)
+        # Skip caching if a write completed while the query was in flight
+        if generation == self._cache_generation:
+            self.query_cache.set(key, result)
+        return result
 
     # Document Management Methods
 
+    @staticmethod
+    def _document_id(result: Any) -> Optional[str]:
+        """Extract a document ID from an insert or upload response."""
+        if isinstance(result, dict):
+            for key in ("document_id", "doc_id"):
+                if result.get(key):
+                    return str(result[key])
+        return None
+
+    @staticmethod
+    def _duplicate(known: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the result returned for content that is already indexed."""
+        return {
+            "status": "duplicate",
+            "document_id": known.get("document_id"),
+            "message": "Content already indexed; skipped",
+        }
+
+    def _remember(
+        self, content_hash: Optional[str], result: Any, document_id: Optional[str] = None
+    ) -> None:
+        """
+        Record successfully ingested content in the dedup index.
+
+        Content is only recorded with a document ID, since an entry that
+        delete_document cannot remove would mark the content as indexed forever.
+
+        Args:
+            content_hash: Hash of the ingested content
+            result: Insert or upload response
+            document_id: ID to record when the response does not carry one
+        """
+        if self.dedup_index is None or content_hash is None:
+            return
+        if isinstance(result, dict) and result.get("status") in ("error", "failure", "failed"):
+            return
+        document_id = self._document_id(result) or document_id
+        if document_id:
+            self.dedup_index.add(content_hash, document_id)
+
     async def insert_text(
         self, text: str, description: Optional[str] = None
     ) -> Dict[str, Any]:
         """Insert a single text document."""
-        data = {"text": text}
-        if description:
-            data["description"] = description
-        return await self._request("POST", "/documents/text", data=data)
+        content_hash = document_id = None
+        if self.dedup_index is not None:
+            from .dedup import hash_text, lightrag_document_id
+
+            content_hash = hash_text(text)
+            known = self.dedup_index.lookup(content_hash)
+            if known is not None:
+                return self._duplicate(known)
+            # LightRAG answers with a track_id; its document ID is derived from the content
+            document_id = lightrag_document_id(text)
+
+        if self.insert_batcher is not None:
+            result = await self.insert_batcher.submit(text, description)
+        else:
+            data = {"text": text}
+            if description:
+                data["description"] = description
+            result = await self._request("POST", "/documents/text", data=data)
+        self._remember(content_hash, result, document_id)
+        return result
+
+    async def _post_texts(self, texts: List[Dict[str, Any]]) -> Any:
+        """POST text items to the batch insert endpoint."""
+        return await self._request("POST", "/documents/texts", data={"texts": texts})
 
     async def insert_texts(self, texts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Insert multiple text documents."""
-        return await self._request("POST", "/documents/texts", data={"texts": texts})
+        if self.dedup_index is None:
+            return await self._post_texts(texts)
+        from .dedup import hash_text, lightrag_document_id
+
+        fresh: List[Dict[str, Any]] = []
+        hashes: List[str] = []
+        skipped: List[Dict[str, Any]] = []
+        first_index: Dict[str, int] = {}
+        for index, item in enumerate(texts):
+            content_hash = hash_text(str(item.get("content", "")))
+            if content_hash in first_index:
+                skipped.append(
+                    {
+                        "index": index,
+                        "status": "duplicate",
+                        "duplicate_of": first_index[content_hash],
+                    }
+                )
+                continue
+            first_index[content_hash] = index
+            known = self.dedup_index.lookup(content_hash)
+            if known is not None:
+                skipped.append({"index": index, **self._duplicate(known)})
+                continue
+            fresh.append(item)
+            hashes.append(content_hash)
+
+        if not fresh:
+            return {
+                "status": "duplicate",
+                "message": "All documents already indexed; skipped",
+                "skipped": skipped,
+            }
+
+        result = await self._post_texts(fresh)
+        ids = result.get("document_ids") if isinstance(result, dict) else None
+        for position, content_hash in enumerate(hashes):
+            if isinstance(ids, list) and len(ids) == len(hashes):
+                document_id = str(ids[position])
+            else:
+                document_id = lightrag_document_id(str(fresh[position].get("content", "")))
+            self._remember(content_hash, result, document_id)
+        if skipped and isinstance(result, dict):
+            result = {**result, "skipped": skipped}
+        return result
 
     async def upload_document(
         self,
         file_path: str,
         chunk_size: Optional[int] = None,
         chunk_overlap: Optional[int] = None,
+        progress: Optional[UploadProgress] = None,
     ) -> Dict[str, Any]:
-        """Upload a document file."""
+        """
+        Upload a document file.
+
+        Local files are streamed to the server as multipart form data in fixed-size
+        chunks; paths that do not exist locally are passed to the server as-is.
+        """
+        if os.path.isfile(file_path):
+            content_hash = document_id = None
+            if self.dedup_index is not None:
+                from .dedup import hash_file
+
+                content_hash, document_id = await hash_file(file_path)
+                known = self.dedup_index.lookup(content_hash)
+                if known is not None:
+                    return self._duplicate(known)
+
+            upload = MultipartUpload(
+                file_path,
+                fields={"chunk_size": chunk_size, "chunk_overlap": chunk_overlap},
+                progress=progress,
+            )
+            result = await self._request("POST", "/documents/upload", upload=upload)
+            self._remember(content_hash, result, document_id)
+            return result
+
         data = {"file_path": file_path}
         if chunk_size:
             data["chunk_size"] = chunk_size
@@ -127,11 +955,46 @@ class LightRAGClient:
             data["chunk_overlap"] = chunk_overlap
         return await self._request("POST", "/documents/upload", data=data)
 
-    async def upload_documents(self, file_paths: List[str]) -> Dict[str, Any]:
-        """Upload multiple documents."""
-        return await self._request(
-            "POST", "/documents/upload/batch", data={"file_paths": file_paths}
-        )
+    async def upload_documents(
+        self,
+        file_paths: List[str],
+        max_concurrency: int = 4,
+        progress: Optional[UploadProgress] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upload multiple documents concurrently.
+
+        Args:
+            file_paths: Files to upload
+            max_concurrency: Maximum number of uploads in flight
+            progress: Optional callback invoked with (file_path, bytes_sent, total_bytes)
+
+        Returns:
+            Per-file results in input order
+        """
+        if not any(os.path.isfile(path) for path in file_paths):
+            return await self._request(
+                "POST", "/documents/upload/batch", data={"file_paths": file_paths}
+            )
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def upload_one(path: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    response = await self.upload_document(path, progress=progress)
+                    return {"file_path": path, "status": "success", "response": response}
+                except Exception as e:
+                    return {"file_path": path, "status": "error", "error": str(e)}
+
+        results = await asyncio.gather(*(upload_one(path) for path in file_paths))
+        failed = sum(1 for r in results if r["status"] == "error")
+        return {
+            "status": batch_status(len(results) - failed, failed),
+            "uploaded": len(results) - failed,
+            "failed": failed,
+            "results": results,
+        }
 
     async def scan_documents(self) -> Dict[str, Any]:
         """Scan for new documents."""
@@ -139,22 +1002,132 @@ class LightRAGClient:
 
     async def get_documents(self) -> Dict[str, Any]:
         """Get all documents."""
-        return await self._request("GET", "/documents")
+        return await self._read("/documents")
 
     async def get_documents_paginated(
         self, page: int, page_size: int
     ) -> Dict[str, Any]:
         """Get documents with pagination."""
         params = {"page": page, "page_size": page_size}
-        return await self._request("GET", "/documents/paginated", params=params)
+        # Pages are already bounded; the byte budget applies to whole results only
+        return await self._read("/documents/paginated", params=params, max_bytes=0)
+
+    @staticmethod
+    def _page_documents(
+        result: Any, page: int, page_size: int
+    ) -> "tuple[List[Any], bool]":
+        """Split a paginated response into its documents and a has-next flag."""
+        documents: List[Any] = []
+        if isinstance(result, list):
+            documents = result
+        elif isinstance(result, dict):
+            for key in ("documents", "docs", "items", "data"):
+                if isinstance(result.get(key), list):
+                    documents = result[key]
+                    break
+
+        pagination = result.get("pagination") if isinstance(result, dict) else None
+        if isinstance(pagination, dict):
+            if "has_next" in pagination:
+                return documents, bool(pagination["has_next"]) and bool(documents)
+            if "total_pages" in pagination:
+                return documents, page < int(pagination["total_pages"])
+        return documents, len(documents) >= page_size
+
+    async def iter_documents(
+        self, page_size: int = 100, start_page: int = 1, prefetch: bool = True
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate over all documents page by page.
+
+        Args:
+            page_size: Documents requested per page
+            start_page: First page to fetch (1-based)
+            prefetch: Fetch the next page while the current one is consumed
+
+        Yields:
+            Individual documents
+        """
+        page = start_page
+        pending: Optional[asyncio.Future[Any]] = asyncio.ensure_future(
+            self.get_documents_paginated(page, page_size)
+        )
+        try:
+            while pending is not None:
+                result = await pending
+                pending = None
+                documents, has_next = self._page_documents(result, page, page_size)
+                if has_next:
+                    page += 1
+                    if prefetch:
+                        pending = asyncio.ensure_future(
+                            self.get_documents_paginated(page, page_size)
+                        )
+                for document in documents:
+                    yield document
+                if has_next and not prefetch:
+                    pending = asyncio.ensure_future(self.get_documents_paginated(page, page_size))
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    async def list_documents(
+        self, limit: int = 100, cursor: Optional[str] = None, page_size: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Get one bounded slice of the document list.
+
+        Args:
+            limit: Maximum number of documents to return (clamped to 1-1000)
+            cursor: Opaque cursor from a previous call's ``next_cursor``
+            page_size: Documents requested per upstream page
+
+        Returns:
+            Documents plus ``next_cursor`` (None once the list is exhausted)
+
+        Raises:
+            Exception: If ``cursor`` is not a non-negative integer
+        """
+        limit = max(1, min(limit, 1000))
+        offset = 0
+        if cursor:
+            if not (cursor.isascii() and cursor.isdigit()):
+                raise Exception(
+                    f"Invalid cursor {cursor!r}: pass a next_cursor returned by a previous call"
+                )
+            offset = int(cursor)
+        skip = offset % page_size
+        documents: List[Any] = []
+        has_more = False
+        iterator = self.iter_documents(page_size=page_size, start_page=offset // page_size + 1)
+        async with aclosing(iterator):
+            async for document in iterator:
+                if skip:
+                    skip -= 1
+                    continue
+                if len(documents) >= limit:
+                    has_more = True
+                    break
+                documents.append(document)
+        return {
+            "documents": documents,
+            "count": len(documents),
+            "next_cursor": str(offset + len(documents)) if has_more else None,
+        }
 
     async def delete_document(self, document_id: str) -> Dict[str, Any]:
         """Delete a document."""
-        return await self._request("DELETE", f"/documents/{document_id}")
+        result = await self._request("DELETE", f"/documents/{document_id}")
+        if self.dedup_index is not None:
+            self.dedup_index.remove_document(document_id)
+        return result
 
     async def clear_documents(self) -> Dict[str, Any]:
         """Clear all documents."""
-        return await self._request("DELETE", "/documents")
+        result = await self._request("DELETE", "/documents")
+        if self.dedup_index is not None:
+            self.dedup_index.clear()
+        return result
 
     async def document_status(
         self, document_id: Optional[str] = None
@@ -183,22 +1156,38 @@ class LightRAGClient:
         }
         if max_tokens:
             data["max_tokens"] = max_tokens
-        return await self._request("POST", "/query", data=data)
+        return await self._cached_query(data)
 
-    async def query_text_stream(
+    async def query_stream(
         self,
         query: str,
         mode: str = "hybrid",
         only_need_context: bool = False,
-    ) -> str:
-        """Query LightRAG with streaming response."""
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Query LightRAG, yielding response frames as they are generated."""
         data = {
             "query": query,
             "mode": mode,
             "only_need_context": only_need_context,
             "stream": True,
         }
-        return await self._request("POST", "/query", data=data, stream=True)
+        async for frame in self._stream("POST", "/query", data=data):
+            if "error" in frame:
+                raise Exception(f"LightRAG streaming query failed: {frame['error']}")
+            yield frame
+
+    async def query_text_stream(
+        self,
+        query: str,
+        mode: str = "hybrid",
+        only_need_context: bool = False,
+    ) -> str:
+        """Query LightRAG with streaming response."""
+        parts = []
+        async for frame in self.query_stream(query, mode, only_need_context):
+            if frame.get("response"):
+                parts.append(str(frame["response"]))
+        return "".join(parts)
 
     async def query_with_citation(
         self, query: str, mode: str = "hybrid"
@@ -209,13 +1198,98 @@ class LightRAGClient:
             "mode": mode,
             "with_citation": True,
         }
-        return await self._request("POST", "/query", data=data)
+        return await self._cached_query(data)
+
+    async def query_multi(
+        self,
+        query: str,
+        modes: Optional[List[str]] = None,
+        queries: Optional[List[str]] = None,
+        quorum: int = 0,
+        deadline: Optional[float] = None,
+        only_need_context: bool = False,
+        top_k: int = 60,
+        with_citation: bool = False,
+        include_responses: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Run a query in several modes (and phrasings) concurrently and merge the results.
+
+        Args:
+            query: Query text
+            modes: Query modes to run (default: naive, local and global)
+            queries: Additional phrasings of the query, each run in every mode
+            quorum: Return once this many queries succeeded (0 = wait for all)
+            deadline: Seconds after which unfinished queries are cancelled (None or 0 = none)
+            only_need_context: Return only context without generation
+            top_k: Number of top results to retrieve
+            with_citation: Ask for source citations instead of plain answers
+            include_responses: Keep each successful query's own response in its
+                ``results`` entry, not only in the merged contexts
+
+        Returns:
+            Overall status, per-query outcomes and the deduplicated contexts and
+            citations of the queries that succeeded
+        """
+        phrasings = list(dict.fromkeys([query, *(queries or [])]))
+        modes = list(dict.fromkeys(modes or ["naive", "local", "global"]))
+        runs = [(phrasing, mode) for phrasing in phrasings for mode in modes]
+
+        def call(phrasing: str, mode: str) -> Callable[[], Awaitable[Any]]:
+            if with_citation:
+                return lambda: self.query_with_citation(phrasing, mode)
+            return lambda: self.query_text(phrasing, mode, only_need_context, top_k)
+
+        started = time.monotonic()
+        outcomes = await gather_quorum([call(*run) for run in runs], quorum, deadline)
+        merged = merge_results(
+            [outcome.get("response") for outcome in outcomes], by_line=only_need_context
+        )
+        counts = {
+            status: sum(1 for outcome in outcomes if outcome["status"] == status)
+            for status in ("success", "error", "cancelled")
+        }
+        results = []
+        for (phrasing, mode), outcome in zip(runs, outcomes):
+            entry = {"query": phrasing, "mode": mode, "status": outcome["status"]}
+            entry["elapsed"] = round(outcome["elapsed"], 4)
+            if "error" in outcome:
+                entry["error"] = outcome["error"]
+            if include_responses and outcome["status"] == "success":
+                entry["response"] = outcome["response"]
+            results.append(entry)
+        if 0 < quorum <= counts["success"]:
+            # Stragglers cancelled after the quorum was reached are expected, not a failure
+            status = "success"
+        else:
+            status = batch_status(counts["success"], counts["error"] + counts["cancelled"])
+        return {
+            "status": status,
+            "succeeded": counts["success"],
+            "failed": counts["error"],
+            "cancelled": counts["cancelled"],
+            "elapsed": round(time.monotonic() - started, 4),
+            "results": results,
+            **merged,
+        }
 
     # Knowledge Graph Methods
 
     async def get_knowledge_graph(self) -> Dict[str, Any]:
         """Get the complete knowledge graph."""
-        return await self._request("GET", "/graph")
+        return await self._read("/graph")
+
+    async def get_knowledge_graph_response(
+        self, etag: Optional[str] = None
+    ) -> httpx.Response:
+        """
+        Fetch the knowledge graph as a raw response, revalidating ``etag`` if given.
+
+        Returns:
+            The response; status 304 means the graph is unchanged since ``etag``
+        """
+        extra_headers = {"If-None-Match": etag} if etag else None
+        return await self._send("GET", "/graph", None, None, extra_headers=extra_headers, raw=True)
 
     async def get_graph_structure(self) -> Dict[str, Any]:
         """Get knowledge graph structure and statistics."""
@@ -224,12 +1298,12 @@ class LightRAGClient:
     async def get_entities(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Get all entities."""
         params = {"limit": limit} if limit else None
-        return await self._request("GET", "/graph/entities", params=params)
+        return await self._read("/graph/entities", params=params, max_items=limit or 0)
 
     async def get_relations(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Get all relationships."""
         params = {"limit": limit} if limit else None
-        return await self._request("GET", "/graph/relations", params=params)
+        return await self._read("/graph/relations", params=params, max_items=limit or 0)
 
     async def check_entity_exists(self, entity_name: str) -> Dict[str, Any]:
         """Check if an entity exists."""
@@ -251,6 +1325,104 @@ class LightRAGClient:
         """Delete a relation."""
         return await self._request("DELETE", f"/graph/relation/{relation_id}")
 
+    async def update_entities(
+        self,
+        updates: List[Dict[str, Any]],
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        stop_on_error: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Update many entities concurrently.
+
+        Args:
+            updates: Items with ``entity_id`` and ``properties``; updates to the
+                same entity are applied in order
+            max_concurrency: Maximum number of requests in flight
+            dry_run: Only report the requests that would be sent
+            stop_on_error: Skip remaining updates after the first failure
+
+        Returns:
+            Overall status and per-entity results in input order
+        """
+        operations: List[Operation] = [
+            (
+                update["entity_id"],
+                f"PUT /graph/entity/{update['entity_id']}",
+                lambda update=update: self.update_entity(
+                    update["entity_id"], update["properties"]
+                ),
+            )
+            for update in updates
+        ]
+        return await run_bulk(
+            operations, "entity_id", max_concurrency, dry_run, stop_on_error
+        )
+
+    async def delete_entities(
+        self,
+        entity_ids: List[str],
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        stop_on_error: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Delete many entities concurrently; repeated IDs are deleted once.
+
+        Args:
+            entity_ids: Entities to delete
+            max_concurrency: Maximum number of requests in flight
+            dry_run: Only report the requests that would be sent
+            stop_on_error: Skip remaining deletions after the first failure
+
+        Returns:
+            Overall status and per-entity results in input order
+        """
+        operations: List[Operation] = [
+            (
+                entity_id,
+                f"DELETE /graph/entity/{entity_id}",
+                lambda entity_id=entity_id: self.delete_entity(entity_id),
+            )
+            for entity_id in entity_ids
+        ]
+        return await run_bulk(
+            operations, "entity_id", max_concurrency, dry_run, stop_on_error,
+            skip_duplicates=True,
+        )
+
+    async def delete_relations(
+        self,
+        relation_ids: List[str],
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        stop_on_error: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Delete many relations concurrently; repeated IDs are deleted once.
+
+        Args:
+            relation_ids: Relations to delete
+            max_concurrency: Maximum number of requests in flight
+            dry_run: Only report the requests that would be sent
+            stop_on_error: Skip remaining deletions after the first failure
+
+        Returns:
+            Overall status and per-relation results in input order
+        """
+        operations: List[Operation] = [
+            (
+                relation_id,
+                f"DELETE /graph/relation/{relation_id}",
+                lambda relation_id=relation_id: self.delete_relation(relation_id),
+            )
+            for relation_id in relation_ids
+        ]
+        return await run_bulk(
+            operations, "relation_id", max_concurrency, dry_run, stop_on_error,
+            skip_duplicates=True,
+        )
+
     # System Management Methods
 
     async def get_health(self) -> Dict[str, Any]:
@@ -275,8 +1447,19 @@ class LightRAGClient:
         return await self._request("GET", "/workspace/info")
 
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Flush buffered inserts, stop health probes and close the HTTP client."""
+        if self.insert_batcher is not None:
+            await self.insert_batcher.flush()
+        if self._root is not self:
+            # Shared resources belong to the root client
+            if self.dedup_index is not None and self.dedup_index is not self._root.dedup_index:
+                self.dedup_index.close()
+            return
+        await self.replicas.close()
+        if self._client is not None:
+            await self._client.aclose()
+        if self.dedup_index is not None:
+            self.dedup_index.close()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -0,0 +1,147 @@
+"""Persistent content-hash index used to skip re-ingesting known documents."""
+
+import asyncio
+import codecs
+import hashlib
+import os
+import re
+import sqlite3
+import unicodedata
+from typing import Any, Dict, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def hash_text(text: str) -> str:
+    """Hash text after Unicode and whitespace normalization."""
+    normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return "text:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def lightrag_document_id(text: str) -> str:
+    """ID LightRAG assigns to inserted text: ``doc-`` plus the MD5 of the stripped content."""
+    return "doc-" + hashlib.md5(text.strip().encode("utf-8")).hexdigest()
+
+
+async def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> Tuple[str, Optional[str]]:
+    """
+    Hash a file's bytes, reading it in chunks off the event loop.
+
+    The LightRAG document ID is derived in the same pass, like
+    ``lightrag_document_id`` for inserted text, when the file is UTF-8 text.
+
+    Returns:
+        Content hash and the document ID LightRAG assigns the file, or None for
+        files that are not UTF-8 text and whose ID depends on server-side parsing
+    """
+
+    def digest() -> Tuple[str, Optional[str]]:
+        sha = hashlib.sha256()
+        md5: Optional[Any] = hashlib.md5()
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        # Strip the text on the fly: skip leading whitespace, hold back trailing whitespace
+        started, pending = False, ""
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                sha.update(chunk)
+                if md5 is None:
+                    continue
+                try:
+                    text = decoder.decode(chunk)
+                except UnicodeDecodeError:
+                    md5 = None
+                    continue
+                if not started:
+                    text = text.lstrip()
+                    started = bool(text)
+                text = pending + text
+                body = text.rstrip()
+                pending = text[len(body) :]
+                md5.update(body.encode("utf-8"))
+        try:
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            md5 = None
+        document_id = None if md5 is None else "doc-" + md5.hexdigest()
+        return "file:" + sha.hexdigest(), document_id
+
+    return await asyncio.to_thread(digest)
+
+
+class DedupIndex:
+    """Map content hashes to LightRAG document IDs in a per-workspace SQLite file."""
+
+    def __init__(self, path: str):
+        """
+        Open or create a dedup index.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "content_hash TEXT PRIMARY KEY, document_id TEXT)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS documents_by_id ON documents (document_id)"
+        )
+        self._db.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_workspace(cls, directory: str, workspace: Optional[str]) -> "DedupIndex":
+        """Open the index file for ``workspace`` inside ``directory``."""
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", workspace or "default")
+        return cls(os.path.join(os.path.expanduser(directory), f"{name}.sqlite3"))
+
+    def lookup(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a content hash.
+
+        Returns:
+            Dict with the stored ``document_id`` (may be None), or None if unknown
+        """
+        row = self._db.execute(
+            "SELECT document_id FROM documents WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"document_id": row[0]}
+
+    def add(self, content_hash: str, document_id: Optional[str]) -> None:
+        """Record that content has been indexed."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO documents (content_hash, document_id) VALUES (?, ?)",
+            (content_hash, document_id),
+        )
+        self._db.commit()
+
+    def remove_document(self, document_id: str) -> int:
+        """Forget every hash mapped to ``document_id``."""
+        cursor = self._db.execute(
+            "DELETE FROM documents WHERE document_id = ?", (document_id,)
+        )
+        self._db.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """Forget every indexed document."""
+        self._db.execute("DELETE FROM documents")
+        self._db.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index size and lookup counters."""
+        (entries,) = self._db.execute("SELECT COUNT(*) FROM documents").fetchone()
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
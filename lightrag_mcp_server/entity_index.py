@@ -0,0 +1,160 @@
+"""Local entity-name index for exact, prefix and fuzzy lookups."""
+
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold an entity name and collapse its whitespace."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", name)).strip().casefold()
+
+
+def trigrams(key: str) -> List[str]:
+    """Padded character trigrams of a normalized name."""
+    padded = f"  {key} "
+    return [padded[i : i + 3] for i in range(len(padded) - 2)]
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between ``a`` and ``b``, capped at ``limit + 1``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class EntityNameIndex:
+    """Entity names indexed by normalized form, sorted prefix and trigram.
+
+    Names that normalize to the same key share one entry; lookups return the
+    original spellings.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        """
+        Build the index.
+
+        Args:
+            names: Entity names as stored in LightRAG
+        """
+        self.names = list(names)
+        self._exact = set(self.names)
+        by_key: Dict[str, List[str]] = {}
+        for name in self.names:
+            by_key.setdefault(normalize_name(name), []).append(name)
+        self.keys = sorted(by_key)
+        self.spellings = [by_key[key] for key in self.keys]
+        self._key_ids = {key: i for i, key in enumerate(self.keys)}
+
+        postings: Dict[str, array] = {}
+        by_length: Dict[int, array] = {}
+        for key_id, key in enumerate(self.keys):
+            lengths = by_length.get(len(key))
+            if lengths is None:
+                lengths = by_length[len(key)] = array("l")
+            lengths.append(key_id)
+            for gram in set(trigrams(key)):
+                bucket = postings.get(gram)
+                if bucket is None:
+                    bucket = postings[gram] = array("l")
+                bucket.append(key_id)
+        self._postings = postings
+        self._by_length = by_length
+
+    def exists(self, name: str) -> bool:
+        """Whether an entity with exactly this name exists."""
+        return name in self._exact
+
+    def lookup(self, name: str) -> List[str]:
+        """Names equal to ``name`` after normalization."""
+        key_id = self._key_ids.get(normalize_name(name))
+        return [] if key_id is None else list(self.spellings[key_id])
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        """Names whose normalized form starts with ``prefix``, in sorted order."""
+        key = normalize_name(prefix)
+        found: List[str] = []
+        for key_id in range(bisect_left(self.keys, key), len(self.keys)):
+            if len(found) >= limit or not self.keys[key_id].startswith(key):
+                break
+            found.extend(self.spellings[key_id])
+        return found[:limit]
+
+    def fuzzy(self, query: str, max_distance: int = 2, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Names within ``max_distance`` edits of ``query``, closest first.
+
+        Candidates are keys sharing enough trigrams with the query (an edit
+        changes at most three), so only those are compared character by character.
+        Queries too short for that bound to exclude anything are compared with
+        every key of a length within ``max_distance``.
+        """
+        key = normalize_name(query)
+        grams = set(trigrams(key))
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        needed = len(grams) - 3 * max_distance
+        if needed > 0:
+            candidates: Iterable[int] = (
+                key_id for key_id, count in shared.items() if count >= needed
+            )
+        else:
+            # A match may share no trigram at all (e.g. "ii" and "hiai")
+            candidates = (
+                key_id
+                for length in range(len(key) - max_distance, len(key) + max_distance + 1)
+                for key_id in self._by_length.get(length, ())
+            )
+
+        matches = []
+        for key_id in candidates:
+            count = shared.get(key_id, 0)
+            distance = edit_distance(key, self.keys[key_id], max_distance)
+            if distance <= max_distance:
+                matches.append((distance, -count, self.keys[key_id], key_id))
+        matches.sort()
+
+        found: List[Dict[str, Any]] = []
+        for distance, _, _, key_id in matches:
+            for name in self.spellings[key_id]:
+                found.append({"name": name, "distance": distance})
+        return found[:limit]
+
+    def check(
+        self, name: str, fuzzy: bool = False, max_distance: int = 2, max_suggestions: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Check one name, with case-insensitive matches and optional suggestions.
+
+        Returns:
+            Dict with ``exists`` plus ``matches`` and ``suggestions`` when not exact
+        """
+        result: Dict[str, Any] = {"entity_name": name, "exists": self.exists(name)}
+        if result["exists"]:
+            return result
+        matches = self.lookup(name)
+        if matches:
+            result["matches"] = matches
+        if fuzzy:
+            result["suggestions"] = self.fuzzy(name, max_distance, max_suggestions)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index sizes."""
+        return {"names": len(self.names), "keys": len(self.keys), "trigrams": len(self._postings)}
@@ -0,0 +1,533 @@
+"""Local in-memory snapshot of the LightRAG knowledge graph."""
+
+import asyncio
+import hashlib
+import heapq
+import sys
+import time
+from array import array
+from collections import deque
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .entity_index import EntityNameIndex
+from .jsonstream import JsonItemDecoder
+
+if TYPE_CHECKING:
+    from .client import LightRAGClient
+
+_NODE_LIST_KEYS = ("nodes", "entities")
+_EDGE_LIST_KEYS = ("edges", "relationships", "relations")
+_NODE_ID_KEYS = ("id", "name", "entity_name", "entity_id")
+_EDGE_ENDPOINT_KEYS = (("source", "target"), ("src_id", "tgt_id"), ("from", "to"))
+
+
+def _first_key(item: Dict[str, Any], keys: Tuple[str, ...], default: str) -> str:
+    """Return the first of ``keys`` present in ``item``."""
+    for key in keys:
+        if key in item:
+            return key
+    return default
+
+
+class GraphSnapshot:
+    """Compact, array-backed copy of a knowledge graph.
+
+    Entity names are interned and stored once; edges are two parallel integer
+    arrays of node indices. Remaining node, edge and top-level fields are kept
+    as-is so the original payload can be rebuilt.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty snapshot."""
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.node_data: List[Optional[Dict[str, Any]]] = []
+        self.src = array("l")
+        self.dst = array("l")
+        self.edge_data: List[Optional[Dict[str, Any]]] = []
+        self.created_at = time.monotonic()
+        self._adjacency: Optional["GraphIndex"] = None
+        self._name_index: Optional[EntityNameIndex] = None
+        self._streamed: Dict[str, str] = {}
+        self.fields: Dict[str, Any] = {}
+        self._order: List[str] = []
+        self._keys = {
+            "nodes": "nodes",
+            "edges": "edges",
+            "node_id": "id",
+            "source": "source",
+            "target": "target",
+        }
+
+    @property
+    def node_count(self) -> int:
+        """Number of entities."""
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of relations."""
+        return len(self.src)
+
+    def _intern(self, name: Any) -> int:
+        """Get the index of an entity, adding it if unknown."""
+        name = sys.intern(str(name))
+        position = self.index.get(name)
+        if position is None:
+            position = len(self.names)
+            self.index[name] = position
+            self.names.append(name)
+            self.node_data.append(None)
+        return position
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "GraphSnapshot":
+        """Build a snapshot from a ``/graph`` response."""
+        snapshot = cls()
+        nodes: List[Any] = []
+        edges: List[Any] = []
+        if isinstance(payload, dict):
+            nodes_key = _first_key(payload, _NODE_LIST_KEYS, "nodes")
+            edges_key = _first_key(payload, _EDGE_LIST_KEYS, "edges")
+            snapshot._keys["nodes"] = nodes_key
+            snapshot._keys["edges"] = edges_key
+            nodes = payload.get(nodes_key) or []
+            edges = payload.get(edges_key) or []
+            fields = {k: v for k, v in payload.items() if k not in (nodes_key, edges_key)}
+            snapshot.set_fields(fields, list(payload))
+
+        for node in nodes:
+            snapshot.add_node(node)
+        for edge in edges:
+            snapshot.add_edge(edge)
+        return snapshot
+
+    def add_item(self, key: str, item: Any) -> None:
+        """Add one item streamed from the ``key`` array of a ``/graph`` response."""
+        if key in _NODE_LIST_KEYS:
+            kind, add = "nodes", self.add_node
+        elif key in _EDGE_LIST_KEYS:
+            kind, add = "edges", self.add_edge
+        else:
+            return
+        # Like from_payload, only the first node and edge array found is used
+        if self._streamed.setdefault(kind, key) != key:
+            return
+        self._keys[kind] = key
+        add(item)
+
+    def set_fields(self, fields: Dict[str, Any], order: List[str]) -> None:
+        """Keep the top-level fields besides the node and edge arrays.
+
+        Args:
+            fields: Top-level values such as ``is_truncated``
+            order: Top-level key order of the original payload
+        """
+        self.fields = dict(fields)
+        self._order = list(order)
+
+    def add_node(self, node: Any) -> None:
+        """Add one node from a payload item."""
+        if not isinstance(node, dict):
+            self._intern(node)
+            return
+        id_key = _first_key(node, _NODE_ID_KEYS, self._keys["node_id"])
+        self._keys["node_id"] = id_key
+        position = self._intern(node.get(id_key))
+        rest = {k: v for k, v in node.items() if k != id_key}
+        self.node_data[position] = rest or None
+
+    def add_edge(self, edge: Any) -> None:
+        """Add one edge from a payload item."""
+        if not isinstance(edge, dict):
+            return
+        source_key, target_key = self._keys["source"], self._keys["target"]
+        for keys in _EDGE_ENDPOINT_KEYS:
+            if keys[0] in edge and keys[1] in edge:
+                source_key, target_key = keys
+                break
+        self._keys["source"], self._keys["target"] = source_key, target_key
+        if source_key not in edge or target_key not in edge:
+            return
+        self.src.append(self._intern(edge[source_key]))
+        self.dst.append(self._intern(edge[target_key]))
+        rest = {k: v for k, v in edge.items() if k not in (source_key, target_key)}
+        self.edge_data.append(rest or None)
+
+    def node(self, position: int) -> Dict[str, Any]:
+        """Rebuild the payload item of one node."""
+        return {self._keys["node_id"]: self.names[position], **(self.node_data[position] or {})}
+
+    def edge(self, position: int) -> Dict[str, Any]:
+        """Rebuild the payload item of one edge."""
+        return {
+            self._keys["source"]: self.names[self.src[position]],
+            self._keys["target"]: self.names[self.dst[position]],
+            **(self.edge_data[position] or {}),
+        }
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Rebuild the full ``/graph`` payload."""
+        lists = {
+            self._keys["nodes"]: [self.node(i) for i in range(self.node_count)],
+            self._keys["edges"]: [self.edge(i) for i in range(self.edge_count)],
+        }
+        payload: Dict[str, Any] = {}
+        for key in self._order:
+            if key in lists:
+                payload[key] = lists.pop(key)
+            elif key in self.fields:
+                payload[key] = self.fields[key]
+        payload.update(lists)
+        for key, value in self.fields.items():
+            payload.setdefault(key, value)
+        return payload
+
+    def entities(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """List entities, optionally limited."""
+        count = self.node_count if not limit else min(limit, self.node_count)
+        return {
+            "entities": [self.node(i) for i in range(count)],
+            "count": count,
+            "total": self.node_count,
+        }
+
+    def relations(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """List relations, optionally limited."""
+        count = self.edge_count if not limit else min(limit, self.edge_count)
+        return {
+            "relations": [self.edge(i) for i in range(count)],
+            "count": count,
+            "total": self.edge_count,
+        }
+
+    def adjacency(self) -> "GraphIndex":
+        """Get the adjacency index, building it on first use."""
+        if self._adjacency is None:
+            self._adjacency = GraphIndex(self)
+        return self._adjacency
+
+    def name_index(self) -> EntityNameIndex:
+        """Get the entity-name lookup index, building it on first use."""
+        if self._name_index is None:
+            self._name_index = EntityNameIndex(self.names)
+        return self._name_index
+
+    def structure(self) -> Dict[str, Any]:
+        """Compute graph size and degree statistics."""
+        degree = self.adjacency().degree
+        return {
+            "node_count": self.node_count,
+            "edge_count": self.edge_count,
+            "max_degree": max(degree) if self.node_count else 0,
+            "avg_degree": (2 * self.edge_count / self.node_count) if self.node_count else 0.0,
+            "isolated_nodes": sum(1 for d in degree if d == 0),
+        }
+
+
+class GraphIndex:
+    """Undirected CSR adjacency over a snapshot for local graph queries.
+
+    Neighbors of node ``i`` are ``targets[offsets[i]:offsets[i + 1]]``, and
+    ``edge_ids`` holds the snapshot edge behind each adjacency entry.
+    """
+
+    def __init__(self, snapshot: GraphSnapshot):
+        """
+        Build the index.
+
+        Args:
+            snapshot: Graph to index
+        """
+        self.snapshot = snapshot
+        count = snapshot.node_count
+        degree = array("l", [0]) * count
+        for position in range(snapshot.edge_count):
+            degree[snapshot.src[position]] += 1
+            degree[snapshot.dst[position]] += 1
+
+        offsets = array("l", [0]) * (count + 1)
+        for node in range(count):
+            offsets[node + 1] = offsets[node] + degree[node]
+        targets = array("l", [0]) * offsets[count]
+        edge_ids = array("l", [0]) * offsets[count]
+        fill = array("l", offsets[:count])
+        for position in range(snapshot.edge_count):
+            a, b = snapshot.src[position], snapshot.dst[position]
+            targets[fill[a]], edge_ids[fill[a]] = b, position
+            fill[a] += 1
+            targets[fill[b]], edge_ids[fill[b]] = a, position
+            fill[b] += 1
+
+        self.degree = degree
+        self.offsets = offsets
+        self.targets = targets
+        self.edge_ids = edge_ids
+        self._ranking: Optional[List[int]] = None
+
+    def _position(self, name: str) -> int:
+        """Look up an entity by name."""
+        position = self.snapshot.index.get(name)
+        if position is None:
+            raise ValueError(f"Unknown entity: {name}")
+        return position
+
+    def _bfs(
+        self, sources: List[int], depth: int, max_nodes: int
+    ) -> Tuple[Dict[int, int], bool]:
+        """
+        Breadth-first search from ``sources``.
+
+        Returns:
+            Tuple of (node -> hop distance, whether ``max_nodes`` cut the search short)
+        """
+        distance = {source: 0 for source in sources}
+        queue = deque(sources)
+        while queue:
+            node = queue.popleft()
+            if distance[node] >= depth:
+                continue
+            for i in range(self.offsets[node], self.offsets[node + 1]):
+                neighbor = self.targets[i]
+                if neighbor in distance:
+                    continue
+                if len(distance) >= max_nodes:
+                    return distance, True
+                distance[neighbor] = distance[node] + 1
+                queue.append(neighbor)
+        return distance, False
+
+    def neighbors(self, entity: str, depth: int = 1, limit: int = 100) -> Dict[str, Any]:
+        """
+        List entities within ``depth`` hops of ``entity``.
+
+        Args:
+            entity: Entity name
+            depth: Maximum hop distance
+            limit: Maximum number of neighbors returned
+
+        Returns:
+            Neighbors ordered by distance
+        """
+        start = self._position(entity)
+        distance, truncated = self._bfs([start], max(1, depth), limit + 1)
+        found = sorted((d, n) for n, d in distance.items() if n != start)
+        return {
+            "entity": entity,
+            "depth": depth,
+            "neighbors": [
+                {**self.snapshot.node(n), "distance": d, "degree": self.degree[n]}
+                for d, n in found[:limit]
+            ],
+            "truncated": truncated or len(found) > limit,
+        }
+
+    def subgraph(self, entities: List[str], k: int = 1, max_nodes: int = 500) -> Dict[str, Any]:
+        """
+        Get the subgraph induced by the ``k``-hop neighborhood of ``entities``.
+
+        Args:
+            entities: Seed entity names
+            k: Hop radius around the seeds
+            max_nodes: Maximum number of nodes included
+
+        Returns:
+            Nodes and the edges between them
+        """
+        seeds = [self._position(name) for name in entities]
+        distance, truncated = self._bfs(seeds, max(0, k), max_nodes)
+        edges = set()
+        for node in distance:
+            for i in range(self.offsets[node], self.offsets[node + 1]):
+                if self.targets[i] in distance:
+                    edges.add(self.edge_ids[i])
+        return {
+            "nodes": [self.snapshot.node(n) for n in distance],
+            "edges": [self.snapshot.edge(e) for e in sorted(edges)],
+            "truncated": truncated,
+        }
+
+    def shortest_path(self, source: str, target: str, max_depth: int = 6) -> Dict[str, Any]:
+        """
+        Find a shortest undirected path between two entities.
+
+        Args:
+            source: Start entity name
+            target: End entity name
+            max_depth: Maximum path length in hops
+
+        Returns:
+            Path entities and the edges along it; ``path`` is empty if none exists
+        """
+        start, goal = self._position(source), self._position(target)
+        # Bidirectional BFS: expand the smaller frontier one whole level at a time
+        forward: Dict[int, Tuple[int, int, int]] = {start: (-1, -1, 0)}
+        backward: Dict[int, Tuple[int, int, int]] = {goal: (-1, -1, 0)}
+        frontiers = [[start], [goal]]
+        meet = start if start == goal else -1
+        hops = 0
+        while meet == -1 and frontiers[0] and frontiers[1] and hops < max_depth:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            seen, other = (forward, backward) if side == 0 else (backward, forward)
+            best = None
+            level = []
+            for node in frontiers[side]:
+                depth = seen[node][2] + 1
+                for i in range(self.offsets[node], self.offsets[node + 1]):
+                    neighbor = self.targets[i]
+                    if neighbor in seen:
+                        continue
+                    seen[neighbor] = (node, self.edge_ids[i], depth)
+                    level.append(neighbor)
+                    if neighbor in other:
+                        total = depth + other[neighbor][2]
+                        if best is None or total < best[0]:
+                            best = (total, neighbor)
+            frontiers[side] = level
+            hops += 1
+            if best is not None and best[0] <= max_depth:
+                meet = best[1]
+
+        if meet == -1:
+            return {"source": source, "target": target, "path": [], "edges": [], "length": None}
+        nodes, edges = [], []
+        node = meet
+        while node != -1:
+            nodes.append(node)
+            node, edge, _ = forward[node]
+            if edge != -1:
+                edges.append(edge)
+        nodes.reverse()
+        edges.reverse()
+        node, edge, _ = backward[meet]
+        while node != -1:
+            nodes.append(node)
+            edges.append(edge)
+            node, edge, _ = backward[node]
+        return {
+            "source": source,
+            "target": target,
+            "path": [self.snapshot.names[n] for n in nodes],
+            "edges": [self.snapshot.edge(e) for e in edges],
+            "length": len(edges),
+        }
+
+    def top_entities(self, limit: int = 20) -> Dict[str, Any]:
+        """List the highest-degree entities."""
+        if self._ranking is None or len(self._ranking) < limit:
+            count = self.snapshot.node_count
+            # Keep a few extra ranks so nearby limits reuse the same selection
+            self._ranking = heapq.nlargest(
+                min(count, max(limit, 100)), range(count), key=self.degree.__getitem__
+            )
+        return {
+            "entities": [
+                {**self.snapshot.node(n), "degree": self.degree[n]} for n in self._ranking[:limit]
+            ],
+            "total": self.snapshot.node_count,
+        }
+
+
+class GraphCache:
+    """Keep a graph snapshot fresh within a maximum staleness.
+
+    A snapshot older than ``max_staleness`` seconds, or taken before a write
+    through the same client, is revalidated with ``If-None-Match`` when the
+    server sends ETags. Otherwise the graph is re-fetched and only replaced if
+    its body changed. The response is decoded into the snapshot as it streams
+    in, so the full JSON body is never held in memory.
+    """
+
+    def __init__(self, client: "LightRAGClient", max_staleness: float = 60.0):
+        """
+        Initialize the cache.
+
+        Args:
+            client: LightRAG client used to fetch the graph
+            max_staleness: Seconds a snapshot is served without revalidation
+        """
+        self.client = client
+        self.max_staleness = max_staleness
+        self._snapshot: Optional[GraphSnapshot] = None
+        self._etag: Optional[str] = None
+        self._digest: Optional[bytes] = None
+        self._checked_at = 0.0
+        self._generation = -1
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+        self.rebuilds = 0
+        self.not_modified = 0
+
+    def _fresh(self) -> bool:
+        """Whether the current snapshot may be served as-is."""
+        return (
+            self._snapshot is not None
+            and self._generation == self.client._cache_generation
+            and time.monotonic() - self._checked_at < self.max_staleness
+        )
+
+    def invalidate(self) -> None:
+        """Force revalidation on next use."""
+        self._checked_at = 0.0
+
+    async def snapshot(self) -> GraphSnapshot:
+        """Get a snapshot no older than the configured staleness."""
+        if self._fresh():
+            return self._snapshot  # type: ignore[return-value]
+        async with self._lock:
+            if not self._fresh():
+                await self._refresh()
+        return self._snapshot  # type: ignore[return-value]
+
+    async def _refresh(self) -> None:
+        """Revalidate or rebuild the snapshot."""
+        generation = self.client._cache_generation
+        etag = self._etag if self._snapshot is not None else None
+        responses: List[Any] = []
+        hasher = hashlib.blake2b(digest_size=16)
+        decoder = JsonItemDecoder(_NODE_LIST_KEYS + _EDGE_LIST_KEYS)
+        snapshot = GraphSnapshot()
+        chunks = self.client._stream_bytes(
+            "GET",
+            "/graph",
+            extra_headers={"If-None-Match": etag} if etag else None,
+            on_response=responses.append,
+        )
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                hasher.update(chunk)
+                for key, item in decoder.feed(chunk):
+                    snapshot.add_item(key, item)
+
+        self.refreshes += 1
+        self._checked_at = time.monotonic()
+        self._generation = generation
+        if responses[0].status_code == 304:
+            self.not_modified += 1
+            return
+
+        for key, item in decoder.close():
+            snapshot.add_item(key, item)
+        snapshot.set_fields(decoder.fields, decoder.order)
+        self._etag = responses[0].headers.get("ETag")
+        digest = hasher.digest()
+        if self._snapshot is not None and digest == self._digest:
+            self.not_modified += 1
+            return
+        self._digest = digest
+        self._snapshot = snapshot
+        self.rebuilds += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get snapshot size and refresh counters."""
+        snapshot = self._snapshot
+        return {
+            "nodes": snapshot.node_count if snapshot else 0,
+            "edges": snapshot.edge_count if snapshot else 0,
+            "age": time.monotonic() - self._checked_at if snapshot else None,
+            "max_staleness": self.max_staleness,
+            "refreshes": self.refreshes,
+            "rebuilds": self.rebuilds,
+            "not_modified": self.not_modified,
+        }
@@ -0,0 +1,130 @@
+"""Hedged requests: race a delayed duplicate against slow calls."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class Hedger:
+    """Send a duplicate of a call that has not finished by an adaptive latency threshold.
+
+    The threshold is a percentile of recent call latencies, so only the slowest
+    calls are hedged. Each call earns ``budget`` hedge tokens and each hedge
+    spends one, which caps duplicates at about ``budget`` times the call rate.
+    The first successful response wins and the other call is cancelled.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.1,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.01,
+        window: int = 256,
+        min_samples: int = 20,
+        max_tokens: float = 10.0,
+    ):
+        """
+        Initialize the hedger.
+
+        Args:
+            percentile: Latency percentile after which a duplicate is sent
+            budget: Hedges allowed per call on average (0.1 = at most 10% extra calls)
+            initial_delay: Threshold in seconds until ``min_samples`` latencies are known
+            min_delay: Lower bound for the threshold in seconds
+            window: Number of recent latencies the percentile is computed over
+            min_samples: Latencies needed before the percentile is used
+            max_tokens: Cap on saved-up hedge tokens, bounding hedge bursts
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_tokens = max_tokens
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.tokens = max_tokens
+        self._threshold: Optional[float] = None
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.throttled = 0
+
+    def delay(self) -> float:
+        """Seconds to wait for the first call before hedging."""
+        if len(self.samples) < self.min_samples:
+            return self.initial_delay
+        if self._threshold is None:
+            ordered = sorted(self.samples)
+            index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+            self._threshold = max(self.min_delay, ordered[index])
+        return self._threshold
+
+    def _observe(self, elapsed: float) -> None:
+        """Record the latency of a completed call."""
+        self.samples.append(elapsed)
+        self._threshold = None
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``call``, hedging it with a second invocation if it is slow.
+
+        Args:
+            call: Factory for the request; invoked once, or twice when hedged
+
+        Returns:
+            Result of the first invocation that succeeds
+
+        Raises:
+            Exception: The first invocation's error if no invocation succeeds
+        """
+        self.calls += 1
+        self.tokens = min(self.max_tokens, self.tokens + self.budget)
+        started = time.monotonic()
+        first: "asyncio.Future[T]" = asyncio.ensure_future(call())
+        pending: Set["asyncio.Future[T]"] = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.delay())
+            if not done:
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.hedged += 1
+                    pending.add(asyncio.ensure_future(call()))
+                else:
+                    self.throttled += 1
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the original call if both completed in the same step
+                for task in sorted(done, key=lambda t: t is not first):
+                    if task.exception() is None:
+                        self._observe(time.monotonic() - started)
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    if error is None or task is first:
+                        error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hedge counts, rates and the current threshold."""
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "throttled": self.throttled,
+            "hedge_rate": self.hedged / self.calls if self.calls else 0.0,
+            "win_rate": self.hedge_wins / self.hedged if self.hedged else 0.0,
+            "delay": self.delay(),
+            "tokens": self.tokens,
+        }
@@ -0,0 +1,284 @@
+"""Incremental decoding of large JSON responses, one array item at a time."""
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from .serialization import dumps_bytes
+
+Item = Tuple[str, Any]
+
+_WHITESPACE = " \t\r\n"
+
+# Characters that can continue a number which raw_decode stopped short of, e.g. at
+# "-0." or "1e" cut off by a chunk boundary
+_NUMBER_CONTINUATION = frozenset(".eE+-")
+
+# Separator after an array item: a comma, or the closing bracket
+_NEXT_ITEM = re.compile(r"[ \t\r\n]*([,\]])[ \t\r\n]*")
+
+
+class JsonItemDecoder:
+    """Decode a JSON document fed in chunks, emitting items of its top-level arrays.
+
+    Items of the arrays under ``keys`` in a top-level object (or of a top-level
+    array, reported under the key ``""``) are decoded as soon as they are
+    complete and handed out by ``feed``; only the unparsed tail of the input
+    is buffered. Other top-level values are decoded whole into ``fields``.
+    """
+
+    def __init__(self, keys: Optional[Iterable[str]] = None):
+        """
+        Initialize the decoder.
+
+        Args:
+            keys: Top-level keys whose arrays are streamed (None streams every array)
+        """
+        self.keys = None if keys is None else frozenset(keys)
+        self.fields: Dict[str, Any] = {}
+        self.order: List[str] = []
+        self.is_array = False
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "start"
+        self._key = ""
+
+    @property
+    def done(self) -> bool:
+        """Whether the whole document has been decoded."""
+        return self._state == "done"
+
+    def _streamed(self, key: str) -> bool:
+        """Whether the array under ``key`` is streamed item by item."""
+        return self.keys is None or key in self.keys
+
+    def _value(self, buffer: str, pos: int) -> Optional[Tuple[Any, int]]:
+        """Decode the value at ``pos``, or return None if it is not complete yet."""
+        try:
+            value, end = self._decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            return None
+        # A value touching the end of the buffer may continue (e.g. a longer number)
+        if end >= len(buffer) or buffer[end] in _NUMBER_CONTINUATION:
+            return None
+        return value, end
+
+    def feed(self, chunk: bytes) -> List[Item]:
+        """
+        Add input and decode what has become complete.
+
+        Args:
+            chunk: Next bytes of the document
+
+        Returns:
+            (key, item) pairs completed by this chunk
+
+        Raises:
+            ValueError: If the input is not valid JSON of the supported shape
+        """
+        self._buffer += self._text.decode(chunk)
+        return self._drain()
+
+    def close(self) -> List[Item]:
+        """
+        Finish decoding after the last chunk.
+
+        Raises:
+            ValueError: If the document is incomplete or invalid
+        """
+        # Trailing whitespace lets a final bare value be recognized as complete
+        self._buffer += self._text.decode(b"", final=True) + " "
+        items = self._drain()
+        if not self.done:
+            raise ValueError("Incomplete JSON document")
+        if self._buffer.strip():
+            raise ValueError("Unexpected data after JSON document")
+        return items
+
+    def _drain(self) -> List[Item]:
+        """Advance the state machine as far as the buffered input allows."""
+        items: List[Item] = []
+        buffer, pos = self._buffer, 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer) or self._state == "done":
+                break
+            char, state = buffer[pos], self._state
+
+            if state == "start":
+                if char == "{":
+                    self._state = "key"
+                elif char == "[":
+                    self.is_array = True
+                    self._key = ""
+                    self.order.append("")
+                    self._state = "first_item"
+                else:
+                    raise ValueError("JSON document must be an object or an array")
+                pos += 1
+            elif state == "key":
+                if char == "}":
+                    self._state = "done"
+                    pos += 1
+                    continue
+                decoded = self._value(buffer, pos)
+                if decoded is None:
+                    break
+                key, end = decoded
+                colon = end
+                while colon < len(buffer) and buffer[colon] in _WHITESPACE:
+                    colon += 1
+                if colon >= len(buffer):
+                    break
+                if not isinstance(key, str) or buffer[colon] != ":":
+                    raise ValueError(f"Expected an object key at position {pos}")
+                self._key = key
+                self.order.append(key)
+                self._state = "value"
+                pos = colon + 1
+            elif state == "value":
+                if char == "[" and self._streamed(self._key):
+                    self.fields.pop(self._key, None)
+                    self._state = "first_item"
+                    pos += 1
+                    continue
+                decoded = self._value(buffer, pos)
+                if decoded is None:
+                    break
+                self.fields[self._key], pos = decoded
+                self._state = "next_key"
+            elif state == "next_key":
+                if char not in ",}":
+                    raise ValueError(f"Expected ',' or '}}' at position {pos}")
+                self._state = "key" if char == "," else "done"
+                pos += 1
+            elif state in ("first_item", "item"):
+                if char == "]" and state == "first_item":
+                    self._state = "done" if self.is_array else "next_key"
+                    pos += 1
+                    continue
+                pos = self._items(buffer, pos, items)
+                if self._state in ("item", "next_item"):
+                    break
+            else:  # next_item
+                if char not in ",]":
+                    raise ValueError(f"Expected ',' or ']' at position {pos}")
+                if char == ",":
+                    self._state = "item"
+                else:
+                    self._state = "done" if self.is_array else "next_key"
+                pos += 1
+        self._buffer = buffer[pos:]
+        return items
+
+    def _items(self, buffer: str, pos: int, items: List[Item]) -> int:
+        """Decode consecutive array items starting at ``pos``; returns the new position."""
+        key, raw_decode, size = self._key, self._decoder.raw_decode, len(buffer)
+        while True:
+            try:
+                item, end = raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                self._state = "item"
+                return pos
+            if end >= size or buffer[end] in _NUMBER_CONTINUATION:
+                self._state = "item"
+                return pos
+            items.append((key, item))
+            match = _NEXT_ITEM.match(buffer, end)
+            if match is None:
+                self._state = "next_item"
+                return end
+            if match.group(1) == "]":
+                self._state = "done" if self.is_array else "next_key"
+                return match.end()
+            pos = match.end()
+
+
+async def iter_json_items(
+    chunks: AsyncIterable[bytes], decoder: JsonItemDecoder
+) -> AsyncIterator[Item]:
+    """
+    Decode a chunked JSON document, yielding array items as they complete.
+
+    Args:
+        chunks: Body chunks, e.g. from ``httpx.Response.aiter_bytes()``
+        decoder: Decoder that also collects the document's other fields
+
+    Yields:
+        (key, item) pairs in document order
+    """
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+    for item in decoder.close():
+        yield item
+
+
+class ItemSink:
+    """Keep streamed items up to an item count and encoded-size budget.
+
+    Items past the budget are counted but not stored, so a response of any
+    size is reduced to a bounded result without being held in memory.
+    """
+
+    def __init__(self, max_items: int = 0, max_bytes: int = 0):
+        """
+        Initialize the sink.
+
+        Args:
+            max_items: Items kept per array (0 = unlimited)
+            max_bytes: Encoded bytes kept across all arrays (0 = unlimited)
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.items: Dict[str, List[Any]] = {}
+        self.totals: Dict[str, int] = {}
+        self.kept_bytes = 0
+        self.full = False
+
+    @property
+    def truncated(self) -> bool:
+        """Whether any item was dropped."""
+        return any(self.totals[key] > len(self.items[key]) for key in self.totals)
+
+    def add(self, key: str, item: Any) -> None:
+        """Offer one item from the array under ``key``."""
+        kept = self.items.setdefault(key, [])
+        self.totals[key] = self.totals.get(key, 0) + 1
+        if self.full or (self.max_items and len(kept) >= self.max_items):
+            return
+        if self.max_bytes:
+            size = len(dumps_bytes(item)) + 1
+            if self.kept_bytes + size > self.max_bytes:
+                # Later items of other arrays are dropped too, keeping the budget global
+                self.full = True
+                return
+            self.kept_bytes += size
+        kept.append(item)
+
+    def result(self, decoder: JsonItemDecoder) -> Any:
+        """
+        Assemble the response with the kept items in place of the full arrays.
+
+        Truncated results carry a ``_truncated`` entry with kept and total counts.
+        """
+        if decoder.is_array:
+            result: Any = self.items.get("", [])
+        else:
+            result = {
+                key: self.items.get(key, []) if key in self.totals or key not in decoder.fields
+                else decoder.fields[key]
+                for key in decoder.order
+            }
+        if not self.truncated:
+            return result
+        info = {
+            "kept": {key: len(items) for key, items in self.items.items()},
+            "total": dict(self.totals),
+        }
+        if isinstance(result, dict):
+            return {**result, "_truncated": info}
+        return {"result": result, "_truncated": info}
@@ -0,0 +1,372 @@
+"""In-process metrics with Prometheus/OpenMetrics text export."""
+
+import asyncio
+import math
+import re
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow LLM queries
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# name -> (type, help)
+_FAMILIES: Dict[str, Tuple[str, str]] = {
+    "lightrag_mcp_tool_calls": ("counter", "MCP tool calls by outcome"),
+    "lightrag_mcp_tool_duration_seconds": ("histogram", "MCP tool call latency"),
+    "lightrag_mcp_tool_in_flight": ("gauge", "MCP tool calls in progress"),
+    "lightrag_mcp_requests": ("counter", "LightRAG API request attempts by status class"),
+    "lightrag_mcp_request_duration_seconds": ("histogram", "LightRAG API request latency"),
+    "lightrag_mcp_requests_in_flight": ("gauge", "LightRAG API requests in progress"),
+    "lightrag_mcp_request_bytes": ("counter", "Bytes sent to the LightRAG API"),
+    "lightrag_mcp_response_bytes": ("counter", "Bytes received from the LightRAG API"),
+    "lightrag_mcp_scheduler_wait_seconds": (
+        "histogram",
+        "Time LightRAG API requests waited for a scheduler slot",
+    ),
+}
+
+_UNSAFE = re.compile(r"[^a-zA-Z0-9_]")
+
+# Endpoints ending in an ID are reported under one template to bound label cardinality
+_STATIC_ENDPOINTS = frozenset(
+    [
+        "/query", "/query/stream", "/documents", "/documents/text", "/documents/texts",
+        "/documents/upload", "/documents/upload/batch", "/documents/scan",
+        "/documents/paginated", "/documents/status", "/graph", "/graph/structure",
+        "/graph/entities", "/graph/relations", "/graph/entity/exists", "/health",
+        "/status", "/cache/clear", "/config", "/workspace/info",
+    ]
+)
+_ID_PREFIXES = (
+    ("/graph/entity/", "/graph/entity/{id}"),
+    ("/graph/relation/", "/graph/relation/{id}"),
+    ("/documents/", "/documents/{id}"),
+)
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Map an API endpoint to a low-cardinality metric label."""
+    if endpoint in _STATIC_ENDPOINTS:
+        return endpoint
+    for prefix, template in _ID_PREFIXES:
+        if endpoint.startswith(prefix):
+            return template + ("/status" if endpoint.endswith("/status") else "")
+    return "other"
+
+
+def status_class(status: Optional[int]) -> str:
+    """Group an HTTP status code as 2xx/4xx/5xx, or "error" if no response arrived."""
+    return "error" if status is None else f"{status // 100}xx"
+
+
+def _labels(**labels: str) -> Labels:
+    """Build a hashable, ordered label set."""
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    """Render a label set as ``{key="value",...}``."""
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    """Render a sample value."""
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Create an empty histogram.
+
+        Args:
+            buckets: Sorted upper bounds; an implicit +Inf bucket is added
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean and estimated percentiles."""
+        return {
+            "count": self.count,
+            "avg": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Metrics:
+    """Counters, gauges and histograms for tool calls and LightRAG requests.
+
+    Component statistics (caches, pool, breakers) are pulled from registered
+    collectors at export time instead of being pushed on every change.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Initialize empty metrics.
+
+        Args:
+            buckets: Latency histogram bucket bounds in seconds
+        """
+        self.buckets = buckets
+        self.values: Dict[str, Dict[Labels, float]] = {name: {} for name in _FAMILIES}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {
+            name: {} for name, (kind, _) in _FAMILIES.items() if kind == "histogram"
+        }
+        self.collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def add(self, name: str, labels: Labels, amount: float = 1) -> None:
+        """Increment a counter or move a gauge."""
+        series = self.values[name]
+        series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """Record a histogram value."""
+        series = self.histograms[name]
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def register(self, name: str, collector: Callable[[], Dict[str, Any]]) -> None:
+        """Export the numeric fields of ``collector()`` as ``lightrag_mcp_<name>_*`` gauges."""
+        self.collectors[name] = collector
+
+    def tool_started(self, tool: str) -> None:
+        """Mark a tool call as in progress."""
+        self.add("lightrag_mcp_tool_in_flight", _labels(tool=tool))
+
+    def tool_finished(self, tool: str, outcome: str, elapsed: float) -> None:
+        """Record a finished tool call ("ok", "error" or "invalid")."""
+        labels = _labels(tool=tool)
+        self.add("lightrag_mcp_tool_in_flight", labels, -1)
+        self.add("lightrag_mcp_tool_calls", _labels(tool=tool, outcome=outcome))
+        self.observe("lightrag_mcp_tool_duration_seconds", labels, elapsed)
+
+    def request_started(self, endpoint: str) -> None:
+        """Mark a LightRAG request attempt as in progress."""
+        self.add("lightrag_mcp_requests_in_flight", _labels(endpoint=endpoint_label(endpoint)))
+
+    def request_scheduled(self, lane: str, wait: float) -> None:
+        """Record how long a request waited in a scheduler lane."""
+        self.observe("lightrag_mcp_scheduler_wait_seconds", _labels(lane=lane), wait)
+
+    def request_finished(
+        self,
+        method: str,
+        endpoint: str,
+        status: Optional[int],
+        elapsed: float,
+        sent: int = 0,
+        received: int = 0,
+        cancelled: bool = False,
+    ) -> None:
+        """Record a finished LightRAG request attempt; cancelled ones get status "cancelled"."""
+        label = endpoint_label(endpoint)
+        self.add("lightrag_mcp_requests_in_flight", _labels(endpoint=label), -1)
+        status_label = "cancelled" if cancelled else status_class(status)
+        self.add(
+            "lightrag_mcp_requests",
+            _labels(method=method, endpoint=label, status=status_label),
+        )
+        labels = _labels(method=method, endpoint=label)
+        self.observe("lightrag_mcp_request_duration_seconds", labels, elapsed)
+        if sent:
+            self.add("lightrag_mcp_request_bytes", labels, sent)
+        if received:
+            self.add("lightrag_mcp_response_bytes", labels, received)
+
+    def _collected(self) -> Iterator[Tuple[str, float]]:
+        """Flatten numeric collector fields into (metric name, value) pairs."""
+
+        def walk(prefix: str, value: Any) -> Iterator[Tuple[str, float]]:
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    yield from walk(f"{prefix}_{_UNSAFE.sub('_', str(key))}", item)
+            elif isinstance(value, (int, float)):
+                yield prefix, float(value)
+
+        for name, collector in self.collectors.items():
+            yield from walk(f"lightrag_mcp_{name}", collector())
+
+    def render(self, openmetrics: bool = True) -> str:
+        """
+        Render all metrics in the text exposition format.
+
+        Args:
+            openmetrics: Use OpenMetrics 1.0 (otherwise Prometheus text 0.0.4)
+        """
+        lines: List[str] = []
+        for name, (kind, help_text) in _FAMILIES.items():
+            family = name if openmetrics or kind != "counter" else f"{name}_total"
+            lines.append(f"# TYPE {family} {kind}")
+            lines.append(f"# HELP {family} {help_text}")
+            if kind == "histogram":
+                for labels, histogram in self.histograms[name].items():
+                    cumulative = 0
+                    bounds = list(self.buckets) + [math.inf]
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        le = 'le="' + _number(bound) + '"'
+                        lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_number(histogram.sum)}")
+                continue
+            suffix = "_total" if kind == "counter" else ""
+            for labels, value in self.values[name].items():
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_number(value)}")
+
+        for name, value in self._collected():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_number(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summarize tool and endpoint metrics plus component statistics as a dict."""
+        tools: Dict[str, Any] = {}
+        for labels, histogram in self.histograms["lightrag_mcp_tool_duration_seconds"].items():
+            tools[dict(labels)["tool"]] = {"latency": histogram.summary(), "outcomes": {}}
+        for labels, value in self.values["lightrag_mcp_tool_calls"].items():
+            label = dict(labels)
+            tools.setdefault(label["tool"], {"outcomes": {}})["outcomes"][label["outcome"]] = value
+        for labels, value in self.values["lightrag_mcp_tool_in_flight"].items():
+            tools.setdefault(dict(labels)["tool"], {"outcomes": {}})["in_flight"] = value
+
+        endpoints: Dict[str, Any] = {}
+
+        def entry(labels: Labels) -> Dict[str, Any]:
+            label = dict(labels)
+            key = f"{label['method']} {label['endpoint']}"
+            return endpoints.setdefault(key, {"statuses": {}})
+
+        for labels, histogram in self.histograms["lightrag_mcp_request_duration_seconds"].items():
+            entry(labels)["latency"] = histogram.summary()
+        for labels, value in self.values["lightrag_mcp_requests"].items():
+            label = dict(labels)
+            entry(_labels(method=label["method"], endpoint=label["endpoint"]))["statuses"][
+                label["status"]
+            ] = value
+        for name, field in (
+            ("lightrag_mcp_request_bytes", "bytes_sent"),
+            ("lightrag_mcp_response_bytes", "bytes_received"),
+        ):
+            for labels, value in self.values[name].items():
+                entry(labels)[field] = value
+
+        return {
+            "tools": tools,
+            "endpoints": endpoints,
+            "components": {name: collector() for name, collector in self.collectors.items()},
+        }
+
+
+class MetricsServer:
+    """Minimal HTTP server exposing ``GET /metrics``."""
+
+    def __init__(self, metrics: Metrics, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Initialize the exporter.
+
+        Args:
+            metrics: Metrics to expose
+            host: Interface to listen on
+            port: TCP port (0 picks a free port)
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer one HTTP/1.x request and close the connection."""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            accept = ""
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "accept":
+                    accept = value.strip()
+
+            if len(request_line) >= 2 and request_line[0] == "GET" and (
+                request_line[1].split("?")[0] == "/metrics"
+            ):
+                openmetrics = "application/openmetrics-text" in accept
+                body = self.metrics.render(openmetrics).encode("utf-8")
+                content_type = (
+                    OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+                )
+                status = "200 OK"
+            else:
+                body, content_type, status = b"Not Found\n", "text/plain", "404 Not Found"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,134 @@
+"""Concurrent fan-out of a question over several query modes, with merged results."""
+
+import asyncio
+import json
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+# Response fields that may carry the sources a LightRAG answer cites
+CITATION_KEYS = ("references", "sources", "citations")
+
+_BLANK_LINES = re.compile(r"\n\s*\n")
+
+
+async def gather_quorum(
+    calls: Sequence[Callable[[], Awaitable[Any]]],
+    quorum: int = 0,
+    deadline: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run calls concurrently until enough succeed, all finish, or time runs out.
+
+    Calls still running at that point are cancelled and reported as such.
+
+    Args:
+        calls: Factories for the requests to run
+        quorum: Successful calls to wait for (0 = wait for every call)
+        deadline: Seconds after which to stop waiting (None or 0 = no deadline)
+
+    Returns:
+        One outcome per call, in input order, with ``status`` ("success",
+        "error" or "cancelled"), ``elapsed`` seconds and ``response`` or ``error``
+    """
+    started = time.monotonic()
+    tasks: List["asyncio.Future[Any]"] = [asyncio.ensure_future(call()) for call in calls]
+    needed = quorum if 0 < quorum < len(tasks) else len(tasks)
+    stop_at = started + deadline if deadline else None
+    finished: Dict["asyncio.Future[Any]", float] = {}
+    pending: Set["asyncio.Future[Any]"] = set(tasks)
+    succeeded = 0
+    try:
+        while pending and succeeded < needed:
+            timeout = None if stop_at is None else stop_at - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            now = time.monotonic()
+            for task in done:
+                finished[task] = now - started
+                if task.exception() is None:
+                    succeeded += 1
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    cancelled_at = time.monotonic() - started
+    outcomes: List[Dict[str, Any]] = []
+    for task in tasks:
+        if task not in finished:
+            outcomes.append({"status": "cancelled", "elapsed": cancelled_at})
+        elif task.exception() is not None:
+            outcomes.append(
+                {"status": "error", "elapsed": finished[task], "error": str(task.exception())}
+            )
+        else:
+            outcomes.append(
+                {"status": "success", "elapsed": finished[task], "response": task.result()}
+            )
+    return outcomes
+
+
+def response_text(result: Any) -> str:
+    """Get the answer or context text of a query result."""
+    if isinstance(result, str):
+        return result
+    if isinstance(result, dict) and isinstance(result.get("response"), str):
+        return result["response"]
+    return ""
+
+
+def split_passages(text: str, by_line: bool = False) -> List[str]:
+    """
+    Split a response into the passages it is deduplicated by.
+
+    Args:
+        text: Response text
+        by_line: Split into lines (context tables) instead of paragraphs
+
+    Returns:
+        Non-empty passages with surrounding whitespace removed
+    """
+    parts = text.splitlines() if by_line else _BLANK_LINES.split(text)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _passage_key(passage: str) -> str:
+    """Identity of a passage, ignoring case and whitespace differences."""
+    return " ".join(passage.split()).casefold()
+
+
+def merge_results(results: Sequence[Any], by_line: bool = False) -> Dict[str, Any]:
+    """
+    Merge query results, keeping each distinct passage and citation once.
+
+    Args:
+        results: Query results, or None for queries that did not succeed
+        by_line: Deduplicate line by line instead of paragraph by paragraph
+
+    Returns:
+        ``contexts`` (passage text and the indexes of the results containing
+        it, in first-seen order) and deduplicated ``citations``
+    """
+    contexts: Dict[str, Dict[str, Any]] = {}
+    citations: Dict[str, Any] = {}
+    for index, result in enumerate(results):
+        if result is None:
+            continue
+        for passage in split_passages(response_text(result), by_line):
+            entry = contexts.setdefault(_passage_key(passage), {"text": passage, "sources": []})
+            if index not in entry["sources"]:
+                entry["sources"].append(index)
+        if not isinstance(result, dict):
+            continue
+        for key in CITATION_KEYS:
+            if isinstance(result.get(key), list):
+                for citation in result[key]:
+                    citations.setdefault(
+                        json.dumps(citation, sort_keys=True, default=str), citation
+                    )
+    return {"contexts": list(contexts.values()), "citations": list(citations.values())}
@@ -0,0 +1,91 @@
+"""HTTP connection pool configuration and statistics."""
+
+import importlib.util
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+# First per-request trace events emitted once a pooled connection is assigned
+ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+
+def http2_available() -> bool:
+    """Whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_timeout(
+    timeout: float,
+    connect: Optional[float] = None,
+    read: Optional[float] = None,
+    write: Optional[float] = None,
+    pool: Optional[float] = None,
+) -> httpx.Timeout:
+    """Build per-phase timeouts, falling back to ``timeout`` for unset phases."""
+    return httpx.Timeout(
+        timeout,
+        connect=timeout if connect is None else connect,
+        read=timeout if read is None else read,
+        write=timeout if write is None else write,
+        pool=timeout if pool is None else pool,
+    )
+
+
+class PoolMonitor:
+    """Track connection acquisition wait time and report pool occupancy."""
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self.acquisitions = 0
+        self.new_connections = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def tracer(self) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+        """
+        Create an httpcore ``trace`` extension callback for one request.
+
+        The wait is measured from request start until the first event that
+        requires a pooled connection.
+        """
+        started = time.perf_counter()
+        acquired = False
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal acquired
+            if acquired or event not in ACQUIRED_EVENTS:
+                return
+            acquired = True
+            wait = time.perf_counter() - started
+            self.acquisitions += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if event == "connection.connect_tcp.started":
+                self.new_connections += 1
+
+        return trace
+
+    def stats(self, client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+        """Get pool occupancy for ``client`` (if created) and accumulated wait times."""
+        active = idle = 0
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        for connection in getattr(pool, "connections", []):
+            if connection.is_closed():
+                continue
+            if connection.is_idle():
+                idle += 1
+            else:
+                active += 1
+        return {
+            "active_connections": active,
+            "idle_connections": idle,
+            "acquisitions": self.acquisitions,
+            "new_connections": self.new_connections,
+            "avg_wait": self.total_wait / self.acquisitions if self.acquisitions else 0.0,
+            "max_wait": self.max_wait,
+        }
@@ -0,0 +1,208 @@
+"""Routing of requests across a primary LightRAG server and its read replicas."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+BALANCING_STRATEGIES = ("least_outstanding", "ewma")
+
+# Probe callback: returns whether the backend at a base URL is healthy
+HealthCheck = Callable[[str], Awaitable[bool]]
+
+
+class Backend:
+    """One LightRAG server with its load, latency and health state."""
+
+    def __init__(self, url: str, primary: bool = False):
+        """
+        Initialize the backend.
+
+        Args:
+            url: Base URL of the server
+            primary: Whether writes go to this server
+        """
+        self.url = url.rstrip("/")
+        self.primary = primary
+        self.outstanding = 0
+        self.ewma: Optional[float] = None
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get load, latency and health counters."""
+        return {
+            "primary": self.primary,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "ewma_latency": self.ewma,
+            "requests": self.requests,
+            "errors": self.errors,
+            "ejections": self.ejections,
+        }
+
+
+class ReplicaPool:
+    """Pick backends: writes go to the primary, reads are balanced across healthy nodes.
+
+    Reads use either the node with the fewest outstanding requests or the
+    lowest EWMA latency weighted by its outstanding requests. A node is ejected
+    after ``eject_after`` consecutive failed requests or a failed health probe,
+    and rejoins once a background ``/health`` probe succeeds.
+    """
+
+    def __init__(
+        self,
+        primary: str,
+        replicas: Optional[List[str]] = None,
+        strategy: str = "least_outstanding",
+        eject_after: int = 3,
+        probe_interval: float = 5.0,
+        ewma_decay: float = 0.3,
+        reads_on_primary: bool = True,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            primary: Base URL of the server that receives writes
+            replicas: Base URLs of read replicas
+            strategy: "least_outstanding" or "ewma"
+            eject_after: Consecutive failures that eject a node (0 disables ejection)
+            probe_interval: Seconds between background health probes
+            ewma_decay: Weight of the newest latency sample in the moving average
+            reads_on_primary: Also balance reads onto the primary
+        """
+        if strategy not in BALANCING_STRATEGIES:
+            raise ValueError(f"strategy must be one of {', '.join(BALANCING_STRATEGIES)}")
+        self.primary = Backend(primary, primary=True)
+        self.replicas = [
+            Backend(url) for url in replicas or [] if url.rstrip("/") != self.primary.url
+        ]
+        self.backends = [self.primary] + self.replicas
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.probe_interval = probe_interval
+        self.ewma_decay = ewma_decay
+        self.readers = self.backends if reads_on_primary or not self.replicas else self.replicas
+        self.probes = 0
+        self._turn = 0
+        self._probe_task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def replicated(self) -> bool:
+        """Whether there is more than one backend to choose from."""
+        return len(self.backends) > 1
+
+    def _load(self, backend: Backend) -> float:
+        """Cost of sending one more read to ``backend``; lower is better."""
+        if self.strategy == "ewma":
+            # Unmeasured nodes score as fast so they get sampled
+            return (backend.ewma or 0.0) * (backend.outstanding + 1)
+        return backend.outstanding
+
+    def pick(self, write: bool = False) -> Backend:
+        """
+        Choose the backend for one request.
+
+        Args:
+            write: Whether the request may change data
+
+        Returns:
+            The primary for writes, otherwise the least loaded healthy reader
+        """
+        if write or not self.replicated:
+            return self.primary
+        candidates = [backend for backend in self.readers if backend.healthy]
+        if not candidates:
+            # Everything is ejected; keep serving rather than failing outright
+            candidates = self.readers
+        best = min(self._load(backend) for backend in candidates)
+        tied = [backend for backend in candidates if self._load(backend) == best]
+        # Rotate among equally loaded nodes so sequential reads still spread out
+        self._turn += 1
+        return tied[self._turn % len(tied)]
+
+    def started(self, backend: Backend) -> None:
+        """Count a request sent to ``backend``."""
+        backend.outstanding += 1
+        backend.requests += 1
+
+    def finished(self, backend: Backend, elapsed: float, ok: bool) -> None:
+        """
+        Record a finished request.
+
+        Args:
+            backend: Backend the request went to
+            elapsed: Seconds the request took
+            ok: False for transport errors and 5xx/429 responses
+        """
+        backend.outstanding -= 1
+        if ok:
+            # Failures are often fast (e.g. refused connections) and would look like good latency
+            if backend.ewma is None:
+                backend.ewma = elapsed
+            else:
+                backend.ewma += self.ewma_decay * (elapsed - backend.ewma)
+            backend.consecutive_failures = 0
+            return
+        backend.errors += 1
+        backend.consecutive_failures += 1
+        if self.eject_after > 0 and backend.consecutive_failures >= self.eject_after:
+            self._eject(backend)
+
+    def cancelled(self, backend: Backend) -> None:
+        """Record a request abandoned by its caller, which says nothing about the node."""
+        backend.outstanding -= 1
+
+    def _eject(self, backend: Backend) -> None:
+        """Take a backend out of read rotation until a health probe succeeds."""
+        if backend.healthy:
+            backend.healthy = False
+            backend.ejections += 1
+
+    def start(self, health_check: HealthCheck) -> None:
+        """Start background health probes if there are replicas and none are running."""
+        if not self.replicated or self.probe_interval <= 0:
+            return
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.ensure_future(self._probe_loop(health_check))
+
+    async def probe(self, health_check: HealthCheck) -> None:
+        """Probe every backend once, ejecting failed nodes and recovering healthy ones."""
+        self.probes += 1
+        results = await asyncio.gather(
+            *(health_check(backend.url) for backend in self.backends), return_exceptions=True
+        )
+        for backend, result in zip(self.backends, results):
+            if result is True:
+                backend.healthy = True
+                backend.consecutive_failures = 0
+            else:
+                self._eject(backend)
+
+    async def _probe_loop(self, health_check: HealthCheck) -> None:
+        """Probe backends every ``probe_interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            await self.probe(health_check)
+
+    async def close(self) -> None:
+        """Stop background health probes."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the strategy and per-backend state."""
+        return {
+            "strategy": self.strategy,
+            "healthy": sum(1 for backend in self.backends if backend.healthy),
+            "probes": self.probes,
+            "backends": {backend.url: backend.stats() for backend in self.backends},
+        }
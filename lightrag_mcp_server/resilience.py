@@ -0,0 +1,219 @@
+"""Retry with backoff and per-endpoint-group circuit breaking."""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+# Status codes that indicate a transient backend problem
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Errors raised before the request reached the server; safe to retry for any method
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a circuit breaker rejects a request without sending it."""
+
+
+def endpoint_group(endpoint: str) -> str:
+    """Map an API endpoint to its circuit breaker group."""
+    if endpoint.startswith("/documents"):
+        return "documents"
+    if endpoint.startswith("/query"):
+        return "query"
+    if endpoint.startswith("/graph"):
+        return "graph"
+    return "system"
+
+
+def parse_retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one endpoint group."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 disables it)
+            reset_timeout: Seconds the circuit stays open before a probe is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+
+    def before_request(self) -> bool:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            True if the request is the half-open probe
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is already running
+        """
+        if self.state == "closed":
+            return False
+        now = time.monotonic()
+        if self.state == "open":
+            if now - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError("circuit open")
+            self.state = "half_open"
+            self._probing = False
+        # A probe that never reported back (e.g. cancelled) expires after reset_timeout
+        if self._probing and now - self._probe_started < self.reset_timeout:
+            self.rejected += 1
+            raise CircuitOpenError("circuit half-open, probe in flight")
+        self._probing = True
+        self._probe_started = now
+        return True
+
+    def release_probe(self) -> None:
+        """Let another request probe after the probe ended without an outcome, e.g. cancelled."""
+        if self.state == "half_open":
+            self._probing = False
+
+    def record_success(self) -> None:
+        """Record a successful request and close the circuit."""
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit past the threshold."""
+        self.failures += 1
+        self._probing = False
+        if self.state == "half_open" or (
+            self.failure_threshold > 0 and self.failures >= self.failure_threshold
+        ):
+            if self.state != "open":
+                self.opened += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class Resilience:
+    """Retry policy plus circuit breakers shared by a client's requests."""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        backoff_max: float = 30.0,
+        breaker_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0,
+    ):
+        """
+        Initialize the resilience layer.
+
+        Args:
+            max_retries: Maximum retries per request (0 disables retrying)
+            backoff: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound for a single backoff delay
+            breaker_threshold: Consecutive failures that open a group's circuit
+            breaker_reset_timeout: Seconds before an open circuit allows a probe
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_timeout = breaker_reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+        self.exhausted = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Get the circuit breaker guarding ``endpoint``."""
+        group = endpoint_group(endpoint)
+        breaker = self.breakers.get(group)
+        if breaker is None:
+            breaker = CircuitBreaker(self.breaker_threshold, self.breaker_reset_timeout)
+            self.breakers[group] = breaker
+        return breaker
+
+    @staticmethod
+    def is_failure(error: httpx.HTTPError) -> bool:
+        """Whether an error counts against the circuit breaker."""
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status >= 500 or status == 429
+        return isinstance(error, httpx.TransportError)
+
+    def retry_delay(
+        self, error: httpx.HTTPError, attempt: int, idempotent: bool
+    ) -> Optional[float]:
+        """
+        Decide whether to retry a failed attempt.
+
+        Args:
+            error: Error raised by the attempt
+            attempt: Number of retries already made
+            idempotent: Whether the request may safely be sent again
+
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            retryable = idempotent and error.response.status_code in RETRY_STATUSES
+            retry_after = parse_retry_after(error.response)
+        else:
+            retryable = isinstance(error, _NOT_SENT_ERRORS) or (
+                idempotent and isinstance(error, httpx.TransportError)
+            )
+            retry_after = None
+
+        if not retryable:
+            return None
+        if attempt >= self.max_retries:
+            self.exhausted += 1
+            return None
+
+        self.retries += 1
+        # Full jitter keeps retrying clients from synchronizing
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * (2**attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Get retry counters and breaker states."""
+        return {
+            "retries": self.retries,
+            "retries_exhausted": self.exhausted,
+            "breakers": {name: b.stats() for name, b in self.breakers.items()},
+        }
@@ -0,0 +1,238 @@
+"""Priority scheduling and concurrency limiting of outbound LightRAG requests."""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+from .metrics import Histogram
+
+# Lanes in priority order: interactive queries first, ingestion and graph dumps last
+LANES = ("query", "read", "write", "bulk")
+
+# Reads that return whole collections rather than one object
+_DUMP_ENDPOINTS = frozenset(["/graph", "/graph/entities", "/graph/relations", "/documents"])
+
+Waiter = Tuple["asyncio.Future[None]", float]
+
+
+def request_lane(method: str, endpoint: str) -> str:
+    """
+    Classify a request into a scheduling lane.
+
+    Args:
+        method: HTTP method
+        endpoint: API endpoint
+
+    Returns:
+        "query", "read", "write" or "bulk"
+    """
+    if endpoint.startswith("/query"):
+        return "query"
+    if method == "GET":
+        return "bulk" if endpoint in _DUMP_ENDPOINTS else "read"
+    if method == "POST" and endpoint.startswith("/documents"):
+        return "bulk"
+    return "write"
+
+
+def parse_lane_limits(value: Optional[str]) -> Dict[str, int]:
+    """
+    Parse per-lane concurrency caps written as ``lane=N,lane=N``.
+
+    Raises:
+        ValueError: If a lane name is unknown or a limit is not an integer
+    """
+    limits: Dict[str, int] = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        lane, _, limit = item.partition("=")
+        lane = lane.strip()
+        if lane not in LANES:
+            raise ValueError(f"Unknown scheduler lane: {lane}")
+        limits[lane] = int(limit)
+    return limits
+
+
+class _Lane:
+    """Waiting requests of one lane, queued per workspace."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.queues: "OrderedDict[str, Deque[Waiter]]" = OrderedDict()
+        self.waiting = 0
+        self.in_flight = 0
+        self.granted = 0
+        self.max_waiting = 0
+        self.wait = Histogram()
+
+    def has_capacity(self) -> bool:
+        """Whether the lane's own cap allows another request."""
+        return self.limit <= 0 or self.in_flight < self.limit
+
+    def oldest(self) -> float:
+        """Enqueue time of the longest-waiting request."""
+        return min(queue[0][1] for queue in self.queues.values())
+
+    def push(self, workspace: str, waiter: Waiter) -> None:
+        """Queue a waiter behind others from the same workspace."""
+        queue = self.queues.get(workspace)
+        if queue is None:
+            queue = self.queues[workspace] = deque()
+        queue.append(waiter)
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def pop(self) -> Waiter:
+        """Take the next waiter, rotating round-robin across workspaces."""
+        workspace, queue = next(iter(self.queues.items()))
+        waiter = queue.popleft()
+        if queue:
+            self.queues.move_to_end(workspace)
+        else:
+            del self.queues[workspace]
+        self.waiting -= 1
+        return waiter
+
+    def remove(self, workspace: str, waiter: Waiter) -> None:
+        """Drop a waiter that gave up before being granted, if it is still queued."""
+        queue = self.queues.get(workspace)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        if not queue:
+            del self.queues[workspace]
+        self.waiting -= 1
+
+
+class RequestScheduler:
+    """Grant request slots by lane priority, per-lane caps and workspace fairness.
+
+    A free slot goes to the highest-priority lane that has waiters and is below
+    its own cap. Within a lane, workspaces take turns so one tenant's burst does
+    not delay another's requests. A request that has waited longer than
+    ``aging`` seconds is served ahead of higher lanes, so bulk work cannot be
+    starved indefinitely.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 0,
+        lane_limits: Optional[Dict[str, int]] = None,
+        aging: float = 5.0,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_in_flight: Requests in flight across all lanes (0 = unlimited)
+            lane_limits: Per-lane caps, e.g. {"bulk": 8} (missing or 0 = no lane cap)
+            aging: Seconds after which a waiting request jumps the priority order
+                (0 disables aging)
+        """
+        self.max_in_flight = max_in_flight
+        self.aging = aging
+        limits = lane_limits or {}
+        self.lanes: Dict[str, _Lane] = {lane: _Lane(limits.get(lane, 0)) for lane in LANES}
+        self.in_flight = 0
+        self.promoted = 0
+
+    def _has_capacity(self) -> bool:
+        """Whether the global cap allows another request."""
+        return self.max_in_flight <= 0 or self.in_flight < self.max_in_flight
+
+    def _next_lane(self) -> Optional[_Lane]:
+        """Pick the lane to serve next, or None if nothing can run."""
+        ready = [lane for lane in self.lanes.values() if lane.waiting and lane.has_capacity()]
+        if not ready:
+            return None
+        if self.aging > 0 and len(ready) > 1:
+            deadline = time.monotonic() - self.aging
+            for lane in ready[1:]:
+                if lane.oldest() <= deadline:
+                    self.promoted += 1
+                    return lane
+        return ready[0]
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiters while capacity allows."""
+        while self._has_capacity():
+            lane = self._next_lane()
+            if lane is None:
+                return
+            future, enqueued = lane.pop()
+            if future.done():
+                # Cancelled while queued; its task has not resumed to dequeue itself yet
+                continue
+            lane.in_flight += 1
+            lane.granted += 1
+            self.in_flight += 1
+            lane.wait.observe(time.monotonic() - enqueued)
+            future.set_result(None)
+
+    async def acquire(self, lane: str, workspace: str = "") -> float:
+        """
+        Wait for a request slot.
+
+        Args:
+            lane: Lane from ``request_lane``
+            workspace: Tenant the request belongs to, for fair queuing
+
+        Returns:
+            Seconds spent waiting
+        """
+        state = self.lanes[lane]
+        enqueued = time.monotonic()
+        waiter: Waiter = (asyncio.get_running_loop().create_future(), enqueued)
+        state.push(workspace, waiter)
+        self._dispatch()
+        try:
+            await waiter[0]
+        except asyncio.CancelledError:
+            if waiter[0].done() and not waiter[0].cancelled():
+                # Granted just before the caller was cancelled
+                self.release(lane)
+            else:
+                state.remove(workspace, waiter)
+            raise
+        return time.monotonic() - enqueued
+
+    def release(self, lane: str) -> None:
+        """Return a slot taken by ``acquire`` and wake the next waiter."""
+        self.lanes[lane].in_flight -= 1
+        self.in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, lane: str, workspace: str = "") -> AsyncIterator[float]:
+        """Hold a request slot for the duration of the block, yielding the wait time."""
+        wait = await self.acquire(lane, workspace)
+        try:
+            yield wait
+        finally:
+            self.release(lane)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depths, in-flight counts and wait-time percentiles per lane."""
+        lanes = {}
+        for name, lane in self.lanes.items():
+            wait = lane.wait.summary()
+            lanes[name] = {
+                "limit": lane.limit,
+                "queued": lane.waiting,
+                "max_queued": lane.max_waiting,
+                "in_flight": lane.in_flight,
+                "granted": lane.granted,
+                "wait_p50": wait["p50"],
+                "wait_p95": wait["p95"],
+                "wait_p99": wait["p99"],
+            }
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queued": sum(lane.waiting for lane in self.lanes.values()),
+            "promoted": self.promoted,
+            "lanes": lanes,
+        }
@@ -0,0 +1,162 @@
+"""JSON serialization of tool results into MCP content."""
+
+import json
+from typing import Any, Dict, List, Tuple, Union
+
+from mcp.types import EmbeddedResource, TextContent, TextResourceContents
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+OVERFLOW_MODES = ("truncate", "summary", "resource")
+
+Content = List[Union[TextContent, EmbeddedResource]]
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        obj, default=str, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Encode ``obj`` as a compact JSON string."""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def _limit_lists(obj: Any, n: int) -> Any:
+    """Copy ``obj`` keeping at most ``n`` items of every nested list."""
+    if isinstance(obj, list):
+        return [_limit_lists(item, n) for item in obj[:n]]
+    if isinstance(obj, dict):
+        return {key: _limit_lists(value, n) for key, value in obj.items()}
+    return obj
+
+
+def _longest_list(obj: Any) -> int:
+    """Length of the longest list nested in ``obj``."""
+    if isinstance(obj, list):
+        return max([len(obj)] + [_longest_list(item) for item in obj])
+    if isinstance(obj, dict):
+        return max([0] + [_longest_list(value) for value in obj.values()])
+    return 0
+
+
+def truncate(obj: Any, max_bytes: int, total_bytes: int) -> Tuple[str, bool]:
+    """
+    Shrink ``obj`` to fit ``max_bytes`` while keeping it valid JSON.
+
+    Nested lists are capped to the largest common length that fits; if even
+    empty lists do not fit, the encoded text is cut.
+
+    Returns:
+        Tuple of (JSON text, whether it is still valid JSON)
+    """
+    low, high = 0, _longest_list(obj)
+    best = None
+    while low <= high:
+        mid = (low + high) // 2
+        encoded = dumps_bytes(_wrap_truncated(_limit_lists(obj, mid), mid, total_bytes))
+        if len(encoded) <= max_bytes:
+            best = encoded
+            low = mid + 1
+        else:
+            high = mid - 1
+    if best is not None:
+        return best.decode("utf-8"), True
+    cut = dumps_bytes(obj)[:max_bytes].decode("utf-8", errors="ignore")
+    return f"{cut}... [truncated, {total_bytes} bytes total]", False
+
+
+def _wrap_truncated(obj: Any, max_items: int, total_bytes: int) -> Any:
+    """Attach truncation details to a shrunk result."""
+    info = {"max_list_items": max_items, "original_bytes": total_bytes}
+    if isinstance(obj, dict):
+        return {**obj, "_truncated": info}
+    return {"result": obj, "_truncated": info}
+
+
+def summarize(obj: Any, depth: int = 2) -> Any:
+    """Describe the shape of ``obj``: keys, list lengths and scalar values."""
+    if isinstance(obj, dict):
+        if depth <= 0:
+            return {"type": "object", "keys": len(obj)}
+        return {key: summarize(value, depth - 1) for key, value in obj.items()}
+    if isinstance(obj, list):
+        summary: Dict[str, Any] = {"type": "array", "length": len(obj)}
+        if obj and depth > 0:
+            summary["first"] = summarize(obj[0], depth - 1)
+        return summary
+    if isinstance(obj, str) and len(obj) > 200:
+        return {"type": "string", "length": len(obj), "prefix": obj[:200]}
+    return obj
+
+
+class ResultFormatter:
+    """Turn tool results into MCP content within an optional byte budget."""
+
+    def __init__(
+        self, max_bytes: int = 0, overflow: str = "truncate", structured: bool = False
+    ):
+        """
+        Initialize the formatter.
+
+        Args:
+            max_bytes: Byte budget for the text of one result (0 means unlimited)
+            overflow: What to do above the budget: "truncate" to valid JSON,
+                "summary" of the result's shape, or "resource" to attach the full
+                JSON as an embedded resource next to a summary
+            structured: Also return dict results as MCP structured content
+        """
+        if overflow not in OVERFLOW_MODES:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_MODES)}")
+        self.max_bytes = max_bytes
+        self.overflow = overflow
+        self.structured = structured
+
+    def format(self, name: str, result: Any) -> Union[Content, Tuple[Content, Dict[str, Any]]]:
+        """
+        Serialize a tool result.
+
+        Args:
+            name: Tool name, used in resource URIs
+            result: Value returned by the tool
+
+        Returns:
+            Content list, or (content, structured content) for dict results when
+            structured output is enabled and the result fits the budget
+        """
+        encoded = result.encode("utf-8") if isinstance(result, str) else dumps_bytes(result)
+        if not self.max_bytes or len(encoded) <= self.max_bytes:
+            content: Content = [TextContent(type="text", text=encoded.decode("utf-8"))]
+            if self.structured and isinstance(result, dict):
+                return content, result
+            return content
+
+        total = len(encoded)
+        if isinstance(result, str):
+            text = encoded[: self.max_bytes].decode("utf-8", errors="ignore")
+            return [TextContent(type="text", text=f"{text}... [truncated, {total} bytes total]")]
+        if self.overflow == "truncate":
+            text, _ = truncate(result, self.max_bytes, total)
+            return [TextContent(type="text", text=text)]
+
+        summary = dumps({"summary": summarize(result), "original_bytes": total})
+        content = [TextContent(type="text", text=summary)]
+        if self.overflow == "resource":
+            content.append(
+                EmbeddedResource(
+                    type="resource",
+                    resource=TextResourceContents(
+                        uri=f"lightrag://results/{name}",
+                        mimeType="application/json",
+                        text=encoded.decode("utf-8"),
+                    ),
+                )
+            )
+        return content
@@ -1,15 +1,82 @@
 """LightRAG MCP Server implementation."""
 
-import asyncio
 import os
-from typing import Any, Optional
+import sys
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
 
-import httpx
 from mcp.server import Server
-from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
-from pydantic import BaseModel, Field
+from mcp.types import Tool, TextContent
 
 from .client import LightRAGClient
+from .graph import GraphCache
+from .scheduler import parse_lane_limits
+from .serialization import ResultFormatter
+from .sessions import Session, SessionRegistry, request_identity
+from .tools import TOOLS, ToolRegistry
+from .tracing import create_tracer
+
+if TYPE_CHECKING:
+    from starlette.applications import Starlette
+
+    from .upload import UploadProgress
+
+TRANSPORTS = ("stdio", "http")
+
+# Session of the tool call being handled; unset for the default session
+_current_session: ContextVar[Optional[Session]] = ContextVar("lightrag_session", default=None)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: Optional[float] = None) -> Optional[float]:
+    """Read a float environment variable."""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean environment variable."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class _MCPEndpoint:
+    """ASGI endpoint handing requests to the streamable HTTP session manager."""
+
+    def __init__(self, manager: Any, require_auth: bool):
+        """
+        Initialize the endpoint.
+
+        Args:
+            manager: Streamable HTTP session manager
+            require_auth: Reject requests that do not carry their own API key
+        """
+        self.manager = manager
+        self.require_auth = require_auth
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        """Serve one HTTP request."""
+        from starlette.datastructures import Headers
+        from starlette.responses import JSONResponse
+
+        if self.require_auth and request_identity(Headers(scope=scope))[1] is None:
+            response = JSONResponse(
+                {"error": "LightRAG API key required"},
+                status_code=401,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+            await response(scope, receive, send)
+            return
+        await self.manager.handle_request(scope, receive, send)
 
 
 class LightRAGMCPServer:
@@ -38,504 +105,223 @@ class LightRAGMCPServer:
         # Initialize MCP server
         self.server = Server("lightrag-mcp-server")
 
+        # Optional local index of already ingested content, one file per workspace
+        self.dedup_dir = os.getenv("LIGHTRAG_DEDUP_DIR")
+        dedup_index = None
+        if self.dedup_dir:
+            from .dedup import DedupIndex
+
+            dedup_index = DedupIndex.for_workspace(self.dedup_dir, self.workspace)
+
         # Initialize LightRAG client
-        self.client = LightRAGClient(
+        max_connections = _env_int("LIGHTRAG_MAX_CONNECTIONS", 100)
+        result_max_bytes = _env_int("LIGHTRAG_RESULT_MAX_BYTES", 0)
+        # Memory cap of streamed list decoding, separate from the output budget
+        stream_max_bytes = _env_int("LIGHTRAG_STREAM_MAX_BYTES", result_max_bytes)
+        client = LightRAGClient(
             base_url=self.server_url,
             api_key=self.api_key,
             workspace=self.workspace,
+            timeout=_env_float("LIGHTRAG_TIMEOUT", 300.0),
+            cache_size=_env_int("LIGHTRAG_QUERY_CACHE_SIZE", 128),
+            cache_ttl=_env_float("LIGHTRAG_QUERY_CACHE_TTL", 300.0),
+            max_connections=max_connections,
+            max_keepalive_connections=_env_int("LIGHTRAG_MAX_KEEPALIVE_CONNECTIONS", 20),
+            keepalive_expiry=_env_float("LIGHTRAG_KEEPALIVE_EXPIRY", 30.0),
+            http2=_env_bool("LIGHTRAG_HTTP2"),
+            connect_timeout=_env_float("LIGHTRAG_CONNECT_TIMEOUT"),
+            read_timeout=_env_float("LIGHTRAG_READ_TIMEOUT"),
+            write_timeout=_env_float("LIGHTRAG_WRITE_TIMEOUT"),
+            pool_timeout=_env_float("LIGHTRAG_POOL_TIMEOUT"),
+            max_retries=_env_int("LIGHTRAG_MAX_RETRIES", 3),
+            retry_backoff=_env_float("LIGHTRAG_RETRY_BACKOFF", 0.5),
+            retry_backoff_max=_env_float("LIGHTRAG_RETRY_BACKOFF_MAX", 30.0),
+            breaker_threshold=_env_int("LIGHTRAG_BREAKER_THRESHOLD", 5),
+            breaker_reset_timeout=_env_float("LIGHTRAG_BREAKER_RESET_TIMEOUT", 30.0),
+            insert_batch_window=_env_float("LIGHTRAG_INSERT_BATCH_WINDOW", 0.0),
+            insert_batch_size=_env_int("LIGHTRAG_INSERT_BATCH_SIZE", 64),
+            insert_batch_max_bytes=_env_int("LIGHTRAG_INSERT_BATCH_MAX_BYTES", 4 * 1024 * 1024),
+            dedup_index=dedup_index,
+            tracer=create_tracer(
+                os.getenv("LIGHTRAG_TRACING"), os.getenv("LIGHTRAG_TRACE_FILE")
+            ),
+            max_in_flight=_env_int("LIGHTRAG_MAX_IN_FLIGHT", max_connections),
+            lane_limits=parse_lane_limits(os.getenv("LIGHTRAG_LANE_LIMITS", "bulk=8")),
+            lane_aging=_env_float("LIGHTRAG_LANE_AGING", 5.0),
+            stream_decode=_env_bool("LIGHTRAG_STREAM_DECODE"),
+            stream_max_bytes=stream_max_bytes,
+            replica_urls=[
+                url.strip()
+                for url in os.getenv("LIGHTRAG_REPLICA_URLS", "").split(",")
+                if url.strip()
+            ],
+            balancing=os.getenv("LIGHTRAG_BALANCING", "least_outstanding"),
+            eject_after=_env_int("LIGHTRAG_EJECT_AFTER", 3),
+            health_probe_interval=_env_float("LIGHTRAG_HEALTH_PROBE_INTERVAL", 5.0),
+            hedge_queries=_env_bool("LIGHTRAG_HEDGE_QUERIES"),
+            hedge_percentile=_env_float("LIGHTRAG_HEDGE_PERCENTILE", 0.95),
+            hedge_budget=_env_float("LIGHTRAG_HEDGE_BUDGET", 0.1),
+        )
+
+        # Local graph snapshot; graph read tools use it when LIGHTRAG_GRAPH_SNAPSHOT is set
+        self.graph_max_staleness = _env_float("LIGHTRAG_GRAPH_MAX_STALENESS", 60.0)
+        graph_cache = GraphCache(client, max_staleness=self.graph_max_staleness)
+        self.serve_graph_from_snapshot = _env_bool("LIGHTRAG_GRAPH_SNAPSHOT")
+        client.metrics.register("graph_snapshot", graph_cache.stats)
+
+        # Stdio and HTTP requests without their own workspace or key use the default session;
+        # other HTTP identities get client views sharing its pool, caches and scheduler
+        self.default_session = Session(client, graph_cache)
+        self.sessions = SessionRegistry(
+            self._new_session, max_size=_env_int("LIGHTRAG_HTTP_MAX_IDENTITIES", 1024)
+        )
+        client.metrics.register("sessions", self.sessions.stats)
+
+        # Streamable HTTP transport settings, used by run(transport="http")
+        self.http_host = os.getenv("LIGHTRAG_MCP_HOST", "127.0.0.1")
+        self.http_port = _env_int("LIGHTRAG_MCP_PORT", 8000)
+        self.http_path = os.getenv("LIGHTRAG_MCP_PATH", "/mcp")
+        # On by default with a server key, so anonymous callers cannot borrow it
+        self.http_require_auth = _env_bool("LIGHTRAG_HTTP_REQUIRE_AUTH", bool(self.api_key))
+        self.http_session_idle_timeout = _env_float("LIGHTRAG_HTTP_SESSION_IDLE_TIMEOUT", 1800.0)
+        self.http_max_sessions = _env_int("LIGHTRAG_HTTP_MAX_SESSIONS", 10000)
+
+        # Optional Prometheus/OpenMetrics endpoint, started by run()
+        self.metrics_port = _env_int("LIGHTRAG_METRICS_PORT", 0)
+        self.metrics_host = os.getenv("LIGHTRAG_METRICS_HOST", "127.0.0.1")
+
+        # Compact JSON results, optionally bounded by a byte budget
+        self.formatter = ResultFormatter(
+            max_bytes=result_max_bytes,
+            overflow=os.getenv("LIGHTRAG_RESULT_OVERFLOW", "truncate"),
+            structured=_env_bool("LIGHTRAG_STRUCTURED_CONTENT"),
         )
 
         # Register tool handlers
         self._register_tools()
 
+    @property
+    def client(self) -> LightRAGClient:
+        """LightRAG client of the current session."""
+        return (_current_session.get() or self.default_session).client
+
+    @client.setter
+    def client(self, value: LightRAGClient) -> None:
+        self.default_session.client = value
+
+    @property
+    def graph_cache(self) -> GraphCache:
+        """Graph snapshot cache of the current session."""
+        return (_current_session.get() or self.default_session).graph_cache
+
+    @graph_cache.setter
+    def graph_cache(self, value: GraphCache) -> None:
+        self.default_session.graph_cache = value
+
+    def _new_session(self, workspace: Optional[str], api_key: Optional[str]) -> Session:
+        """Build the session of an HTTP identity on top of the default client."""
+        dedup_index = None
+        if self.dedup_dir and workspace != self.workspace:
+            from .dedup import DedupIndex
+
+            dedup_index = DedupIndex.for_workspace(self.dedup_dir, workspace or "default")
+        client = self.default_session.client.for_session(workspace, api_key, dedup_index)
+        return Session(client, GraphCache(client, max_staleness=self.graph_max_staleness))
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[Session]:
+        """
+        Hold the session matching the workspace and API key of the current HTTP request.
+
+        Raises:
+            PermissionError: If the request names another workspace without its own
+                API key while the server has one, which would lend it the server's key
+        """
+        try:
+            request = self.server.request_context.request
+        except LookupError:
+            request = None
+        headers = getattr(request, "headers", None)
+        workspace, api_key = (None, None) if headers is None else request_identity(headers)
+        if workspace in (None, self.workspace) and api_key in (None, self.api_key):
+            yield self.default_session
+            return
+        if api_key is None and self.api_key:
+            raise PermissionError(f"An API key is required to use workspace {workspace!r}")
+        async with self.sessions.use(workspace or self.workspace, api_key) as session:
+            yield session
+
     def _register_tools(self):
-        """Register all MCP tools."""
-        # Document Management Tools
-        self._register_document_tools()
-        # Query Tools
-        self._register_query_tools()
-        # Knowledge Graph Tools
-        self._register_graph_tools()
-        # System Management Tools
-        self._register_system_tools()
-
-    def _register_document_tools(self):
-        """Register document management tools."""
+        """Register the MCP list/call handlers backed by the tool registry."""
+        self.tools = ToolRegistry(TOOLS, server=self, client=self.client)
 
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
-            """List all available tools."""
+            """List all available tools from the cached catalog."""
+            return self.tools.list_tools()
+
+        # Arguments are checked against the registry's precompiled validators
+        @self.server.call_tool(validate_input=False)
+        async def call_tool(name: str, arguments: dict[str, Any]) -> Any:
+            """Handle tool calls."""
+            return await self._call_tool(name, arguments)
+
+    async def _call_tool(self, name: str, arguments: dict[str, Any]) -> Any:
+        """Dispatch a tool call through the registry in the caller's session."""
+        try:
+            async with self._session() as session:
+                token = _current_session.set(
+                    None if session is self.default_session else session
+                )
+                try:
+                    return await self._dispatch(name, arguments)
+                finally:
+                    _current_session.reset(token)
+        except PermissionError as e:
             return [
-                # Document Management (10 tools)
-                Tool(
-                    name="insert_text",
-                    description="Insert a single text document into LightRAG",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "text": {
-                                "type": "string",
-                                "description": "Text content to insert",
-                            },
-                            "description": {
-                                "type": "string",
-                                "description": "Optional description of the text",
-                            },
-                        },
-                        "required": ["text"],
-                    },
-                ),
-                Tool(
-                    name="insert_texts",
-                    description="Insert multiple text documents into LightRAG in batch",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "texts": {
-                                "type": "array",
-                                "description": "Array of text documents with optional metadata",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "content": {"type": "string"},
-                                        "title": {"type": "string"},
-                                        "metadata": {"type": "object"},
-                                    },
-                                    "required": ["content"],
-                                },
-                            },
-                        },
-                        "required": ["texts"],
-                    },
-                ),
-                Tool(
-                    name="upload_document",
-                    description="Upload a document file to LightRAG",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "Path to the file to upload",
-                            },
-                            "chunk_size": {
-                                "type": "integer",
-                                "description": "Custom chunk size for document splitting",
-                            },
-                            "chunk_overlap": {
-                                "type": "integer",
-                                "description": "Overlap size between chunks",
-                            },
-                        },
-                        "required": ["file_path"],
-                    },
-                ),
-                Tool(
-                    name="upload_documents",
-                    description="Upload multiple documents in batch",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "file_paths": {
-                                "type": "array",
-                                "description": "Array of file paths to upload",
-                                "items": {"type": "string"},
-                            },
-                        },
-                        "required": ["file_paths"],
-                    },
-                ),
-                Tool(
-                    name="scan_documents",
-                    description="Scan for new documents in the configured input directory",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                Tool(
-                    name="get_documents",
-                    description="Retrieve all documents from LightRAG",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                Tool(
-                    name="get_documents_paginated",
-                    description="Retrieve documents with pagination support",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "page": {
-                                "type": "integer",
-                                "description": "Page number (1-based)",
-                            },
-                            "page_size": {
-                                "type": "integer",
-                                "description": "Number of documents per page (1-100)",
-                            },
-                        },
-                        "required": ["page", "page_size"],
-                    },
-                ),
-                Tool(
-                    name="delete_document",
-                    description="Delete a specific document by ID",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "document_id": {
-                                "type": "string",
-                                "description": "ID of the document to delete",
-                            },
-                        },
-                        "required": ["document_id"],
-                    },
-                ),
-                Tool(
-                    name="clear_documents",
-                    description="Clear all documents from LightRAG",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                Tool(
-                    name="document_status",
-                    description="Get processing status for documents",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "document_id": {
-                                "type": "string",
-                                "description": "Optional specific document ID to check",
-                            },
-                        },
-                    },
-                ),
-                # Query Tools (3 tools)
-                Tool(
-                    name="query_text",
-                    description="Query LightRAG with text using various retrieval modes",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Query text",
-                            },
-                            "mode": {
-                                "type": "string",
-                                "description": "Query mode: naive, local, global, hybrid, or mix",
-                                "enum": ["naive", "local", "global", "hybrid", "mix"],
-                                "default": "hybrid",
-                            },
-                            "only_need_context": {
-                                "type": "boolean",
-                                "description": "Return only context without generation",
-                                "default": False,
-                            },
-                            "top_k": {
-                                "type": "integer",
-                                "description": "Number of top results to retrieve",
-                                "default": 60,
-                            },
-                            "max_tokens": {
-                                "type": "integer",
-                                "description": "Maximum tokens in response",
-                            },
-                        },
-                        "required": ["query"],
-                    },
-                ),
-                Tool(
-                    name="query_text_stream",
-                    description="Stream query results from LightRAG in real-time",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Query text",
-                            },
-                            "mode": {
-                                "type": "string",
-                                "description": "Query mode",
-                                "enum": ["naive", "local", "global", "hybrid", "mix"],
-                                "default": "hybrid",
-                            },
-                            "only_need_context": {
-                                "type": "boolean",
-                                "description": "Return only context",
-                                "default": False,
-                            },
-                        },
-                        "required": ["query"],
-                    },
-                ),
-                Tool(
-                    name="query_with_citation",
-                    description="Query LightRAG and get results with source citations",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Query text",
-                            },
-                            "mode": {
-                                "type": "string",
-                                "description": "Query mode",
-                                "enum": ["naive", "local", "global", "hybrid", "mix"],
-                                "default": "hybrid",
-                            },
-                        },
-                        "required": ["query"],
-                    },
-                ),
-                # Knowledge Graph Tools (8 tools)
-                Tool(
-                    name="get_knowledge_graph",
-                    description="Retrieve the complete knowledge graph from LightRAG",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                Tool(
-                    name="get_graph_structure",
-                    description="Get the structure and statistics of the knowledge graph",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                Tool(
-                    name="get_entities",
-                    description="Retrieve all entities from the knowledge graph",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of entities to retrieve",
-                            },
-                        },
-                    },
-                ),
-                Tool(
-                    name="get_relations",
-                    description="Retrieve all relationships from the knowledge graph",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of relations to retrieve",
-                            },
-                        },
-                    },
-                ),
-                Tool(
-                    name="check_entity_exists",
-                    description="Check if an entity exists in the knowledge graph",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "entity_name": {
-                                "type": "string",
-                                "description": "Name of the entity to check",
-                            },
-                        },
-                        "required": ["entity_name"],
-                    },
-                ),
-                Tool(
-                    name="update_entity",
-                    description="Update properties of an entity in the knowledge graph",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "entity_id": {
-                                "type": "string",
-                                "description": "ID of the entity to update",
-                            },
-                            "properties": {
-                                "type": "object",
-                                "description": "Properties to update",
-                            },
-                        },
-                        "required": ["entity_id", "properties"],
-                    },
-                ),
-                Tool(
-                    name="delete_entity",
-                    description="Delete an entity from the knowledge graph",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "entity_id": {
-                                "type": "string",
-                                "description": "ID of the entity to delete",
-                            },
-                        },
-                        "required": ["entity_id"],
-                    },
-                ),
-                Tool(
-                    name="delete_relation",
-                    description="Delete a relationship from the knowledge graph",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "relation_id": {
-                                "type": "string",
-                                "description": "ID of the relation to delete",
-                            },
-                        },
-                        "required": ["relation_id"],
-                    },
-                ),
-                # System Management Tools (5 tools)
-                Tool(
-                    name="get_health",
-                    description="Check LightRAG server health and status",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                Tool(
-                    name="get_status",
-                    description="Get detailed system status and statistics",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                Tool(
-                    name="clear_cache",
-                    description="Clear LightRAG's internal cache",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "cache_type": {
-                                "type": "string",
-                                "description": "Type of cache to clear (default: all)",
-                                "enum": ["all", "llm", "embedding", "query"],
-                                "default": "all",
-                            },
-                        },
-                    },
-                ),
-                Tool(
-                    name="get_config",
-                    description="Get current LightRAG server configuration",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                Tool(
-                    name="get_workspace_info",
-                    description="Get information about the current workspace",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
+                TextContent(
+                    type="text",
+                    text=f"Error executing {name}: {str(e)}",
+                )
             ]
 
-        @self.server.call_tool()
-        async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-            """Handle tool calls."""
+    async def _dispatch(self, name: str, arguments: dict[str, Any]) -> Any:
+        """Validate, run and serialize one tool call."""
+        tool = self.tools.get(name)
+        if tool is None:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Unknown tool: {name}",
+                )
+            ]
+
+        metrics = self.client.metrics
+        metrics.tool_started(name)
+        started = time.perf_counter()
+        outcome = "error"
+        with self.client.tracer.span(f"tool {name}", {"mcp.tool.name": name}) as span:
             try:
-                # Document Management Tools
-                if name == "insert_text":
-                    result = await self.client.insert_text(
-                        text=arguments["text"],
-                        description=arguments.get("description"),
-                    )
-                elif name == "insert_texts":
-                    result = await self.client.insert_texts(texts=arguments["texts"])
-                elif name == "upload_document":
-                    result = await self.client.upload_document(
-                        file_path=arguments["file_path"],
-                        chunk_size=arguments.get("chunk_size"),
-                        chunk_overlap=arguments.get("chunk_overlap"),
-                    )
-                elif name == "upload_documents":
-                    result = await self.client.upload_documents(
-                        file_paths=arguments["file_paths"]
-                    )
-                elif name == "scan_documents":
-                    result = await self.client.scan_documents()
-                elif name == "get_documents":
-                    result = await self.client.get_documents()
-                elif name == "get_documents_paginated":
-                    result = await self.client.get_documents_paginated(
-                        page=arguments["page"],
-                        page_size=arguments["page_size"],
-                    )
-                elif name == "delete_document":
-                    result = await self.client.delete_document(
-                        document_id=arguments["document_id"]
-                    )
-                elif name == "clear_documents":
-                    result = await self.client.clear_documents()
-                elif name == "document_status":
-                    result = await self.client.document_status(
-                        document_id=arguments.get("document_id")
-                    )
-                # Query Tools
-                elif name == "query_text":
-                    result = await self.client.query_text(
-                        query=arguments["query"],
-                        mode=arguments.get("mode", "hybrid"),
-                        only_need_context=arguments.get("only_need_context", False),
-                        top_k=arguments.get("top_k", 60),
-                        max_tokens=arguments.get("max_tokens"),
-                    )
-                elif name == "query_text_stream":
-                    result = await self.client.query_text_stream(
-                        query=arguments["query"],
-                        mode=arguments.get("mode", "hybrid"),
-                        only_need_context=arguments.get("only_need_context", False),
-                    )
-                elif name == "query_with_citation":
-                    result = await self.client.query_with_citation(
-                        query=arguments["query"],
-                        mode=arguments.get("mode", "hybrid"),
-                    )
-                # Knowledge Graph Tools
-                elif name == "get_knowledge_graph":
-                    result = await self.client.get_knowledge_graph()
-                elif name == "get_graph_structure":
-                    result = await self.client.get_graph_structure()
-                elif name == "get_entities":
-                    result = await self.client.get_entities(limit=arguments.get("limit"))
-                elif name == "get_relations":
-                    result = await self.client.get_relations(limit=arguments.get("limit"))
-                elif name == "check_entity_exists":
-                    result = await self.client.check_entity_exists(
-                        entity_name=arguments["entity_name"]
-                    )
-                elif name == "update_entity":
-                    result = await self.client.update_entity(
-                        entity_id=arguments["entity_id"],
-                        properties=arguments["properties"],
-                    )
-                elif name == "delete_entity":
-                    result = await self.client.delete_entity(
-                        entity_id=arguments["entity_id"]
-                    )
-                elif name == "delete_relation":
-                    result = await self.client.delete_relation(
-                        relation_id=arguments["relation_id"]
-                    )
-                # System Management Tools
-                elif name == "get_health":
-                    result = await self.client.get_health()
-                elif name == "get_status":
-                    result = await self.client.get_status()
-                elif name == "clear_cache":
-                    result = await self.client.clear_cache(
-                        cache_type=arguments.get("cache_type", "all")
-                    )
-                elif name == "get_config":
-                    result = await self.client.get_config()
-                elif name == "get_workspace_info":
-                    result = await self.client.get_workspace_info()
-                else:
+                arguments = arguments or {}
+                error = tool.validate(arguments)
+                if error is not None:
+                    outcome = "invalid"
                     return [
                         TextContent(
                             type="text",
-                            text=f"Unknown tool: {name}",
+                            text=f"Invalid arguments for {name}: {error}",
                         )
                     ]
 
-                return [
-                    TextContent(
-                        type="text",
-                        text=str(result),
-                    )
-                ]
+                result = await tool(arguments, self.client)
+                with self.client.tracer.span("serialize"):
+                    content = self.formatter.format(name, result)
+                outcome = "ok"
+                return content
 
             except Exception as e:
+                if span is not None:
+                    span.set_error(e)
                 return [
                     TextContent(
                         type="text",
@@ -543,16 +329,235 @@ class LightRAGMCPServer:
                     )
                 ]
 
-    async def run(self):
-        """Run the MCP server."""
-        from mcp.server.stdio import stdio_server
+            finally:
+                if span is not None:
+                    span.set_attribute("mcp.tool.outcome", outcome)
+                metrics.tool_finished(name, outcome, time.perf_counter() - started)
+
+    async def _get_mcp_metrics(self, arguments: dict[str, Any]) -> Any:
+        """Get tool and endpoint metrics, in OpenMetrics text format if requested."""
+        if arguments.get("format") == "openmetrics":
+            return self.client.metrics.render()
+        return self.client.metrics.snapshot()
+
+    async def _get_knowledge_graph(self, arguments: dict[str, Any]) -> Any:
+        """Get the knowledge graph, from the local snapshot when enabled."""
+        if not self.serve_graph_from_snapshot:
+            return await self.client.get_knowledge_graph()
+        return (await self.graph_cache.snapshot()).to_payload()
+
+    async def _get_graph_structure(self, arguments: dict[str, Any]) -> Any:
+        """Get graph statistics, computed from the local snapshot when enabled."""
+        if not self.serve_graph_from_snapshot:
+            return await self.client.get_graph_structure()
+        return (await self.graph_cache.snapshot()).structure()
 
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options(),
+    async def _get_entities(self, arguments: dict[str, Any]) -> Any:
+        """Get entities, from the local snapshot when enabled."""
+        if not self.serve_graph_from_snapshot:
+            return await self.client.get_entities(limit=arguments.get("limit"))
+        return (await self.graph_cache.snapshot()).entities(arguments.get("limit"))
+
+    async def _get_relations(self, arguments: dict[str, Any]) -> Any:
+        """Get relations, from the local snapshot when enabled."""
+        if not self.serve_graph_from_snapshot:
+            return await self.client.get_relations(limit=arguments.get("limit"))
+        return (await self.graph_cache.snapshot()).relations(arguments.get("limit"))
+
+    async def _check_entity_exists(self, arguments: dict[str, Any]) -> Any:
+        """Check one entity, against the local name index when enabled."""
+        if not self.serve_graph_from_snapshot:
+            return await self.client.check_entity_exists(arguments["entity_name"])
+        index = (await self.graph_cache.snapshot()).name_index()
+        return {"exists": index.exists(arguments["entity_name"])}
+
+    async def _check_entities_exist(self, arguments: dict[str, Any]) -> Any:
+        """Check a batch of entity names against the local name index."""
+        index = (await self.graph_cache.snapshot()).name_index()
+        results = [
+            index.check(
+                name,
+                fuzzy=arguments.get("fuzzy", False),
+                max_distance=arguments.get("max_distance", 2),
+                max_suggestions=arguments.get("max_suggestions", 3),
             )
+            for name in arguments["entity_names"]
+        ]
+        return {
+            "results": results,
+            "found": sum(result["exists"] for result in results),
+            "total": len(results),
+        }
+
+    async def _search_entities(self, arguments: dict[str, Any]) -> Any:
+        """Find entity names by prefix or edit distance in the local name index."""
+        index = (await self.graph_cache.snapshot()).name_index()
+        limit = arguments.get("limit", 10)
+        if arguments.get("match", "prefix") == "fuzzy":
+            matches = index.fuzzy(arguments["query"], arguments.get("max_distance", 2), limit)
+        else:
+            matches = [{"name": name} for name in index.prefix(arguments["query"], limit)]
+        return {"query": arguments["query"], "matches": matches}
+
+    async def _get_entity_neighbors(self, arguments: dict[str, Any]) -> Any:
+        """Get an entity's neighborhood from the local graph snapshot."""
+        index = (await self.graph_cache.snapshot()).adjacency()
+        return index.neighbors(
+            arguments["entity"], arguments.get("depth", 1), arguments.get("limit", 100)
+        )
+
+    async def _get_subgraph(self, arguments: dict[str, Any]) -> Any:
+        """Get a k-hop subgraph from the local graph snapshot."""
+        index = (await self.graph_cache.snapshot()).adjacency()
+        return index.subgraph(
+            arguments["entities"], arguments.get("k", 1), arguments.get("max_nodes", 500)
+        )
+
+    async def _find_shortest_path(self, arguments: dict[str, Any]) -> Any:
+        """Find a shortest path in the local graph snapshot."""
+        index = (await self.graph_cache.snapshot()).adjacency()
+        return index.shortest_path(
+            arguments["source"], arguments["target"], arguments.get("max_depth", 6)
+        )
+
+    async def _get_top_entities(self, arguments: dict[str, Any]) -> Any:
+        """Rank entities by degree in the local graph snapshot."""
+        index = (await self.graph_cache.snapshot()).adjacency()
+        return index.top_entities(arguments.get("limit", 20))
+
+    async def _upload_documents(self, arguments: dict[str, Any]) -> Any:
+        """Upload files concurrently, reporting each finished file as progress."""
+        return await self.client.upload_documents(
+            file_paths=arguments["file_paths"],
+            max_concurrency=arguments.get("max_concurrency", 4),
+            progress=self._upload_progress(len(arguments["file_paths"])),
+        )
+
+    def _upload_progress(self, total_files: int) -> Optional["UploadProgress"]:
+        """Build a callback that reports each finished file as MCP progress."""
+        ctx = self.server.request_context
+        token = ctx.meta.progressToken if ctx.meta else None
+        if token is None:
+            return None
+        finished = 0
+
+        async def report(file_path: str, sent: int, total: int) -> None:
+            nonlocal finished
+            if sent < total:
+                return
+            finished += 1
+            await ctx.session.send_progress_notification(
+                progress_token=token,
+                progress=finished,
+                total=total_files,
+                message=f"Uploaded {file_path} ({total} bytes)",
+                related_request_id=ctx.request_id,
+            )
+
+        return report
+
+    async def _query_text_stream(self, arguments: dict[str, Any]) -> str:
+        """Run a streaming query, forwarding chunks as MCP progress notifications."""
+        ctx = self.server.request_context
+        token = ctx.meta.progressToken if ctx.meta else None
+        parts: list[str] = []
+        async for frame in self.client.query_stream(
+            query=arguments["query"],
+            mode=arguments.get("mode", "hybrid"),
+            only_need_context=arguments.get("only_need_context", False),
+        ):
+            chunk = frame.get("response")
+            if not chunk:
+                continue
+            parts.append(str(chunk))
+            if token is not None:
+                await ctx.session.send_progress_notification(
+                    progress_token=token,
+                    progress=len(parts),
+                    message=str(chunk),
+                    related_request_id=ctx.request_id,
+                )
+        return "".join(parts)
+
+    def http_app(self) -> "Starlette":
+        """
+        Build the ASGI app serving MCP sessions over streamable HTTP at ``http_path``.
+
+        Each request runs in the session of its ``LIGHTRAG-WORKSPACE`` header and
+        ``Authorization: Bearer`` (or ``X-API-Key``) key, falling back to the
+        configured workspace and key; all sessions share the default client's
+        connection pool, scheduler and caches.
+        """
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+
+        manager = StreamableHTTPSessionManager(
+            app=self.server,
+            session_idle_timeout=self.http_session_idle_timeout or None,
+            max_sessions=self.http_max_sessions or None,
+        )
+
+        @asynccontextmanager
+        async def lifespan(app: Any) -> Any:
+            async with manager.run():
+                yield
+
+        endpoint = _MCPEndpoint(manager, self.http_require_auth)
+        return Starlette(routes=[Route(self.http_path, endpoint=endpoint)], lifespan=lifespan)
+
+    async def run(self, transport: str = "stdio"):
+        """
+        Run the MCP server.
+
+        Args:
+            transport: "stdio" for one client over stdin/stdout, or "http" for
+                many concurrent sessions over streamable HTTP (with SSE streams)
+        """
+        if transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of {', '.join(TRANSPORTS)}")
+
+        metrics_server = None
+        if self.metrics_port:
+            from .metrics import MetricsServer
+
+            metrics_server = MetricsServer(
+                self.client.metrics, host=self.metrics_host, port=self.metrics_port
+            )
+            await metrics_server.start()
+
+        try:
+            if transport == "http":
+                import uvicorn
+
+                if self.api_key and not self.http_require_auth:
+                    print(
+                        "Warning: LIGHTRAG_HTTP_REQUIRE_AUTH is off, so HTTP sessions without "
+                        "their own API key use LIGHTRAG_API_KEY on the default workspace",
+                        file=sys.stderr,
+                    )
+                config = uvicorn.Config(
+                    self.http_app(),
+                    host=self.http_host,
+                    port=self.http_port,
+                    log_level="warning",
+                )
+                await uvicorn.Server(config).serve()
+            else:
+                from mcp.server.stdio import stdio_server
+
+                async with stdio_server() as (read_stream, write_stream):
+                    await self.server.run(
+                        read_stream,
+                        write_stream,
+                        self.server.create_initialization_options(),
+                    )
+        finally:
+            if metrics_server is not None:
+                await metrics_server.close()
+            await self.sessions.close()
+            await self.client.close()
+            self.client.tracer.close()
 
 
 def create_server(
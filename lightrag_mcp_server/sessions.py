@@ -0,0 +1,121 @@
+"""Per-identity state for MCP sessions served over the HTTP transport."""
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .client import LightRAGClient
+    from .graph import GraphCache
+
+# Request headers selecting the LightRAG workspace and credentials of a session
+WORKSPACE_HEADER = "lightrag-workspace"
+API_KEY_HEADER = "x-api-key"
+
+Identity = Tuple[Optional[str], Optional[str]]
+
+
+def request_identity(headers: Mapping[str, str]) -> Identity:
+    """
+    Get the workspace and API key an HTTP request asks for.
+
+    Args:
+        headers: Request headers (lower-case names)
+
+    Returns:
+        (workspace, api_key); None for whatever the request does not set. The
+        API key is read from ``Authorization: Bearer`` or ``X-API-Key``.
+    """
+    api_key = headers.get(API_KEY_HEADER)
+    authorization = headers.get("authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        api_key = authorization[7:].strip()
+    return headers.get(WORKSPACE_HEADER) or None, api_key or None
+
+
+class Session:
+    """The client view and graph cache that tool calls of one identity use."""
+
+    def __init__(self, client: "LightRAGClient", graph_cache: "GraphCache"):
+        """
+        Initialize the session.
+
+        Args:
+            client: Client (or client view) sending the identity's workspace and key
+            graph_cache: Graph snapshot of the identity's workspace
+        """
+        self.client = client
+        self.graph_cache = graph_cache
+        # Tool calls using the session; a retired session is closed once this drops to 0
+        self.users = 0
+        self.retired = False
+
+
+class SessionRegistry:
+    """Sessions keyed by (workspace, API key), least recently used evicted first.
+
+    Every MCP session presenting the same identity shares one entry, so
+    hundreds of sessions cost only as many client views and graph snapshots
+    as there are distinct identities. An evicted session still serving tool
+    calls is closed when the last of them finishes.
+    """
+
+    def __init__(
+        self, factory: Callable[[Optional[str], Optional[str]], Session], max_size: int = 1024
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            factory: Builds the session of a (workspace, api_key) identity
+            max_size: Identities kept before the least recently used is closed
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self._sessions: "OrderedDict[Identity, Session]" = OrderedDict()
+        self.created = 0
+        self.evicted = 0
+
+    @asynccontextmanager
+    async def use(self, workspace: Optional[str], api_key: Optional[str]) -> AsyncIterator[Session]:
+        """Hold the session of an identity for one tool call, creating it on first use."""
+        identity = (workspace, api_key)
+        session = self._sessions.get(identity)
+        if session is not None:
+            self._sessions.move_to_end(identity)
+        else:
+            session = self._sessions[identity] = self.factory(workspace, api_key)
+            self.created += 1
+        session.users += 1
+        try:
+            while len(self._sessions) > self.max_size:
+                _, evicted = self._sessions.popitem(last=False)
+                self.evicted += 1
+                await self._retire(evicted)
+            yield session
+        finally:
+            session.users -= 1
+            if session.retired and not session.users:
+                await session.client.close()
+
+    async def _retire(self, session: Session) -> None:
+        """Stop handing out a session, closing it now if no tool call is using it."""
+        session.retired = True
+        if not session.users:
+            await session.client.close()
+
+    async def close(self) -> None:
+        """Close every session, deferring those still in use until their calls finish."""
+        sessions, self._sessions = list(self._sessions.values()), OrderedDict()
+        for session in sessions:
+            await self._retire(session)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get identity counts."""
+        return {
+            "identities": len(self._sessions),
+            "max_identities": self.max_size,
+            "in_use": sum(1 for session in self._sessions.values() if session.users),
+            "created": self.created,
+            "evicted": self.evicted,
+        }
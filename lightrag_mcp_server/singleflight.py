@@ -0,0 +1,79 @@
+"""Coalescing of identical in-flight requests."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Share one upstream call between concurrent identical requests.
+
+    A caller that is cancelled leaves the shared call running for the others;
+    once every caller has gone away the call itself is cancelled.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the single-flight group."""
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._callers: Dict["asyncio.Future[Any]", int] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` once for all concurrent callers using the same key.
+
+        Args:
+            key: Identity of the request
+            fn: Factory for the upstream call
+
+        Returns:
+            Result of the shared call
+        """
+        self.calls += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        self._callers[future] = self._callers.get(future, 0) + 1
+        try:
+            # Shield so one cancelled caller does not cancel the call for the others
+            return await asyncio.shield(future)
+        finally:
+            remaining = self._callers[future] - 1
+            if remaining:
+                self._callers[future] = remaining
+            else:
+                del self._callers[future]
+                if not future.done():
+                    # The last caller was cancelled; nobody is left to use the result
+                    await self._abandon(key, future)
+
+    async def _abandon(self, key: str, future: "asyncio.Future[Any]") -> None:
+        """Cancel a call every caller has given up on and wait until it has stopped."""
+        if self._inflight.get(key) is future:
+            # New callers must not join a call that is being cancelled
+            del self._inflight[key]
+        future.cancel()
+        self.abandoned += 1
+        await asyncio.wait({future})
+
+    def _done(self, key: str, future: "asyncio.Future[Any]") -> None:
+        """Forget a finished call."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get coalescing counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,857 @@
+"""Declarative registry of the MCP tools exposed by the server."""
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from jsonschema import Draft202012Validator
+from mcp.types import Tool
+
+_MISSING = object()
+
+
+class ToolSpec:
+    """Definition of one MCP tool and the method that implements it."""
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        description: str,
+        input_schema: Dict[str, Any],
+        on_server: bool = False,
+    ):
+        """
+        Define a tool.
+
+        Args:
+            name: Tool name
+            method: Name of the implementing method
+            description: Tool description shown to clients
+            input_schema: JSON schema of the tool arguments
+            on_server: Call ``method`` on the MCP server with the raw arguments
+                instead of on the LightRAG client with bound keyword arguments
+        """
+        self.name = name
+        self.method = method
+        self.description = description
+        self.input_schema = input_schema
+        self.on_server = on_server
+
+    def tool(self) -> Tool:
+        """Build the MCP ``Tool`` definition."""
+        return Tool(name=self.name, description=self.description, inputSchema=self.input_schema)
+
+
+class BoundTool:
+    """A tool spec resolved against live objects, ready to be called."""
+
+    def __init__(self, spec: ToolSpec, target: Any):
+        """
+        Resolve a spec.
+
+        Args:
+            spec: Tool definition
+            target: Object providing ``spec.method``
+
+        Raises:
+            AttributeError: If ``target`` does not implement ``spec.method``
+        """
+        if not callable(getattr(target, spec.method, None)):
+            raise AttributeError(f"{type(target).__name__} has no method {spec.method!r}")
+        self.spec = spec
+        self.target = target
+        self.validator = Draft202012Validator(spec.input_schema)
+        required = set(spec.input_schema.get("required", []))
+        # (argument, default) pairs; required arguments have no default
+        self.params: List[Tuple[str, Any]] = [
+            (prop, _MISSING if prop in required else schema.get("default"))
+            for prop, schema in spec.input_schema.get("properties", {}).items()
+        ]
+
+    def validate(self, arguments: Dict[str, Any]) -> Optional[str]:
+        """Validate arguments, returning an error message if they are invalid."""
+        error = next(iter(self.validator.iter_errors(arguments)), None)
+        return None if error is None else error.message
+
+    async def __call__(self, arguments: Dict[str, Any], client: Any = None) -> Any:
+        """
+        Invoke the implementing method.
+
+        Args:
+            arguments: Tool arguments
+            client: LightRAG client to call instead of the bound one (ignored by
+                ``on_server`` tools); the method is looked up on every call so a
+                replaced client is used
+        """
+        if self.spec.on_server:
+            return await getattr(self.target, self.spec.method)(arguments)
+        kwargs = {}
+        for prop, default in self.params:
+            if default is _MISSING:
+                kwargs[prop] = arguments[prop]
+            else:
+                kwargs[prop] = arguments.get(prop, default)
+        func: Callable[..., Awaitable[Any]] = getattr(
+            self.target if client is None else client, self.spec.method
+        )
+        return await func(**kwargs)
+
+
+class ToolRegistry:
+    """Name-indexed tools with precompiled argument validators."""
+
+    def __init__(self, specs: Iterable[ToolSpec], server: Any, client: Any):
+        """
+        Bind every spec to the server or client.
+
+        Args:
+            specs: Tool definitions
+            server: MCP server object for ``on_server`` tools
+            client: LightRAG client for all other tools
+        """
+        self.tools: Dict[str, BoundTool] = {
+            spec.name: BoundTool(spec, server if spec.on_server else client) for spec in specs
+        }
+        self._catalog: Optional[List[Tool]] = None
+
+    def get(self, name: str) -> Optional[BoundTool]:
+        """Look up a tool by name."""
+        return self.tools.get(name)
+
+    def list_tools(self) -> List[Tool]:
+        """Get the MCP tool list, built once on first use and reused afterwards."""
+        if self._catalog is None:
+            self._catalog = [bound.spec.tool() for bound in self.tools.values()]
+        return self._catalog
+
+
+QUERY_MODES = ["naive", "local", "global", "hybrid", "mix"]
+
+# Options shared by the bulk graph mutation tools
+BULK_OPTIONS: Dict[str, Any] = {
+    "max_concurrency": {
+        "type": "integer",
+        "description": "Maximum number of requests in flight",
+        "default": 8,
+        "minimum": 1,
+    },
+    "dry_run": {
+        "type": "boolean",
+        "description": "Only report the requests that would be sent",
+        "default": False,
+    },
+    "stop_on_error": {
+        "type": "boolean",
+        "description": "Skip remaining items after the first failure",
+        "default": False,
+    },
+}
+
+TOOLS: Tuple[ToolSpec, ...] = (
+    # Document Management (10 tools)
+    ToolSpec(
+        name="insert_text",
+        method="insert_text",
+        description="Insert a single text document into LightRAG",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "Text content to insert",
+                },
+                "description": {
+                    "type": "string",
+                    "description": "Optional description of the text",
+                },
+            },
+            "required": ["text"],
+        },
+    ),
+    ToolSpec(
+        name="insert_texts",
+        method="insert_texts",
+        description="Insert multiple text documents into LightRAG in batch",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "texts": {
+                    "type": "array",
+                    "description": "Array of text documents with optional metadata",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "content": {"type": "string"},
+                            "title": {"type": "string"},
+                            "metadata": {"type": "object"},
+                        },
+                        "required": ["content"],
+                    },
+                },
+            },
+            "required": ["texts"],
+        },
+    ),
+    ToolSpec(
+        name="upload_document",
+        method="upload_document",
+        description="Upload a document file to LightRAG",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to the file to upload",
+                },
+                "chunk_size": {
+                    "type": "integer",
+                    "description": "Custom chunk size for document splitting",
+                },
+                "chunk_overlap": {
+                    "type": "integer",
+                    "description": "Overlap size between chunks",
+                },
+            },
+            "required": ["file_path"],
+        },
+    ),
+    ToolSpec(
+        name="upload_documents",
+        method="_upload_documents",
+        on_server=True,
+        description="Upload multiple documents concurrently",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "file_paths": {
+                    "type": "array",
+                    "description": "Array of file paths to upload",
+                    "items": {"type": "string"},
+                },
+                "max_concurrency": {
+                    "type": "integer",
+                    "description": "Maximum number of files uploaded at once",
+                    "default": 4,
+                },
+            },
+            "required": ["file_paths"],
+        },
+    ),
+    ToolSpec(
+        name="scan_documents",
+        method="scan_documents",
+        description="Scan for new documents in the configured input directory",
+        input_schema={"type": "object", "properties": {}},
+    ),
+    ToolSpec(
+        name="get_documents",
+        method="list_documents",
+        description=(
+            "Retrieve documents from LightRAG, a bounded slice at a time; "
+            "pass next_cursor back as cursor to continue"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of documents to return (1-1000)",
+                    "default": 100,
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "Cursor returned by a previous call",
+                },
+            },
+        },
+    ),
+    ToolSpec(
+        name="get_documents_paginated",
+        method="get_documents_paginated",
+        description="Retrieve documents with pagination support",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "page": {
+                    "type": "integer",
+                    "description": "Page number (1-based)",
+                },
+                "page_size": {
+                    "type": "integer",
+                    "description": "Number of documents per page (1-100)",
+                },
+            },
+            "required": ["page", "page_size"],
+        },
+    ),
+    ToolSpec(
+        name="delete_document",
+        method="delete_document",
+        description="Delete a specific document by ID",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "document_id": {
+                    "type": "string",
+                    "description": "ID of the document to delete",
+                },
+            },
+            "required": ["document_id"],
+        },
+    ),
+    ToolSpec(
+        name="clear_documents",
+        method="clear_documents",
+        description="Clear all documents from LightRAG",
+        input_schema={"type": "object", "properties": {}},
+    ),
+    ToolSpec(
+        name="document_status",
+        method="document_status",
+        description="Get processing status for documents",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "document_id": {
+                    "type": "string",
+                    "description": "Optional specific document ID to check",
+                },
+            },
+        },
+    ),
+    # Query Tools (4 tools)
+    ToolSpec(
+        name="query_text",
+        method="query_text",
+        description="Query LightRAG with text using various retrieval modes",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Query text",
+                },
+                "mode": {
+                    "type": "string",
+                    "description": "Query mode: naive, local, global, hybrid, or mix",
+                    "enum": QUERY_MODES,
+                    "default": "hybrid",
+                },
+                "only_need_context": {
+                    "type": "boolean",
+                    "description": "Return only context without generation",
+                    "default": False,
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": "Number of top results to retrieve",
+                    "default": 60,
+                },
+                "max_tokens": {
+                    "type": "integer",
+                    "description": "Maximum tokens in response",
+                },
+            },
+            "required": ["query"],
+        },
+    ),
+    ToolSpec(
+        name="query_text_stream",
+        method="_query_text_stream",
+        on_server=True,
+        description="Stream query results from LightRAG in real-time",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Query text",
+                },
+                "mode": {
+                    "type": "string",
+                    "description": "Query mode",
+                    "enum": QUERY_MODES,
+                    "default": "hybrid",
+                },
+                "only_need_context": {
+                    "type": "boolean",
+                    "description": "Return only context",
+                    "default": False,
+                },
+            },
+            "required": ["query"],
+        },
+    ),
+    ToolSpec(
+        name="query_with_citation",
+        method="query_with_citation",
+        description="Query LightRAG and get results with source citations",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Query text",
+                },
+                "mode": {
+                    "type": "string",
+                    "description": "Query mode",
+                    "enum": QUERY_MODES,
+                    "default": "hybrid",
+                },
+            },
+            "required": ["query"],
+        },
+    ),
+    ToolSpec(
+        name="query_multi",
+        method="query_multi",
+        description=(
+            "Query LightRAG in several modes (and phrasings) concurrently and merge "
+            "the deduplicated contexts and citations"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Query text",
+                },
+                "modes": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": QUERY_MODES},
+                    "description": "Query modes to run concurrently",
+                    "default": ["naive", "local", "global"],
+                    "minItems": 1,
+                },
+                "queries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Additional phrasings of the query, each run in every mode",
+                },
+                "quorum": {
+                    "type": "integer",
+                    "description": "Return once this many queries succeeded (0 = wait for all)",
+                    "default": 0,
+                    "minimum": 0,
+                },
+                "deadline": {
+                    "type": "number",
+                    "description": "Seconds after which unfinished queries are cancelled "
+                    "(0 = no deadline)",
+                    "default": 0,
+                    "minimum": 0,
+                },
+                "only_need_context": {
+                    "type": "boolean",
+                    "description": "Return only context without generation",
+                    "default": False,
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": "Number of top results to retrieve",
+                    "default": 60,
+                },
+                "with_citation": {
+                    "type": "boolean",
+                    "description": "Ask for source citations",
+                    "default": False,
+                },
+                "include_responses": {
+                    "type": "boolean",
+                    "description": "Include each query's own response in its results entry",
+                    "default": True,
+                },
+            },
+            "required": ["query"],
+        },
+    ),
+    # Knowledge Graph Tools (17 tools)
+    ToolSpec(
+        name="get_knowledge_graph",
+        method="_get_knowledge_graph",
+        on_server=True,
+        description="Retrieve the complete knowledge graph from LightRAG",
+        input_schema={"type": "object", "properties": {}},
+    ),
+    ToolSpec(
+        name="get_graph_structure",
+        method="_get_graph_structure",
+        on_server=True,
+        description="Get the structure and statistics of the knowledge graph",
+        input_schema={"type": "object", "properties": {}},
+    ),
+    ToolSpec(
+        name="get_entities",
+        method="_get_entities",
+        on_server=True,
+        description="Retrieve all entities from the knowledge graph",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of entities to retrieve",
+                },
+            },
+        },
+    ),
+    ToolSpec(
+        name="get_relations",
+        method="_get_relations",
+        on_server=True,
+        description="Retrieve all relationships from the knowledge graph",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of relations to retrieve",
+                },
+            },
+        },
+    ),
+    ToolSpec(
+        name="check_entity_exists",
+        method="_check_entity_exists",
+        on_server=True,
+        description="Check if an entity exists in the knowledge graph",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "entity_name": {
+                    "type": "string",
+                    "description": "Name of the entity to check",
+                },
+            },
+            "required": ["entity_name"],
+        },
+    ),
+    ToolSpec(
+        name="check_entities_exist",
+        method="_check_entities_exist",
+        on_server=True,
+        description=(
+            "Check many entity names at once against a local index, with "
+            "case-insensitive matches and optional typo-tolerant suggestions"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "entity_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Entity names to check",
+                },
+                "fuzzy": {
+                    "type": "boolean",
+                    "description": "Suggest close names for those that do not exist",
+                    "default": False,
+                },
+                "max_distance": {
+                    "type": "integer",
+                    "description": "Maximum edit distance for suggestions",
+                    "default": 2,
+                    "minimum": 0,
+                },
+                "max_suggestions": {
+                    "type": "integer",
+                    "description": "Maximum suggestions per name",
+                    "default": 3,
+                    "minimum": 1,
+                },
+            },
+            "required": ["entity_names"],
+        },
+    ),
+    ToolSpec(
+        name="search_entities",
+        method="_search_entities",
+        on_server=True,
+        description="Find entity names by prefix or approximate spelling",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Name or name prefix"},
+                "match": {
+                    "type": "string",
+                    "enum": ["prefix", "fuzzy"],
+                    "description": "Match names by prefix or by edit distance",
+                    "default": "prefix",
+                },
+                "max_distance": {
+                    "type": "integer",
+                    "description": "Maximum edit distance for fuzzy matches",
+                    "default": 2,
+                    "minimum": 0,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of names to return",
+                    "default": 10,
+                    "minimum": 1,
+                },
+            },
+            "required": ["query"],
+        },
+    ),
+    ToolSpec(
+        name="update_entity",
+        method="update_entity",
+        description="Update properties of an entity in the knowledge graph",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "entity_id": {
+                    "type": "string",
+                    "description": "ID of the entity to update",
+                },
+                "properties": {
+                    "type": "object",
+                    "description": "Properties to update",
+                },
+            },
+            "required": ["entity_id", "properties"],
+        },
+    ),
+    ToolSpec(
+        name="delete_entity",
+        method="delete_entity",
+        description="Delete an entity from the knowledge graph",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "entity_id": {
+                    "type": "string",
+                    "description": "ID of the entity to delete",
+                },
+            },
+            "required": ["entity_id"],
+        },
+    ),
+    ToolSpec(
+        name="delete_relation",
+        method="delete_relation",
+        description="Delete a relationship from the knowledge graph",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "relation_id": {
+                    "type": "string",
+                    "description": "ID of the relation to delete",
+                },
+            },
+            "required": ["relation_id"],
+        },
+    ),
+    ToolSpec(
+        name="update_entities",
+        method="update_entities",
+        description="Update many entities concurrently with per-entity results",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "updates": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "entity_id": {"type": "string"},
+                            "properties": {"type": "object"},
+                        },
+                        "required": ["entity_id", "properties"],
+                    },
+                    "description": "Entity IDs with the properties to update",
+                },
+                **BULK_OPTIONS,
+            },
+            "required": ["updates"],
+        },
+    ),
+    ToolSpec(
+        name="delete_entities",
+        method="delete_entities",
+        description="Delete many entities concurrently with per-entity results",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "entity_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "IDs of the entities to delete",
+                },
+                **BULK_OPTIONS,
+            },
+            "required": ["entity_ids"],
+        },
+    ),
+    ToolSpec(
+        name="delete_relations",
+        method="delete_relations",
+        description="Delete many relationships concurrently with per-relation results",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "relation_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "IDs of the relations to delete",
+                },
+                **BULK_OPTIONS,
+            },
+            "required": ["relation_ids"],
+        },
+    ),
+    ToolSpec(
+        name="get_entity_neighbors",
+        method="_get_entity_neighbors",
+        on_server=True,
+        description="List entities within a number of hops of an entity",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "entity": {"type": "string", "description": "Entity name"},
+                "depth": {
+                    "type": "integer",
+                    "description": "Maximum hop distance",
+                    "default": 1,
+                    "minimum": 1,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of neighbors to return",
+                    "default": 100,
+                    "minimum": 1,
+                },
+            },
+            "required": ["entity"],
+        },
+    ),
+    ToolSpec(
+        name="get_subgraph",
+        method="_get_subgraph",
+        on_server=True,
+        description="Get the nodes and edges within k hops of a set of entities",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "entities": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Seed entity names",
+                    "minItems": 1,
+                },
+                "k": {
+                    "type": "integer",
+                    "description": "Hop radius around the seed entities",
+                    "default": 1,
+                    "minimum": 0,
+                },
+                "max_nodes": {
+                    "type": "integer",
+                    "description": "Maximum number of nodes to include",
+                    "default": 500,
+                    "minimum": 1,
+                },
+            },
+            "required": ["entities"],
+        },
+    ),
+    ToolSpec(
+        name="find_shortest_path",
+        method="_find_shortest_path",
+        on_server=True,
+        description="Find a shortest path between two entities in the knowledge graph",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "source": {"type": "string", "description": "Start entity name"},
+                "target": {"type": "string", "description": "End entity name"},
+                "max_depth": {
+                    "type": "integer",
+                    "description": "Maximum path length in hops",
+                    "default": 6,
+                    "minimum": 1,
+                },
+            },
+            "required": ["source", "target"],
+        },
+    ),
+    ToolSpec(
+        name="get_top_entities",
+        method="_get_top_entities",
+        on_server=True,
+        description="List the most connected entities in the knowledge graph",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of entities to return",
+                    "default": 20,
+                    "minimum": 1,
+                },
+            },
+        },
+    ),
+    # System Management Tools (6 tools)
+    ToolSpec(
+        name="get_health",
+        method="get_health",
+        description="Check LightRAG server health and status",
+        input_schema={"type": "object", "properties": {}},
+    ),
+    ToolSpec(
+        name="get_status",
+        method="get_status",
+        description="Get detailed system status and statistics",
+        input_schema={"type": "object", "properties": {}},
+    ),
+    ToolSpec(
+        name="clear_cache",
+        method="clear_cache",
+        description="Clear LightRAG's internal cache",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "cache_type": {
+                    "type": "string",
+                    "description": "Type of cache to clear (default: all)",
+                    "enum": ["all", "llm", "embedding", "query"],
+                    "default": "all",
+                },
+            },
+        },
+    ),
+    ToolSpec(
+        name="get_config",
+        method="get_config",
+        description="Get current LightRAG server configuration",
+        input_schema={"type": "object", "properties": {}},
+    ),
+    ToolSpec(
+        name="get_workspace_info",
+        method="get_workspace_info",
+        description="Get information about the current workspace",
+        input_schema={"type": "object", "properties": {}},
+    ),
+    ToolSpec(
+        name="get_mcp_metrics",
+        method="_get_mcp_metrics",
+        on_server=True,
+        description=(
+            "Get latency percentiles, call and error counts per tool and LightRAG "
+            "endpoint, plus cache, pool and circuit breaker statistics"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "format": {
+                    "type": "string",
+                    "enum": ["json", "openmetrics"],
+                    "description": "Summary as JSON or the raw OpenMetrics text",
+                    "default": "json",
+                },
+            },
+        },
+    ),
+)
@@ -0,0 +1,336 @@
+"""Lightweight tracing of tool calls and LightRAG requests.
+
+Spans follow the OpenTelemetry model (trace/span IDs, parents, attributes,
+events) and are propagated to LightRAG as W3C ``traceparent`` headers. They are
+handed to a pluggable exporter, or to the OpenTelemetry API when it is installed
+and selected.
+"""
+
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple
+
+from .pool import ACQUIRED_EVENTS
+
+_current: ContextVar[Optional["Span"]] = ContextVar("lightrag_mcp_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["Span"] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        start_ns: Optional[int] = None,
+    ):
+        """
+        Start a span.
+
+        Args:
+            name: Operation name
+            parent: Enclosing span; a new trace is started without one
+            attributes: Initial attributes
+            start_ns: Start time in epoch nanoseconds (default: now)
+        """
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.marks: Dict[str, int] = {}
+        self.status = "ok"
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header value identifying this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException) -> None:
+        """Mark the span as failed by ``error``."""
+        self.status = "error"
+        self.events.append(
+            {
+                "name": "exception",
+                "time_ns": time.time_ns(),
+                "attributes": {
+                    "exception.type": type(error).__name__,
+                    "exception.message": str(error),
+                },
+            }
+        )
+
+    def mark(self, event: str) -> None:
+        """Record the first time an HTTP trace event occurred."""
+        self.marks.setdefault(event, time.time_ns())
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        """End the span."""
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form of the span."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": (self.end_ns - self.start_ns) / 1e6 if self.end_ns else None,
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+def http_phases(span: Span) -> List[Tuple[str, int, int]]:
+    """
+    Split an HTTP request span into phases using its httpcore trace marks.
+
+    Returns:
+        (name, start_ns, end_ns) for pool_wait, connect, send, ttfb and body,
+        omitting phases whose events did not occur
+    """
+    marks = span.marks
+    acquired = min((marks[e] for e in ACQUIRED_EVENTS if e in marks), default=None)
+    proto = "http2" if "http2.send_request_headers.started" in marks else "http11"
+
+    def first(*events: str) -> Optional[int]:
+        return next((marks[e] for e in events if e in marks), None)
+
+    bounds = [
+        ("pool_wait", span.start_ns, acquired),
+        (
+            "connect",
+            first("connection.connect_tcp.started"),
+            first("connection.start_tls.complete", "connection.connect_tcp.complete"),
+        ),
+        (
+            "send",
+            first(f"{proto}.send_request_headers.started"),
+            first(f"{proto}.send_request_body.complete", f"{proto}.send_request_headers.complete"),
+        ),
+        (
+            "ttfb",
+            first(f"{proto}.send_request_body.complete", f"{proto}.send_request_headers.complete"),
+            first(f"{proto}.receive_response_headers.complete"),
+        ),
+        (
+            "body",
+            first(f"{proto}.receive_response_body.started"),
+            first(f"{proto}.receive_response_body.complete", f"{proto}.response_closed.started"),
+        ),
+    ]
+    return [(name, s, e) for name, s, e in bounds if s is not None and e is not None]
+
+
+class SpanExporter(Protocol):
+    """Destination for finished spans."""
+
+    def export(self, span: Span) -> None:
+        """Export one finished span."""
+
+    def close(self) -> None:
+        """Flush and release resources."""
+
+
+class InMemoryExporter:
+    """Keep finished spans in a list."""
+
+    def __init__(self) -> None:
+        """Initialize an empty exporter."""
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        """Store a span."""
+        self.spans.append(span)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class JsonFileExporter:
+    """Append finished spans to a file as JSON lines."""
+
+    def __init__(self, path: str):
+        """
+        Open the output file.
+
+        Args:
+            path: File to append spans to
+        """
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        """Write a span as one line."""
+        line = json.dumps(span.to_dict(), default=str, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    """Create spans and export them; without an exporter, tracing is a no-op."""
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            exporter: Where finished spans go (None disables tracing)
+        """
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return self.exporter is not None
+
+    @contextmanager
+    def span(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None, current: bool = True
+    ) -> Iterator[Optional[Span]]:
+        """
+        Run a block inside a child of the current span.
+
+        Args:
+            name: Operation name
+            attributes: Initial attributes
+            current: Make the span current for the block; pass False inside
+                generators, whose context may change between iterations
+
+        Yields:
+            The span, or None when tracing is disabled
+        """
+        if self.exporter is None:
+            yield None
+            return
+        span = Span(name, parent=_current.get(), attributes=attributes)
+        token = _current.set(span) if current else None
+        try:
+            yield span
+        except Exception as e:
+            span.set_error(e)
+            raise
+        finally:
+            if token is not None:
+                _current.reset(token)
+            span.end()
+            for phase, start, end in http_phases(span):
+                child = Span(phase, parent=span, start_ns=start)
+                child.end(end)
+                self.exporter.export(child)
+            self.exporter.export(span)
+
+    def inject(self, headers: Dict[str, str], span: Optional[Span] = None) -> None:
+        """Add the ``traceparent`` of ``span`` (default: the current span) to headers."""
+        span = span or _current.get()
+        if span is not None:
+            headers["traceparent"] = span.traceparent
+
+    def close(self) -> None:
+        """Close the exporter."""
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+class _MirrorSpan(Span):
+    """Local span paired with the OpenTelemetry span it is copied to."""
+
+    def __init__(self, name: str, otel_span: Any, attributes: Optional[Dict[str, Any]]):
+        """Start a mirror of ``otel_span``."""
+        super().__init__(name, attributes=attributes)
+        self.otel_span = otel_span
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer that records spans through the OpenTelemetry API.
+
+    Spans are only exported if an OpenTelemetry SDK is configured in the process;
+    with the bare API they are no-ops.
+    """
+
+    def __init__(self) -> None:
+        """Get a tracer from the globally configured OpenTelemetry provider."""
+        from opentelemetry import context, propagate, trace
+
+        super().__init__(exporter=None)
+        self._context = context
+        self._propagate = propagate
+        self._trace = trace
+        self._tracer = trace.get_tracer("lightrag_mcp_server")
+
+    @property
+    def enabled(self) -> bool:
+        """Always record through the API."""
+        return True
+
+    @contextmanager
+    def span(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None, current: bool = True
+    ) -> Iterator[Optional[Span]]:
+        """Run a block inside an OpenTelemetry span, yielding a local mirror of it."""
+        otel_span = self._tracer.start_span(name, attributes=attributes)
+        mirror = _MirrorSpan(name, otel_span, attributes)
+        context = self._trace.set_span_in_context(otel_span)
+        token = self._context.attach(context) if current else None
+        try:
+            yield mirror
+        except Exception as e:
+            mirror.set_error(e)
+            otel_span.record_exception(e)
+            raise
+        finally:
+            if token is not None:
+                self._context.detach(token)
+            mirror.end()
+            otel_span.set_attributes(mirror.attributes)
+            if mirror.status == "error":
+                otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+            for phase, start, end in http_phases(mirror):
+                self._tracer.start_span(phase, context=context, start_time=start).end(end)
+            otel_span.end(mirror.end_ns)
+
+    def inject(self, headers: Dict[str, str], span: Optional[Span] = None) -> None:
+        """Add trace context headers for ``span`` or the current OpenTelemetry span."""
+        if isinstance(span, _MirrorSpan):
+            self._propagate.inject(headers, context=self._trace.set_span_in_context(span.otel_span))
+        else:
+            self._propagate.inject(headers)
+
+
+def create_tracer(mode: Optional[str], path: Optional[str] = None) -> Tracer:
+    """
+    Build a tracer from configuration.
+
+    Args:
+        mode: "json" (spans to ``path``), "otel" (OpenTelemetry API) or empty to disable
+        path: Output file for the JSON exporter
+    """
+    if not mode:
+        return Tracer()
+    if mode == "json":
+        return Tracer(JsonFileExporter(path or "lightrag-mcp-traces.jsonl"))
+    if mode == "otel":
+        return OpenTelemetryTracer()
+    raise ValueError("tracing mode must be one of json, otel")
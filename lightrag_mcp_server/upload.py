@@ -0,0 +1,94 @@
+"""Streaming multipart encoding of files read from disk."""
+
+import asyncio
+import inspect
+import mimetypes
+import os
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+# Called with (file_path, bytes_sent, total_bytes) as a file is streamed
+UploadProgress = Callable[[str, int, int], Any]
+
+
+class MultipartUpload:
+    """A ``multipart/form-data`` body that streams one file in fixed-size chunks.
+
+    The body can be iterated more than once, so a request that failed before
+    reaching the server can be retried.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        fields: Optional[Dict[str, Any]] = None,
+        field_name: str = "file",
+        chunk_size: int = 64 * 1024,
+        progress: Optional[UploadProgress] = None,
+    ):
+        """
+        Prepare a multipart upload.
+
+        Args:
+            file_path: Local file to upload
+            fields: Extra form fields sent before the file part
+            field_name: Form field name of the file part
+            chunk_size: Bytes read from disk per chunk
+            progress: Optional callback invoked after each chunk
+        """
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.file_size = os.path.getsize(file_path)
+        self.boundary = uuid.uuid4().hex
+
+        filename = os.path.basename(file_path).replace('"', "%22")
+        mime_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        head = []
+        for name, value in (fields or {}).items():
+            if value is None:
+                continue
+            head.append(
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f"{value}\r\n"
+            )
+        head.append(
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+            f"Content-Type: {mime_type}\r\n\r\n"
+        )
+        self._head = "".join(head).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Content headers for the request."""
+        return {
+            "Content-Type": f"multipart/form-data; boundary={self.boundary}",
+            "Content-Length": str(len(self._head) + self.file_size + len(self._tail)),
+        }
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield the encoded body, reading the file off the event loop."""
+        yield self._head
+        sent = 0
+        with open(self.file_path, "rb") as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, self.chunk_size)
+                if not chunk:
+                    break
+                sent += len(chunk)
+                yield chunk
+                await self._report(sent)
+        if sent == 0:
+            await self._report(0)
+        yield self._tail
+
+    async def _report(self, sent: int) -> None:
+        """Invoke the progress callback, awaiting it if it is a coroutine."""
+        if self.progress is None:
+            return
+        result = self.progress(self.file_path, sent, self.file_size)
+        if inspect.isawaitable(result):
+            await result
@@ -0,0 +1,79 @@
+"""Tests for client-side insert batching."""
+
+import asyncio
+import json
+
+import httpx
+
+from lightrag_mcp_server.batching import InsertBatcher
+from lightrag_mcp_server.client import LightRAGClient
+
+
+class TestInsertBatcher:
+    """Tests for InsertBatcher."""
+
+    async def test_size_threshold_flushes(self):
+        """Test that a full batch is sent without waiting for the window."""
+        batches = []
+
+        async def send(texts):
+            batches.append(texts)
+            return {"status": "success", "document_ids": [f"doc_{i}" for i in range(len(texts))]}
+
+        batcher = InsertBatcher(send, window=60, max_batch=8)
+        batcher.batch_size = 2
+        results = await asyncio.gather(batcher.submit("a"), batcher.submit("b", "desc"))
+        assert batches == [[{"content": "a"}, {"content": "b", "description": "desc"}]]
+        assert [r["document_id"] for r in results] == ["doc_0", "doc_1"]
+        assert results[0]["batch_size"] == 2
+
+    async def test_failure_reaches_every_caller(self):
+        """Test that a failed batch fails each document's call and shrinks batches."""
+
+        async def send(texts):
+            raise Exception("backend down")
+
+        batcher = InsertBatcher(send, window=0.001, max_batch=8)
+        batcher.batch_size = 4
+        results = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+        assert all(str(r) == "backend down" for r in results)
+        assert batcher.batch_size == 2
+
+
+class TestClientBatching:
+    """Tests for batched insert_text in LightRAGClient."""
+
+    async def test_inserts_are_coalesced(self):
+        """Test that concurrent insert_text calls share one /documents/texts request."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            calls.append((request.url.path, len(body["texts"])))
+            return httpx.Response(200, json={"status": "success"})
+
+        client = LightRAGClient(base_url="http://lightrag.test", insert_batch_window=0.01)
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        results = await asyncio.gather(*(client.insert_text(f"doc {i}") for i in range(10)))
+        assert all(r["status"] == "success" for r in results)
+        assert sum(n for _, n in calls) == 10
+        assert len(calls) < 10
+        assert {path for path, _ in calls} == {"/documents/texts"}
+
+    async def test_close_flushes_buffer(self):
+        """Test that closing the client sends buffered documents."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"status": "success"})
+
+        client = LightRAGClient(base_url="http://lightrag.test", insert_batch_window=60)
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pending = asyncio.ensure_future(client.insert_text("late"))
+        await asyncio.sleep(0)
+        await client.close()
+        assert (await pending)["status"] == "success"
+        assert calls == ["/documents/texts"]
@@ -0,0 +1,58 @@
+"""Tests for the benchmark harness and mock LightRAG server."""
+
+import httpx
+
+from benchmarks.mock_lightrag import MockConfig, MockLightRAG
+from benchmarks.run import compare, percentile, run_workload
+from lightrag_mcp_server.client import LightRAGClient
+
+
+class TestMockLightRAG:
+    """Tests for the mock server."""
+
+    async def test_endpoints_and_failure_injection(self):
+        """Test ETag revalidation, streaming and injected 503s."""
+        mock = MockLightRAG(MockConfig(latency=0, stream_interval=0, graph_nodes=10))
+        await mock.start()
+        client = LightRAGClient(base_url=mock.url, max_retries=0)
+        try:
+            first = await client.get_knowledge_graph_response()
+            second = await client.get_knowledge_graph_response(etag=first.headers["ETag"])
+            assert len(first.json()["nodes"]) == 10
+            assert second.status_code == 304
+            assert len(await client.query_text_stream("q")) == 2040
+
+            mock.config.failure_rate = 1.0
+            async with httpx.AsyncClient() as http:
+                response = await http.get(f"{mock.url}/health")
+            assert response.status_code == 503
+            assert mock.failures == 1
+        finally:
+            await client.close()
+            await mock.close()
+
+
+class TestHarness:
+    """Tests for report statistics and baseline comparison."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([], 0.5) is None
+
+    def test_compare_flags_regressions(self):
+        """Test that only changes beyond the threshold in the bad direction count."""
+        baseline = {"workloads": {"query": {"throughput_rps": 100.0, "p95_ms": 10.0}}}
+        report = {"workloads": {"query": {"throughput_rps": 70.0, "p95_ms": 8.0}}}
+        assert compare(report, baseline, 0.2) == ["query.throughput_rps: 100.0 -> 70.0 (-30%)"]
+
+    async def test_workload_over_stdio(self):
+        """Test a short workload against a real server process."""
+        config = MockConfig(latency=0, graph_nodes=10)
+        report = await run_workload("query", requests=4, concurrency=2, config=config, warmup=1)
+        assert report["errors"] == 0
+        assert report["upstream_requests"] == 5
+        assert report["p50_ms"] <= report["p99_ms"]
+        assert report["startup_s"] > 0
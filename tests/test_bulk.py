@@ -0,0 +1,94 @@
+"""Tests for bulk graph mutations."""
+
+import asyncio
+
+import httpx
+
+from lightrag_mcp_server.bulk import run_bulk
+from lightrag_mcp_server.client import LightRAGClient
+
+
+def make_client(handler):
+    """Create a client that is served by ``handler`` and does not retry."""
+    client = LightRAGClient(base_url="http://lightrag.test", max_retries=0, breaker_threshold=1000)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestRunBulk:
+    """Tests for run_bulk."""
+
+    async def test_same_id_runs_in_order(self):
+        """Test that operations on one ID never overlap and keep input order."""
+        log = []
+
+        def op(item_id, n):
+            async def call():
+                log.append((item_id, n, "start"))
+                await asyncio.sleep(0.01 if n == 0 else 0)
+                log.append((item_id, n, "end"))
+                return n
+
+            return (item_id, f"op {n}", call)
+
+        result = await run_bulk([op("a", 0), op("b", 1), op("a", 2)], "id", max_concurrency=4)
+        assert [r["response"] for r in result["results"]] == [0, 1, 2]
+        a_events = [e for e in log if e[0] == "a"]
+        assert a_events == [("a", 0, "start"), ("a", 0, "end"), ("a", 2, "start"), ("a", 2, "end")]
+
+    async def test_stop_on_error(self):
+        """Test that remaining items are skipped after a failure."""
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def ok():
+            return "ok"
+
+        ops = [("x", "", fail), ("y", "", ok), ("z", "", ok)]
+        result = await run_bulk(ops, "id", max_concurrency=1, stop_on_error=True)
+        assert [r["status"] for r in result["results"]] == ["error", "skipped", "skipped"]
+        assert result["status"] == "error"
+
+
+class TestClientBulk:
+    """Tests for the bulk client methods."""
+
+    async def test_delete_entities_concurrent_with_partial_failure(self):
+        """Test bounded concurrency, per-item results and duplicate handling."""
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if request.url.path.endswith("/missing"):
+                return httpx.Response(404, json={"detail": "not found"})
+            return httpx.Response(200, json={"status": "deleted"})
+
+        client = make_client(handler)
+        ids = [f"e{i}" for i in range(10)] + ["missing", "e0"]
+        result = await client.delete_entities(ids, max_concurrency=3)
+        assert peak == 3
+        assert result["status"] == "partial_success"
+        assert (result["succeeded"], result["failed"], result["skipped"]) == (10, 1, 1)
+        assert [r["entity_id"] for r in result["results"]] == ids
+        assert result["results"][-1]["reason"] == "duplicate"
+
+    async def test_dry_run_sends_nothing(self):
+        """Test that a dry run only describes the requests."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={})
+
+        client = make_client(handler)
+        result = await client.update_entities(
+            [{"entity_id": "OpenAI", "properties": {"type": "ORG"}}], dry_run=True
+        )
+        assert requests == []
+        assert result["status"] == "dry_run"
+        assert result["results"][0]["request"] == "PUT /graph/entity/OpenAI"
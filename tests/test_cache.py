@@ -0,0 +1,95 @@
+"""Tests for the LightRAG query result cache."""
+
+import httpx
+import pytest
+
+from lightrag_mcp_server.cache import QueryCache
+from lightrag_mcp_server.client import LightRAGClient
+
+
+class TestQueryCache:
+    """Tests for QueryCache."""
+
+    def test_key_is_order_independent(self):
+        """Test that keys are built from the normalized body."""
+        a = QueryCache.make_key("/query", {"query": "q", "mode": "local"}, "ws")
+        b = QueryCache.make_key("/query", {"mode": "local", "query": "q"}, "ws")
+        c = QueryCache.make_key("/query", {"mode": "local", "query": "q"}, "other")
+        assert a == b
+        assert a != c
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = QueryCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test that entries expire after their TTL."""
+        now = [100.0]
+        monkeypatch.setattr("lightrag_mcp_server.cache.time.monotonic", lambda: now[0])
+        cache = QueryCache(max_size=4, ttl=10)
+        cache.set("a", 1)
+        assert cache.get("a") == (True, 1)
+        now[0] += 11
+        assert cache.get("a") == (False, None)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+
+class TestClientQueryCache:
+    """Tests for query caching in LightRAGClient."""
+
+    @pytest.fixture
+    def calls(self):
+        """Collect requests seen by the mock transport."""
+        return []
+
+    @pytest.fixture
+    def client(self, calls):
+        """Create a client backed by a mock transport."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, request.url.path))
+            return httpx.Response(200, json={"response": "answer"})
+
+        client = LightRAGClient(base_url="http://lightrag.test", workspace="test")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    async def test_repeated_query_is_cached(self, client, calls):
+        """Test that identical queries hit the backend once."""
+        first = await client.query_text("What is RAG?", mode="local")
+        second = await client.query_text("What is RAG?", mode="local")
+        assert first == second == {"response": "answer"}
+        assert calls == [("POST", "/query")]
+        assert client.query_cache.stats()["hits"] == 1
+
+    async def test_write_invalidates_cache(self, client, calls):
+        """Test that write calls drop cached query results."""
+        await client.query_text("What is RAG?")
+        await client.insert_text("New knowledge")
+        await client.query_text("What is RAG?")
+        assert calls == [
+            ("POST", "/query"),
+            ("POST", "/documents/text"),
+            ("POST", "/query"),
+        ]
+
+    async def test_cache_disabled(self, calls):
+        """Test that a zero-sized cache always goes to the backend."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json={})
+
+        client = LightRAGClient(base_url="http://lightrag.test", cache_size=0)
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.query_with_citation("q")
+        await client.query_with_citation("q")
+        assert calls == ["/query", "/query"]
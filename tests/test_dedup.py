@@ -0,0 +1,169 @@
+"""Tests for the ingestion dedup index."""
+
+import hashlib
+import json
+import subprocess
+import sys
+
+import httpx
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.dedup import DedupIndex, hash_file, hash_text, lightrag_document_id
+
+
+def make_client(tmp_path, calls):
+    """Create a client with a dedup index and a mock backend."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.url.path == "/documents/texts":
+            count = len(json.loads(request.content)["texts"])
+            return httpx.Response(
+                200, json={"status": "success", "document_ids": [f"b{i}" for i in range(count)]}
+            )
+        return httpx.Response(200, json={"status": "success", "document_id": "doc_1"})
+
+    index = DedupIndex.for_workspace(str(tmp_path), "test")
+    client = LightRAGClient(base_url="http://lightrag.test", dedup_index=index)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestDedupIndex:
+    """Tests for DedupIndex."""
+
+    def test_text_hash_normalizes_whitespace(self):
+        """Test that whitespace differences hash identically."""
+        assert hash_text("Hello   world\n") == hash_text(" Hello world")
+        assert hash_text("Hello world") != hash_text("hello world")
+
+    async def test_file_hash(self, tmp_path):
+        """Test that files hash by content."""
+        a = tmp_path / "a.txt"
+        b = tmp_path / "b.txt"
+        a.write_bytes(b"same")
+        b.write_bytes(b"same")
+        assert await hash_file(str(a)) == await hash_file(str(b))
+
+    async def test_file_document_id(self, tmp_path):
+        """Test that text files get LightRAG's ID at any chunking and binary files none."""
+        text = tmp_path / "a.txt"
+        text.write_text("\n  Zoë  wrote\n\n  this.  \n\n", encoding="utf-8")
+        expected = lightrag_document_id(text.read_text(encoding="utf-8"))
+        for size in (1, 2, 3, 4096):
+            assert (await hash_file(str(text), chunk_size=size))[1] == expected
+        binary = tmp_path / "b.pdf"
+        binary.write_bytes(b"%PDF-1.4\n\xff\xfe\x00")
+        assert (await hash_file(str(binary)))[1] is None
+
+    def test_persists_per_workspace(self, tmp_path):
+        """Test that entries survive reopening and workspaces are separate."""
+        index = DedupIndex.for_workspace(str(tmp_path), "ws/1")
+        index.add("h", "doc_1")
+        index.close()
+        assert DedupIndex.for_workspace(str(tmp_path), "ws/1").lookup("h") == {
+            "document_id": "doc_1"
+        }
+        assert DedupIndex.for_workspace(str(tmp_path), "other").lookup("h") is None
+
+
+class TestClientDedup:
+    """Tests for deduplicated ingestion in LightRAGClient."""
+
+    def test_not_imported_when_disabled(self):
+        """Test that loading the server does not import the dedup module or sqlite3."""
+        code = (
+            "import sys, lightrag_mcp_server.server\n"
+            "print(sorted({'sqlite3', 'lightrag_mcp_server.dedup'} & set(sys.modules)))"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        assert output.stdout.strip() == "[]", output.stderr
+
+    async def test_duplicate_text_skips_network(self, tmp_path):
+        """Test that re-inserting the same text makes no request."""
+        calls = []
+        client = make_client(tmp_path, calls)
+        await client.insert_text("Some text")
+        result = await client.insert_text("Some  text")
+        assert result["status"] == "duplicate"
+        assert result["document_id"] == "doc_1"
+        assert calls == [("POST", "/documents/text")]
+
+    async def test_insert_texts_sends_only_new(self, tmp_path):
+        """Test that batch inserts drop known and repeated texts."""
+        calls = []
+        client = make_client(tmp_path, calls)
+        await client.insert_text("known")
+        result = await client.insert_texts(
+            [{"content": "known"}, {"content": "new"}, {"content": "new"}]
+        )
+        assert [s["index"] for s in result["skipped"]] == [0, 2]
+        assert client.dedup_index.lookup(hash_text("new")) == {"document_id": "b0"}
+
+    async def test_delete_and_clear_forget_entries(self, tmp_path):
+        """Test that deletions keep the index consistent with the server."""
+        calls = []
+        client = make_client(tmp_path, calls)
+        await client.insert_text("text")
+        await client.delete_document("doc_1")
+        assert (await client.insert_text("text"))["status"] == "success"
+        await client.clear_documents()
+        assert client.dedup_index.stats()["entries"] == 0
+
+    async def test_track_id_response_uses_lightrag_document_id(self, tmp_path):
+        """Test delete and re-insert when LightRAG answers with a track_id only."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, request.url.path))
+            if request.method == "DELETE":
+                return httpx.Response(200, json={"status": "deletion_started"})
+            return httpx.Response(
+                200,
+                json={
+                    "status": "success",
+                    "message": "File processing started",
+                    "track_id": "insert_20250101_000000_abcd",
+                },
+            )
+
+        client = LightRAGClient(
+            base_url="http://lightrag.test",
+            dedup_index=DedupIndex.for_workspace(str(tmp_path), "test"),
+        )
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        document_id = "doc-" + hashlib.md5(b"Some text").hexdigest()
+        assert lightrag_document_id(" Some text\n") == document_id
+
+        await client.insert_text(" Some text\n")
+        assert (await client.insert_text("Some text"))["document_id"] == document_id
+        await client.delete_document(document_id)
+        assert (await client.insert_text("Some text"))["status"] == "success"
+        assert calls.count(("POST", "/documents/text")) == 2
+
+    async def test_duplicate_upload_skipped(self, tmp_path):
+        """Test that a file uploaded twice is only sent once and can be deleted."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, request.url.path))
+            if request.method == "DELETE":
+                return httpx.Response(200, json={"status": "deletion_started"})
+            return httpx.Response(200, json={"status": "success", "track_id": "upload_1"})
+
+        client = LightRAGClient(
+            base_url="http://lightrag.test",
+            dedup_index=DedupIndex.for_workspace(str(tmp_path), "test"),
+        )
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        path = tmp_path / "notes.txt"
+        path.write_text("Some text\n", encoding="utf-8")
+
+        await client.upload_document(str(path))
+        duplicate = await client.upload_document(str(path))
+        assert duplicate["status"] == "duplicate"
+        assert duplicate["document_id"] == lightrag_document_id("Some text")
+        await client.delete_document(duplicate["document_id"])
+        assert (await client.upload_document(str(path)))["status"] == "success"
+        assert calls.count(("POST", "/documents/upload")) == 2
+        await client.close()
@@ -0,0 +1,89 @@
+"""Tests for the local entity-name index."""
+
+import random
+
+import httpx
+
+from lightrag_mcp_server import create_server
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.entity_index import EntityNameIndex, edit_distance
+
+NAMES = ["OpenAI", "Open Source", "openai", "Microsoft", "Micron", "Alan Turing"]
+
+
+class TestEntityNameIndex:
+    """Tests for EntityNameIndex."""
+
+    def test_exact_and_normalized(self):
+        """Test exact existence and case/whitespace-insensitive lookup."""
+        index = EntityNameIndex(NAMES)
+        assert index.exists("OpenAI")
+        assert not index.exists("OPENAI")
+        assert index.lookup("  OPENAI ") == ["OpenAI", "openai"]
+        assert index.lookup("alan   turing") == ["Alan Turing"]
+
+    def test_prefix(self):
+        """Test sorted prefix matches with a limit."""
+        index = EntityNameIndex(NAMES)
+        assert index.prefix("mic") == ["Micron", "Microsoft"]
+        assert index.prefix("open", limit=2) == ["Open Source", "OpenAI"]
+        assert index.prefix("zzz") == []
+
+    def test_fuzzy(self):
+        """Test typo-tolerant matches ordered by distance."""
+        index = EntityNameIndex(NAMES)
+        matches = index.fuzzy("Microsfot", max_distance=2)
+        assert matches == [{"name": "Microsoft", "distance": 2}]
+        assert index.fuzzy("Alan Turnig", max_distance=1) == []
+        assert index.fuzzy("Alan Turin", max_distance=1)[0]["name"] == "Alan Turing"
+
+    def test_fuzzy_short_names_share_no_trigram(self):
+        """Test that short names within the distance are found without a shared trigram."""
+        index = EntityNameIndex(["hiai", "ftq", "Zebra"])
+        assert index.fuzzy("ii", max_distance=2) == [{"name": "hiai", "distance": 2}]
+        assert index.fuzzy("t", max_distance=2) == [{"name": "ftq", "distance": 2}]
+
+    def test_fuzzy_matches_brute_force(self):
+        """Test that candidate filtering never drops a name within the distance."""
+        rng = random.Random(7)
+        names = ["".join(rng.choices("abcde", k=rng.randint(1, 8))) for _ in range(300)]
+        index = EntityNameIndex(names)
+        for _ in range(200):
+            query = "".join(rng.choices("abcde", k=rng.randint(1, 8)))
+            for distance in (1, 2):
+                expected = {n for n in names if edit_distance(query, n, distance) <= distance}
+                found = {m["name"] for m in index.fuzzy(query, distance, limit=len(names))}
+                assert found == expected, (query, distance)
+
+    def test_edit_distance_cap(self):
+        """Test that the bounded distance stops at the limit."""
+        assert edit_distance("kitten", "sitting", 5) == 3
+        assert edit_distance("kitten", "sitting", 2) == 3
+        assert edit_distance("a", "abcdef", 2) == 3
+
+
+class TestServerEntityTools:
+    """Tests for the batch and search tools."""
+
+    async def test_batch_check_uses_one_fetch(self):
+        """Test that a batch of names is answered from a single graph fetch."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"nodes": [{"id": n} for n in NAMES], "edges": []})
+
+        server = create_server()
+        client = LightRAGClient(base_url="http://lightrag.test")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        server.graph_cache.client = client
+
+        result = await server._check_entities_exist(
+            {"entity_names": ["OpenAI", "MICRON", "Microsfot"], "fuzzy": True}
+        )
+        assert result["found"] == 1
+        assert result["results"][1]["matches"] == ["Micron"]
+        assert result["results"][2]["suggestions"][0]["name"] == "Microsoft"
+        search = await server._search_entities({"query": "alan"})
+        assert search["matches"] == [{"name": "Alan Turing"}]
+        assert len(requests) == 1
@@ -0,0 +1,198 @@
+"""Tests for the local knowledge graph snapshot."""
+
+import httpx
+import pytest
+
+from lightrag_mcp_server import create_server
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.graph import GraphCache, GraphSnapshot
+
+PAYLOAD = {
+    "nodes": [
+        {"id": "Alice", "labels": ["PERSON"]},
+        {"id": "Bob", "labels": ["PERSON"]},
+        {"id": "Acme", "labels": ["ORG"]},
+        {"id": "Lonely"},
+    ],
+    "edges": [
+        {"source": "Alice", "target": "Acme", "type": "WORKS_AT"},
+        {"source": "Bob", "target": "Acme", "type": "WORKS_AT"},
+        {"source": "Alice", "target": "Bob"},
+    ],
+}
+
+
+def make_client(requests, etag=None, payload=PAYLOAD):
+    """Create a client whose /graph endpoint supports optional ETags."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if etag and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        headers = {"ETag": etag} if etag else {}
+        return httpx.Response(200, json=payload, headers=headers)
+
+    client = LightRAGClient(base_url="http://lightrag.test")
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestGraphSnapshot:
+    """Tests for GraphSnapshot."""
+
+    def test_round_trip(self):
+        """Test that the payload can be rebuilt from the compact form."""
+        snapshot = GraphSnapshot.from_payload(PAYLOAD)
+        assert snapshot.to_payload() == PAYLOAD
+        assert list(snapshot.src) == [0, 1, 0]
+        assert snapshot.names[snapshot.src[0]] is snapshot.names[0]
+
+    def test_top_level_fields_kept(self):
+        """Test that fields besides nodes and edges survive in their original order."""
+        payload = {"is_truncated": True, **PAYLOAD, "total": 4}
+        rebuilt = GraphSnapshot.from_payload(payload).to_payload()
+        assert rebuilt == payload and list(rebuilt) == list(payload)
+
+    def test_structure_and_limits(self):
+        """Test derived statistics and limited listings."""
+        snapshot = GraphSnapshot.from_payload(PAYLOAD)
+        assert snapshot.structure() == {
+            "node_count": 4,
+            "edge_count": 3,
+            "max_degree": 2,
+            "avg_degree": 1.5,
+            "isolated_nodes": 1,
+        }
+        assert snapshot.entities(limit=2)["entities"] == PAYLOAD["nodes"][:2]
+        assert snapshot.relations()["total"] == 3
+
+    def test_alternate_keys(self):
+        """Test payloads using LightRAG-style field names."""
+        snapshot = GraphSnapshot.from_payload(
+            {
+                "entities": [{"entity_name": "A"}],
+                "relationships": [{"src_id": "A", "tgt_id": "B", "weight": 1.0}],
+            }
+        )
+        assert snapshot.names == ["A", "B"]
+        assert snapshot.relations()["relations"] == [{"src_id": "A", "tgt_id": "B", "weight": 1.0}]
+
+
+class TestGraphIndex:
+    """Tests for the CSR adjacency index."""
+
+    def test_csr_layout(self):
+        """Test that each edge appears once in both endpoints' neighbor lists."""
+        index = GraphSnapshot.from_payload(PAYLOAD).adjacency()
+        assert list(index.offsets) == [0, 2, 4, 6, 6]
+        assert sorted(index.targets[0:2]) == [1, 2]
+        assert list(index.degree) == [2, 2, 2, 0]
+
+    def test_neighbors_and_subgraph(self):
+        """Test hop-limited neighborhoods and induced subgraphs."""
+        payload = {
+            "nodes": [{"id": n} for n in "ABCDE"],
+            "edges": [{"source": a, "target": b} for a, b in ["AB", "BC", "CD", "DE"]],
+        }
+        index = GraphSnapshot.from_payload(payload).adjacency()
+        result = index.neighbors("A", depth=2)
+        assert [(n["id"], n["distance"]) for n in result["neighbors"]] == [("B", 1), ("C", 2)]
+        assert index.neighbors("C", depth=5, limit=2)["truncated"] is True
+
+        sub = index.subgraph(["A", "E"], k=1)
+        assert {n["id"] for n in sub["nodes"]} == {"A", "B", "D", "E"}
+        assert sub["edges"] == [{"source": "A", "target": "B"}, {"source": "D", "target": "E"}]
+
+    def test_shortest_path_and_ranking(self):
+        """Test path reconstruction, unreachable pairs and degree ranking."""
+        index = GraphSnapshot.from_payload(PAYLOAD).adjacency()
+        path = index.shortest_path("Bob", "Acme")
+        assert path["path"] == ["Bob", "Acme"]
+        assert path["length"] == 1
+        assert index.shortest_path("Alice", "Lonely")["path"] == []
+        top = index.top_entities(limit=3)["entities"]
+        assert [e["degree"] for e in top] == [2, 2, 2]
+        with pytest.raises(ValueError, match="Unknown entity: Nobody"):
+            index.neighbors("Nobody")
+
+
+class TestGraphCache:
+    """Tests for GraphCache refresh behaviour."""
+
+    async def test_served_from_snapshot_within_staleness(self):
+        """Test that repeated reads do not refetch the graph."""
+        requests = []
+        cache = GraphCache(make_client(requests), max_staleness=60)
+        first = await cache.snapshot()
+        second = await cache.snapshot()
+        assert first is second
+        assert len(requests) == 1
+
+    async def test_revalidates_with_etag(self):
+        """Test that stale snapshots are revalidated with If-None-Match."""
+        requests = []
+        cache = GraphCache(make_client(requests, etag='"v1"'), max_staleness=0)
+        first = await cache.snapshot()
+        second = await cache.snapshot()
+        assert first is second
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert cache.stats()["not_modified"] == 1
+
+    async def test_local_write_forces_refresh(self):
+        """Test that a write through the client makes the snapshot stale."""
+        requests = []
+        client = make_client(requests)
+        cache = GraphCache(client, max_staleness=60)
+        await cache.snapshot()
+        await client.delete_entity("Lonely")
+        await cache.snapshot()
+        assert [r.url.path for r in requests] == ["/graph", "/graph/entity/Lonely", "/graph"]
+
+
+    async def test_refresh_keeps_top_level_fields(self):
+        """Test that a streamed refresh rebuilds the same payload as the server sent."""
+        payload = {**PAYLOAD, "is_truncated": True}
+        cache = GraphCache(make_client([], payload=payload), max_staleness=60)
+        rebuilt = (await cache.snapshot()).to_payload()
+        assert rebuilt == payload and list(rebuilt) == list(payload)
+
+    async def test_refresh_error_closes_stream(self, monkeypatch):
+        """Test that an error mid-refresh does not leave the stream and its slot open."""
+
+        def fail(snapshot, key, item):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(GraphSnapshot, "add_item", fail)
+        client = make_client([])
+        with pytest.raises(RuntimeError):
+            await GraphCache(client, max_staleness=60).snapshot()
+        assert client.scheduler.stats()["in_flight"] == 0
+        await client.close()
+
+
+class TestServerGraphTools:
+    """Tests for graph tools served from the snapshot."""
+
+    async def test_tools_use_snapshot(self, monkeypatch):
+        """Test that the graph read tools share one fetch when enabled."""
+        monkeypatch.setenv("LIGHTRAG_GRAPH_SNAPSHOT", "true")
+        requests = []
+        server = create_server()
+        server.graph_cache.client.client = make_client(requests).client
+        await server._get_knowledge_graph({})
+        structure = await server._get_graph_structure({})
+        entities = await server._get_entities({"limit": 1})
+        assert structure["node_count"] == 4
+        assert entities["entities"] == [{"id": "Alice", "labels": ["PERSON"]}]
+        assert len(requests) == 1
+
+    async def test_local_query_tools(self):
+        """Test that the local query tools are served from one snapshot."""
+        requests = []
+        server = create_server()
+        server.graph_cache.client.client = make_client(requests).client
+        content = await server._call_tool("find_shortest_path", {"source": "Bob", "target": "Acme"})
+        assert '"path":["Bob","Acme"]' in content[0].text
+        neighbors = await server._get_entity_neighbors({"entity": "Acme"})
+        assert {n["id"] for n in neighbors["neighbors"]} == {"Alice", "Bob"}
+        assert len(requests) == 1
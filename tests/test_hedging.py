@@ -0,0 +1,116 @@
+"""Tests for hedged query requests."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.hedging import Hedger
+
+
+class TestHedger:
+    """Tests for Hedger."""
+
+    async def test_slow_call_is_hedged_and_loser_cancelled(self):
+        """Test that a faster duplicate wins and the slow call is cancelled."""
+        delays = [1.0, 0.0]
+        cancelled = []
+
+        async def call():
+            delay = delays.pop(0)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(delay)
+                raise
+            return delay
+
+        hedger = Hedger(initial_delay=0.01)
+        assert await hedger.run(call) == 0.0
+        assert cancelled == [1.0]
+        assert hedger.stats()["hedge_wins"] == 1
+
+    async def test_fast_calls_are_not_hedged_and_threshold_adapts(self):
+        """Test the percentile threshold after enough samples."""
+
+        async def call():
+            return "ok"
+
+        hedger = Hedger(percentile=0.5, initial_delay=5.0, min_delay=0.2, min_samples=4)
+        assert hedger.delay() == 5.0
+        for _ in range(4):
+            await hedger.run(call)
+        assert hedger.hedged == 0
+        assert hedger.delay() == 0.2
+
+    async def test_budget_caps_hedges(self):
+        """Test that hedges stop once the token budget is spent."""
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return "slow"
+
+        hedger = Hedger(initial_delay=0.001, budget=0.0, max_tokens=2)
+        for _ in range(4):
+            await hedger.run(call)
+        assert hedger.hedged == 2
+        assert hedger.throttled == 2
+        assert calls == 6
+
+    async def test_error_falls_back_to_other_call(self):
+        """Test that a failing call does not hide a successful duplicate."""
+        outcomes = ["error", "ok"]
+
+        async def call():
+            outcome = outcomes.pop(0)
+            await asyncio.sleep(0.02 if outcome == "error" else 0.03)
+            if outcome == "error":
+                raise RuntimeError("boom")
+            return outcome
+
+        hedger = Hedger(initial_delay=0.01)
+        assert await hedger.run(call) == "ok"
+
+        async def always_fails():
+            raise RuntimeError("down")
+
+        with pytest.raises(RuntimeError):
+            await hedger.run(always_fails)
+
+
+class TestClientHedging:
+    """Tests for hedged queries in LightRAGClient."""
+
+    async def test_query_hedged_to_replica(self):
+        """Test that a slow node is beaten by the other one without counting as a failure."""
+        hosts = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            if len(hosts) == 1:
+                await asyncio.sleep(1.0)
+            return httpx.Response(200, json={"response": request.url.host})
+
+        client = LightRAGClient(
+            base_url="http://primary.test",
+            replica_urls=["http://replica.test"],
+            hedge_queries=True,
+            health_probe_interval=0,
+        )
+        client.hedger.initial_delay = 0.02
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = await client.query_text("q")
+        await client.close()
+
+        assert sorted(hosts) == ["primary.test", "replica.test"]
+        assert result == {"response": hosts[1]}
+        assert client.hedger.hedge_wins == 1
+        for backend in client.replicas.backends:
+            assert backend.outstanding == 0 and backend.errors == 0
+        snapshot = client.metrics.snapshot()
+        assert snapshot["endpoints"]["POST /query"]["statuses"] == {"cancelled": 1, "2xx": 1}
+        assert snapshot["components"]["hedging"]["hedge_rate"] == 1.0
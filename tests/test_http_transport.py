@@ -0,0 +1,193 @@
+"""Tests for the streamable HTTP transport and per-session isolation."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import httpx
+import uvicorn
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.server import create_server
+from lightrag_mcp_server.sessions import Session, SessionRegistry, request_identity
+
+
+@asynccontextmanager
+async def serving(server):
+    """Serve ``server`` over HTTP on a free local port, yielding the MCP URL."""
+    config = uvicorn.Config(server.http_app(), host="127.0.0.1", port=0, log_level="warning")
+    http = uvicorn.Server(config)
+    task = asyncio.ensure_future(http.serve())
+    while not http.started:
+        await asyncio.sleep(0.01)
+    port = http.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}{server.http_path}"
+    finally:
+        http.should_exit = True
+        await task
+
+
+async def call_tool_text(url, headers, name, arguments):
+    """Open an MCP session with ``headers``, call one tool and return its text."""
+    async with httpx.AsyncClient(headers=headers) as http:
+        async with streamable_http_client(url, http_client=http) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                result = await session.call_tool(name, arguments)
+    return result.content[0].text
+
+
+async def call_tool(url, headers, name, arguments):
+    """Open an MCP session with ``headers`` and call one tool, decoding its JSON result."""
+    return json.loads(await call_tool_text(url, headers, name, arguments))
+
+
+class TestRequestIdentity:
+    """Tests for request_identity."""
+
+    def test_headers(self):
+        """Test workspace and key extraction from bearer and X-API-Key headers."""
+        assert request_identity({}) == (None, None)
+        assert request_identity({"lightrag-workspace": "a", "authorization": "Bearer k"}) == (
+            "a",
+            "k",
+        )
+        assert request_identity({"x-api-key": "k2"}) == (None, "k2")
+
+
+class TestSessionViews:
+    """Tests for LightRAGClient.for_session."""
+
+    async def test_views_share_pool_but_not_cached_results(self):
+        """Test that cached queries are scoped to the workspace and key of each view."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(
+                (request.headers.get("LIGHTRAG-WORKSPACE"), request.headers.get("Authorization"))
+            )
+            return httpx.Response(200, json={"response": "ok"})
+
+        root = LightRAGClient(base_url="http://lightrag.test", api_key="root", workspace="main")
+        root.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        other_key = root.for_session(api_key="other")
+        other_workspace = root.for_session(workspace="side")
+        for client in (root, root, other_key, other_workspace, other_workspace):
+            await client.query_text("q")
+
+        assert other_key.client is root.client
+        assert seen == [
+            ("main", "Bearer root"),
+            ("main", "Bearer other"),
+            ("side", "Bearer root"),
+        ]
+        await other_key.insert_text("doc")
+        assert root._cache_generation == 1
+        await other_key.close()
+        assert not root.client.is_closed
+        await root.close()
+
+
+class FakeView:
+    """Stand-in client view that records being closed."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class TestSessionRegistry:
+    """Tests for SessionRegistry."""
+
+    async def test_eviction_waits_for_calls_in_flight(self):
+        """Test that an evicted session is only closed once its last call finishes."""
+        registry = SessionRegistry(lambda workspace, key: Session(FakeView(), None), max_size=1)
+        async with registry.use("a", None) as first:
+            async with registry.use("b", None) as second:
+                assert first.retired and not first.client.closed
+            assert not second.retired and not second.client.closed
+            assert registry.stats()["evicted"] == 1
+        assert first.client.closed
+
+        async with registry.use("c", None):
+            pass
+        assert second.client.closed
+        await registry.close()
+
+
+class TestHTTPTransport:
+    """Tests for serving MCP sessions over streamable HTTP."""
+
+    async def test_sessions_isolated_by_workspace_and_key(self):
+        """Test that concurrent sessions reach LightRAG with their own identity."""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(
+                (request.headers.get("LIGHTRAG-WORKSPACE"), request.headers.get("Authorization"))
+            )
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"response": request.headers["LIGHTRAG-WORKSPACE"]})
+
+        server = create_server(server_url="http://lightrag.test", workspace="main")
+        server.client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        identities = [{}, {"LIGHTRAG-WORKSPACE": "alpha", "Authorization": "Bearer k1"}]
+        identities.append({"LIGHTRAG-WORKSPACE": "beta", "X-API-Key": "k2"})
+        async with serving(server) as url:
+            results = await asyncio.gather(
+                *(call_tool(url, headers, "query_text", {"query": "q"}) for headers in identities)
+            )
+
+        assert [result["response"] for result in results] == ["main", "alpha", "beta"]
+        assert sorted(seen, key=str) == sorted(
+            [("main", None), ("alpha", "Bearer k1"), ("beta", "Bearer k2")], key=str
+        )
+        assert server.sessions.stats()["identities"] == 2
+        await server.sessions.close()
+        await server.client.close()
+
+    async def test_require_auth(self):
+        """Test that requests without their own key are rejected when required."""
+        server = create_server(server_url="http://lightrag.test")
+        server.http_require_auth = True
+        async with serving(server) as url:
+            async with httpx.AsyncClient() as http:
+                response = await http.post(url, json={})
+        assert response.status_code == 401
+        await server.client.close()
+
+    def test_auth_required_by_default_with_server_key(self, monkeypatch):
+        """Test that a configured server key turns on LIGHTRAG_HTTP_REQUIRE_AUTH by default."""
+        monkeypatch.delenv("LIGHTRAG_API_KEY", raising=False)
+        monkeypatch.delenv("LIGHTRAG_HTTP_REQUIRE_AUTH", raising=False)
+        assert not create_server(server_url="http://lightrag.test").http_require_auth
+        assert create_server(server_url="http://lightrag.test", api_key="srv").http_require_auth
+        monkeypatch.setenv("LIGHTRAG_HTTP_REQUIRE_AUTH", "false")
+        assert not create_server(server_url="http://lightrag.test", api_key="srv").http_require_auth
+
+    async def test_other_workspace_needs_own_key(self):
+        """Test that a session naming another workspace cannot borrow the server's key."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("Authorization"))
+            return httpx.Response(200, json={"response": "ok"})
+
+        server = create_server(server_url="http://lightrag.test", api_key="srv", workspace="main")
+        server.http_require_auth = False
+        server.client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with serving(server) as url:
+            denied = await call_tool_text(
+                url, {"LIGHTRAG-WORKSPACE": "other"}, "query_text", {"query": "q"}
+            )
+            own_key = {"LIGHTRAG-WORKSPACE": "other", "X-API-Key": "own"}
+            allowed = await call_tool(url, own_key, "query_text", {"query": "q"})
+        assert "API key is required" in denied
+        assert allowed == {"response": "ok"} and seen == ["Bearer own"]
+        await server.sessions.close()
+        await server.client.close()
@@ -0,0 +1,108 @@
+"""Tests for incremental JSON decoding."""
+
+import json
+
+import httpx
+import pytest
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.jsonstream import ItemSink, JsonItemDecoder, iter_json_items
+
+DOCUMENT = {
+    "nodes": [{"id": "Zoë", "weight": 1.5}, {"id": "Ann", "tags": ["a", "]", "\"x\""]}],
+    "meta": {"version": 2, "note": "ok"},
+    "edges": [],
+    "count": 12345,
+}
+
+
+def decode_in_chunks(data: bytes, size: int, keys=("nodes", "edges")):
+    """Feed ``data`` in ``size``-byte chunks and collect the emitted items."""
+    decoder = JsonItemDecoder(keys)
+    items = []
+    for start in range(0, len(data), size):
+        items.extend(decoder.feed(data[start : start + size]))
+    items.extend(decoder.close())
+    return decoder, items
+
+
+class TestJsonItemDecoder:
+    """Tests for JsonItemDecoder."""
+
+    @pytest.mark.parametrize("size", [1, 2, 7, 4096])
+    def test_any_chunking_gives_the_same_items(self, size):
+        """Test that items and fields survive arbitrary chunk and UTF-8 boundaries."""
+        decoder, items = decode_in_chunks(json.dumps(DOCUMENT, ensure_ascii=False).encode(), size)
+        assert items == [("nodes", node) for node in DOCUMENT["nodes"]]
+        assert decoder.fields == {"meta": DOCUMENT["meta"], "count": 12345}
+        assert decoder.order == ["nodes", "meta", "edges", "count"]
+
+    def test_items_arrive_before_the_document_ends(self):
+        """Test that a completed item is emitted while later input is still missing."""
+        decoder = JsonItemDecoder(["documents"])
+        assert decoder.feed(b'{"documents": [{"id": 1}, {"id"') == [("documents", {"id": 1})]
+        assert decoder.feed(b": 2}]}") == [("documents", {"id": 2})]
+        assert decoder.close() == []
+
+    def test_top_level_array_and_unstreamed_arrays(self):
+        """Test bare arrays and arrays outside ``keys`` kept as fields."""
+        _, items = decode_in_chunks(b"[1, 22, 333]", 1)
+        assert items == [("", 1), ("", 22), ("", 333)]
+        decoder, items = decode_in_chunks(b'{"other": [1, 2], "nodes": []}', 3)
+        assert items == [] and decoder.fields == {"other": [1, 2]}
+
+    def test_numbers_split_at_every_boundary(self):
+        """Test that floats and exponents cut by a chunk boundary are not decoded early."""
+        data = b'{"data": [123456789,-0.5, 1e10, 2.5E-3 ,-7e+2], "total": -1.25e1}'
+        for split in range(1, len(data)):
+            decoder = JsonItemDecoder(["data"])
+            items = decoder.feed(data[:split]) + decoder.feed(data[split:]) + decoder.close()
+            assert items == [("data", n) for n in [123456789, -0.5, 1e10, 2.5e-3, -7e2]], split
+            assert decoder.fields == {"total": -12.5}
+
+    @pytest.mark.parametrize("data", [b'{"nodes": [1, 2',b'"text"', b'{"a": 1} x', b'{"a" 1}'])
+    def test_invalid_documents(self, data):
+        """Test that truncated or malformed input is rejected."""
+        with pytest.raises(ValueError):
+            decode_in_chunks(data, 4)
+
+
+class TestItemSink:
+    """Tests for ItemSink and streamed client reads."""
+
+    async def test_sink_bounds_items_and_bytes(self):
+        """Test that items past the limits are counted but not kept."""
+
+        async def chunks():
+            yield b'{"entities": [' + b",".join(b'{"n": %d}' % i for i in range(50))
+            yield b'], "total": 50}'
+
+        decoder = JsonItemDecoder(["entities"])
+        sink = ItemSink(max_items=10)
+        async for key, item in iter_json_items(chunks(), decoder):
+            sink.add(key, item)
+        result = sink.result(decoder)
+        assert result["entities"] == [{"n": i} for i in range(10)]
+        assert result["total"] == 50
+        assert result["_truncated"] == {"kept": {"entities": 10}, "total": {"entities": 50}}
+
+        sink = ItemSink(max_bytes=30)
+        for i in range(5):
+            sink.add("", {"n": i})
+        assert len(sink.items[""]) == 3 and sink.totals[""] == 5
+
+    async def test_client_stream_decode(self):
+        """Test that list tools decode streamed bodies and apply their limit locally."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = {"relations": [{"id": i} for i in range(100)], "source": "test"}
+            return httpx.Response(200, json=body)
+
+        client = LightRAGClient(base_url="http://lightrag.test", stream_decode=True)
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        limited = await client.get_relations(limit=5)
+        full = await client.get_knowledge_graph()
+        await client.close()
+        assert limited["relations"] == [{"id": i} for i in range(5)]
+        assert limited["_truncated"]["total"] == {"relations": 100}
+        assert full == {"relations": [{"id": i} for i in range(100)], "source": "test"}
@@ -0,0 +1,96 @@
+"""Tests for metrics collection and export."""
+
+import httpx
+
+from lightrag_mcp_server import create_server
+from lightrag_mcp_server.metrics import Histogram, Metrics, MetricsServer, endpoint_label
+
+
+class TestMetrics:
+    """Tests for Metrics."""
+
+    def test_endpoint_labels_are_templated(self):
+        """Test that IDs in endpoints do not create new label values."""
+        assert endpoint_label("/graph/entity/OpenAI") == "/graph/entity/{id}"
+        assert endpoint_label("/graph/entity/exists") == "/graph/entity/exists"
+        assert endpoint_label("/documents/doc-1/status") == "/documents/{id}/status"
+        assert endpoint_label("/documents/texts") == "/documents/texts"
+
+    def test_histogram_quantiles(self):
+        """Test bucket counts and interpolated percentiles."""
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.05, 0.5, 5.0):
+            histogram.observe(value)
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(1.0) == 1.0
+
+    def test_render_formats(self):
+        """Test OpenMetrics and Prometheus text exposition."""
+        metrics = Metrics(buckets=(0.1,))
+        metrics.request_started("/query")
+        metrics.request_finished("POST", "/query", 503, 0.05, sent=10, received=20)
+        metrics.register("cache", lambda: {"hits": 3, "state": "closed"})
+
+        text = metrics.render()
+        assert "# TYPE lightrag_mcp_requests counter" in text
+        assert (
+            'lightrag_mcp_requests_total{endpoint="/query",method="POST",status="5xx"} 1'
+            in text
+        )
+        assert (
+            'lightrag_mcp_request_duration_seconds_bucket{endpoint="/query",method="POST",'
+            'le="0.1"} 1' in text
+        )
+        assert "lightrag_mcp_cache_hits 3.0" in text
+        assert "state" not in text
+        assert text.endswith("# EOF\n")
+
+        prometheus = metrics.render(openmetrics=False)
+        assert "# TYPE lightrag_mcp_requests_total counter" in prometheus
+        assert "# EOF" not in prometheus
+
+
+class TestInstrumentation:
+    """Tests for client and server instrumentation."""
+
+    async def test_requests_and_tools_are_recorded(self):
+        """Test that tool calls and each request attempt are counted."""
+        responses = iter([httpx.Response(503), httpx.Response(200, json={"status": "ok"})])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return next(responses)
+
+        server = create_server()
+        server.client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        server.client.resilience.backoff = 0
+
+        await server._call_tool("get_health", {})
+        await server._call_tool("query_text", {})
+        snapshot = await server._get_mcp_metrics({})
+
+        assert snapshot["tools"]["get_health"]["outcomes"] == {"ok": 1}
+        assert snapshot["tools"]["get_health"]["in_flight"] == 0
+        assert snapshot["tools"]["query_text"]["outcomes"] == {"invalid": 1}
+        assert snapshot["endpoints"]["GET /health"]["statuses"] == {"5xx": 1, "2xx": 1}
+        assert "query_cache" in snapshot["components"]
+
+    async def test_metrics_endpoint(self):
+        """Test that /metrics is served over HTTP."""
+        metrics = Metrics()
+        metrics.tool_started("get_health")
+        metrics.tool_finished("get_health", "ok", 0.01)
+        exporter = MetricsServer(metrics, port=0)
+        await exporter.start()
+        try:
+            async with httpx.AsyncClient() as http:
+                url = f"http://127.0.0.1:{exporter.port}"
+                response = await http.get(
+                    f"{url}/metrics", headers={"Accept": "application/openmetrics-text"}
+                )
+                missing = await http.get(f"{url}/other")
+        finally:
+            await exporter.close()
+        assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+        assert 'lightrag_mcp_tool_calls_total{outcome="ok",tool="get_health"} 1' in response.text
+        assert missing.status_code == 404
@@ -0,0 +1,154 @@
+"""Tests for multi-mode query fan-out."""
+
+import asyncio
+import json
+import time
+
+import httpx
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.multiquery import gather_quorum, merge_results
+
+
+def sleeper(delay, result="ok", error=None):
+    """Build a call that sleeps, then returns ``result`` or raises ``error``."""
+
+    async def call():
+        await asyncio.sleep(delay)
+        if error:
+            raise RuntimeError(error)
+        return result
+
+    return call
+
+
+class TestGatherQuorum:
+    """Tests for gather_quorum."""
+
+    async def test_quorum_cancels_stragglers(self):
+        """Test returning once enough calls succeeded, ignoring failures."""
+        calls = [sleeper(0.0, error="boom"), sleeper(0.01, "a"), sleeper(0.02, "b"), sleeper(5)]
+        started = time.monotonic()
+        outcomes = await gather_quorum(calls, quorum=2)
+        assert time.monotonic() - started < 1
+        assert [o["status"] for o in outcomes] == ["error", "success", "success", "cancelled"]
+        assert outcomes[0]["error"] == "boom"
+
+    async def test_deadline(self):
+        """Test that the deadline returns whatever has finished."""
+        outcomes = await gather_quorum([sleeper(0.0, "fast"), sleeper(5)], deadline=0.05)
+        assert [o["status"] for o in outcomes] == ["success", "cancelled"]
+        assert outcomes[0]["response"] == "fast"
+
+
+class TestMergeResults:
+    """Tests for merge_results."""
+
+    def test_passages_and_citations_deduplicated(self):
+        """Test that repeated passages and citations are kept once with their sources."""
+        merged = merge_results(
+            [
+                {"response": "Alpha is a model.\n\nIt was trained in 2020.", "references": [
+                    {"file_path": "a.txt"}
+                ]},
+                None,
+                {"response": "alpha is  a model.\n\nBeta uses it.", "references": [
+                    {"file_path": "a.txt"}, {"file_path": "b.txt"}
+                ]},
+            ]
+        )
+        assert merged["contexts"] == [
+            {"text": "Alpha is a model.", "sources": [0, 2]},
+            {"text": "It was trained in 2020.", "sources": [0]},
+            {"text": "Beta uses it.", "sources": [2]},
+        ]
+        assert merged["citations"] == [{"file_path": "a.txt"}, {"file_path": "b.txt"}]
+
+    def test_line_mode(self):
+        """Test line-level deduplication of context tables."""
+        merged = merge_results(["id,entity\n1,Alpha", "id,entity\n2,Beta"], by_line=True)
+        assert [c["text"] for c in merged["contexts"]] == ["id,entity", "1,Alpha", "2,Beta"]
+
+
+class TestClientQueryMulti:
+    """Tests for LightRAGClient.query_multi."""
+
+    async def test_modes_run_concurrently(self):
+        """Test that wall time tracks the slowest mode and results are merged."""
+        delays = {"naive": 0.1, "local": 0.1, "global": 0.1}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            mode = json.loads(request.content)["mode"]
+            await asyncio.sleep(delays[mode])
+            return httpx.Response(200, json={"response": f"Shared fact.\n\nOnly {mode}."})
+
+        client = LightRAGClient(base_url="http://lightrag.test")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        started = time.monotonic()
+        result = await client.query_multi("q")
+        elapsed = time.monotonic() - started
+        await client.close()
+
+        assert elapsed < 0.25
+        assert result["status"] == "success" and result["succeeded"] == 3
+        assert [r["mode"] for r in result["results"]] == ["naive", "local", "global"]
+        assert result["results"][1]["response"] == {"response": "Shared fact.\n\nOnly local."}
+        assert result["contexts"][0] == {"text": "Shared fact.", "sources": [0, 1, 2]}
+        assert len(result["contexts"]) == 4
+
+    async def test_deadline_reports_partial_success(self):
+        """Test that a slow phrasing is cancelled at the deadline."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["query"] == "slow":
+                await asyncio.sleep(5)
+            return httpx.Response(200, json={"response": "answer"})
+
+        client = LightRAGClient(base_url="http://lightrag.test")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = await client.query_multi("q", modes=["mix"], queries=["slow"], deadline=0.1)
+        await client.close()
+
+        assert result["status"] == "partial_success"
+        assert [(r["query"], r["status"]) for r in result["results"]] == [
+            ("q", "success"),
+            ("slow", "cancelled"),
+        ]
+        assert result["contexts"] == [{"text": "answer", "sources": [0]}]
+        assert "response" not in result["results"][1]
+
+    async def test_responses_can_be_left_out(self):
+        """Test that include_responses=False returns only the merged passages."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"response": "answer"})
+
+        client = LightRAGClient(base_url="http://lightrag.test")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = await client.query_multi("q", modes=["mix"], include_responses=False)
+        await client.close()
+        assert "response" not in result["results"][0]
+        assert result["contexts"] == [{"text": "answer", "sources": [0]}]
+
+    async def test_quorum_cancels_upstream_calls(self):
+        """Test that stragglers past the quorum are really cancelled upstream."""
+        finished, cancelled = [], []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            mode = json.loads(request.content)["mode"]
+            try:
+                await asyncio.sleep(0 if mode == "naive" else 5)
+            except asyncio.CancelledError:
+                cancelled.append(mode)
+                raise
+            finished.append(mode)
+            return httpx.Response(200, json={"response": mode})
+
+        client = LightRAGClient(base_url="http://lightrag.test")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = await client.query_multi("q", quorum=1)
+
+        assert result["status"] == "success" and result["cancelled"] == 2
+        assert finished == ["naive"] and sorted(cancelled) == ["global", "local"]
+        assert client.scheduler.stats()["in_flight"] == 0
+        await client.close()
@@ -0,0 +1,75 @@
+"""Tests for paginated document iteration."""
+
+import httpx
+import pytest
+
+from lightrag_mcp_server.client import LightRAGClient
+
+TOTAL = 25
+
+
+def make_client(requested):
+    """Create a client whose backend serves TOTAL documents page by page."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        page_size = int(request.url.params["page_size"])
+        requested.append(page)
+        start = (page - 1) * page_size
+        documents = [{"id": f"doc_{i}"} for i in range(start, min(start + page_size, TOTAL))]
+        total_pages = -(-TOTAL // page_size)
+        return httpx.Response(
+            200,
+            json={
+                "documents": documents,
+                "pagination": {"page": page, "total_pages": total_pages},
+            },
+        )
+
+    client = LightRAGClient(base_url="http://lightrag.test")
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestIterDocuments:
+    """Tests for LightRAGClient.iter_documents and list_documents."""
+
+    async def test_iterates_every_page(self):
+        """Test that iteration walks all pages exactly once."""
+        requested = []
+        client = make_client(requested)
+        ids = [doc["id"] async for doc in client.iter_documents(page_size=10)]
+        assert ids == [f"doc_{i}" for i in range(TOTAL)]
+        assert requested == [1, 2, 3]
+
+    async def test_cursor_walk(self):
+        """Test that following next_cursor returns each document once."""
+        requested = []
+        client = make_client(requested)
+        seen = []
+        cursor = None
+        while True:
+            result = await client.list_documents(limit=7, cursor=cursor, page_size=10)
+            seen.extend(doc["id"] for doc in result["documents"])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [f"doc_{i}" for i in range(TOTAL)]
+
+    async def test_limit_bounds_fetched_pages(self):
+        """Test that a small limit does not walk the whole corpus."""
+        requested = []
+        client = make_client(requested)
+        result = await client.list_documents(limit=5, page_size=10)
+        assert result["count"] == 5
+        assert result["next_cursor"] == "5"
+        assert max(requested) <= 2
+
+    async def test_invalid_cursor_rejected(self):
+        """Test that a tampered cursor gets a clear error and sends no request."""
+        requested = []
+        client = make_client(requested)
+        for cursor in ("abc", "-5", "1.5", "²"):
+            with pytest.raises(Exception, match="Invalid cursor"):
+                await client.list_documents(cursor=cursor)
+        assert requested == []
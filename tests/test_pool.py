@@ -0,0 +1,44 @@
+"""Tests for HTTP connection pool configuration."""
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.pool import PoolMonitor, build_timeout
+
+
+class TestPoolConfig:
+    """Tests for pool and timeout settings."""
+
+    def test_per_phase_timeouts(self):
+        """Test that unset phases fall back to the overall timeout."""
+        timeout = build_timeout(60.0, connect=5.0, pool=2.0)
+        assert timeout.connect == 5.0
+        assert timeout.read == 60.0
+        assert timeout.write == 60.0
+        assert timeout.pool == 2.0
+
+    def test_client_pool_settings(self):
+        """Test that the client exposes pool stats for its transport."""
+        client = LightRAGClient(
+            base_url="http://localhost:9621",
+            max_connections=8,
+            max_keepalive_connections=4,
+            connect_timeout=3.0,
+        )
+        assert client.client.timeout.connect == 3.0
+        stats = client.pool_stats()
+        assert stats["active_connections"] == 0
+        assert stats["idle_connections"] == 0
+        assert stats["acquisitions"] == 0
+
+
+class TestPoolMonitor:
+    """Tests for PoolMonitor."""
+
+    async def test_tracer_records_acquisition_once(self):
+        """Test that only the first connection event counts as acquisition."""
+        monitor = PoolMonitor()
+        trace = monitor.tracer()
+        await trace("connection.connect_tcp.started", {})
+        await trace("http11.send_request_headers.started", {})
+        assert monitor.acquisitions == 1
+        assert monitor.new_connections == 1
+        assert monitor.max_wait >= 0.0
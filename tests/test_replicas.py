@@ -0,0 +1,94 @@
+"""Tests for replica routing and health-aware balancing."""
+
+import httpx
+import pytest
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.replicas import ReplicaPool
+
+PRIMARY = "http://primary.test"
+REPLICAS = ["http://replica-1.test", "http://replica-2.test"]
+
+
+class TestReplicaPool:
+    """Tests for ReplicaPool."""
+
+    def test_least_outstanding_and_writes(self):
+        """Test that reads avoid busy nodes and writes always go to the primary."""
+        pool = ReplicaPool(PRIMARY, REPLICAS)
+        pool.started(pool.primary)
+        pool.started(pool.replicas[0])
+        assert pool.pick().url == REPLICAS[1]
+        assert pool.pick(write=True) is pool.primary
+        with pytest.raises(ValueError):
+            ReplicaPool(PRIMARY, REPLICAS, strategy="random")
+
+    def test_ewma_prefers_fast_nodes(self):
+        """Test latency-weighted selection and that failures do not look fast."""
+        pool = ReplicaPool(PRIMARY, REPLICAS, strategy="ewma", reads_on_primary=False)
+        for backend, elapsed in zip(pool.replicas, [0.5, 0.1]):
+            pool.started(backend)
+            pool.finished(backend, elapsed, ok=True)
+        assert pool.pick().url == REPLICAS[1]
+        pool.started(pool.replicas[1])
+        pool.finished(pool.replicas[1], 0.0001, ok=False)
+        assert pool.replicas[1].ewma == pytest.approx(0.1)
+
+    async def test_ejection_and_probe_recovery(self):
+        """Test ejection after consecutive failures and recovery by a health probe."""
+        pool = ReplicaPool(PRIMARY, REPLICAS[:1], eject_after=2)
+        replica = pool.replicas[0]
+        for _ in range(2):
+            pool.started(replica)
+            pool.finished(replica, 0.01, ok=False)
+        assert not replica.healthy
+        assert {pool.pick().url for _ in range(20)} == {PRIMARY}
+
+        async def only_replica_up(url: str) -> bool:
+            return url == REPLICAS[0]
+
+        await pool.probe(only_replica_up)
+        assert replica.healthy and not pool.primary.healthy
+        assert {pool.pick().url for _ in range(20)} == {REPLICAS[0]}
+        assert pool.stats()["backends"][PRIMARY]["ejections"] == 1
+
+
+class TestClientRouting:
+    """Tests for replica routing in LightRAGClient."""
+
+    async def test_reads_balanced_writes_to_primary_failover(self):
+        """Test read spreading, write pinning and retry onto a healthy node."""
+        hosts = []
+        down = {"replica-1.test"}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append((request.method, request.url.host))
+            if request.url.host in down:
+                return httpx.Response(503, json={"detail": "down"})
+            return httpx.Response(200, json={"status": "ok", "response": "answer"})
+
+        client = LightRAGClient(
+            base_url=PRIMARY,
+            replica_urls=REPLICAS,
+            cache_size=0,
+            retry_backoff=0,
+            eject_after=1,
+            health_probe_interval=0,
+        )
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        for i in range(6):
+            result = await client.query_text(f"q{i}")
+            assert result["response"] == "answer"
+        await client.insert_text("doc")
+
+        reads = [host for method, host in hosts if method == "POST" and host != "primary.test"]
+        assert "replica-2.test" in reads
+        assert hosts[-1] == ("POST", "primary.test")
+        assert not client.replicas.replicas[0].healthy
+        assert [host for _, host in hosts].count("replica-1.test") == 1
+
+        down.clear()
+        await client.replicas.probe(client._check_health)
+        assert client.replicas.replicas[0].healthy
+        assert client.metrics.snapshot()["components"]["replicas"]["healthy"] == 3
+        await client.close()
@@ -0,0 +1,130 @@
+"""Tests for retries and circuit breaking."""
+
+import httpx
+import pytest
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    endpoint_group,
+    parse_retry_after,
+)
+
+
+def make_client(statuses, calls, **kwargs):
+    """Create a client whose backend answers with the given status codes in turn."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        status = statuses.pop(0) if statuses else 200
+        return httpx.Response(status, json={"status": status})
+
+    kwargs.setdefault("retry_backoff", 0.0)
+    client = LightRAGClient(base_url="http://lightrag.test", **kwargs)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestResilienceHelpers:
+    """Tests for resilience building blocks."""
+
+    def test_endpoint_groups(self):
+        """Test endpoint to breaker group mapping."""
+        assert endpoint_group("/documents/text") == "documents"
+        assert endpoint_group("/query") == "query"
+        assert endpoint_group("/graph/entities") == "graph"
+        assert endpoint_group("/health") == "system"
+
+    def test_retry_after_seconds(self):
+        """Test Retry-After parsing."""
+        response = httpx.Response(503, headers={"Retry-After": "2"})
+        assert parse_retry_after(response) == 2.0
+        assert parse_retry_after(httpx.Response(503)) is None
+
+    def test_breaker_opens_and_probes(self, monkeypatch):
+        """Test closed -> open -> half-open -> closed transitions."""
+        now = [0.0]
+        monkeypatch.setattr("lightrag_mcp_server.resilience.time.monotonic", lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        now[0] = 11
+        breaker.before_request()
+        assert breaker.state == "half_open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_probe_without_outcome_is_released(self, monkeypatch):
+        """Test that a cancelled probe lets the next request probe right away."""
+        now = [0.0]
+        monkeypatch.setattr("lightrag_mcp_server.resilience.time.monotonic", lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        assert breaker.before_request() is False
+        breaker.record_failure()
+        now[0] = 11
+        assert breaker.before_request() is True
+        breaker.release_probe()
+        assert breaker.before_request() is True
+
+
+class TestClientRetries:
+    """Tests for retries in LightRAGClient."""
+
+    async def test_idempotent_read_is_retried(self):
+        """Test that a GET survives transient 503s."""
+        calls = []
+        client = make_client([503, 502], calls)
+        assert await client.get_health() == {"status": 200}
+        assert len(calls) == 3
+        assert client.resilience.stats()["retries"] == 2
+
+    async def test_insert_is_not_retried_on_5xx(self):
+        """Test that non-idempotent writes are not replayed after a response."""
+        calls = []
+        client = make_client([503], calls)
+        with pytest.raises(Exception, match="LightRAG API request failed"):
+            await client.insert_text("text")
+        assert len(calls) == 1
+
+    async def test_breaker_fails_fast(self):
+        """Test that an open circuit rejects requests without sending them."""
+        calls = []
+        client = make_client([500, 500], calls, breaker_threshold=2, max_retries=0)
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await client.get_knowledge_graph()
+        with pytest.raises(Exception, match="circuit open"):
+            await client.get_entities()
+        assert len(calls) == 2
+        # Other endpoint groups are unaffected
+        assert await client.get_health() == {"status": 200}
+        assert client.resilience.stats()["breakers"]["graph"]["state"] == "open"
+
+    async def test_probe_released_on_local_error(self, monkeypatch):
+        """Test that a probe failing outside httpx does not block the circuit."""
+        now = [0.0]
+        monkeypatch.setattr("lightrag_mcp_server.resilience.time.monotonic", lambda: now[0])
+        outcomes = [500, RuntimeError("local failure"), 200]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return httpx.Response(outcome, json={"status": outcome})
+
+        client = LightRAGClient(base_url="http://lightrag.test", breaker_threshold=1, max_retries=0)
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with pytest.raises(Exception, match="LightRAG API request failed"):
+            await client.get_health()
+        now[0] = 60
+        with pytest.raises(RuntimeError):
+            await client.get_health()
+        assert await client.get_health() == {"status": 200}
+        assert client.resilience.stats()["breakers"]["system"]["state"] == "closed"
+        await client.close()
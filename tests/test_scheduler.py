@@ -0,0 +1,146 @@
+"""Tests for request scheduling."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.scheduler import RequestScheduler, parse_lane_limits, request_lane
+
+
+async def hold(scheduler, lane, workspace, order, name, release):
+    """Take a slot, log the grant order and keep the slot until ``release`` is set."""
+    async with scheduler.slot(lane, workspace):
+        order.append(name)
+        await release.wait()
+
+
+class TestRequestScheduler:
+    """Tests for RequestScheduler."""
+
+    def test_lanes_and_limits(self):
+        """Test request classification and limit parsing."""
+        assert request_lane("POST", "/query") == "query"
+        assert request_lane("GET", "/graph/entity/exists") == "read"
+        assert request_lane("GET", "/graph") == "bulk"
+        assert request_lane("POST", "/documents/upload") == "bulk"
+        assert request_lane("DELETE", "/graph/entity/x") == "write"
+        assert parse_lane_limits("bulk=4, query=16") == {"bulk": 4, "query": 16}
+        with pytest.raises(ValueError):
+            parse_lane_limits("ingest=4")
+
+    async def test_priority_and_lane_cap(self):
+        """Test that queued queries overtake bulk work and bulk stays under its cap."""
+        scheduler = RequestScheduler(max_in_flight=1, lane_limits={"bulk": 1}, aging=0)
+        order, release = [], asyncio.Event()
+        tasks = [asyncio.create_task(hold(scheduler, "bulk", "", order, "bulk0", release))]
+        await asyncio.sleep(0)
+        for name, lane in [("bulk1", "bulk"), ("read", "read"), ("query", "query")]:
+            tasks.append(asyncio.create_task(hold(scheduler, lane, "", order, name, release)))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"] == 3
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == ["bulk0", "query", "read", "bulk1"]
+        assert scheduler.in_flight == 0
+        assert scheduler.stats()["lanes"]["bulk"]["max_queued"] == 1
+
+    async def test_workspaces_take_turns(self):
+        """Test round-robin between workspaces within a lane."""
+        scheduler = RequestScheduler(max_in_flight=1)
+        order, gate = [], asyncio.Event()
+        first = asyncio.create_task(hold(scheduler, "bulk", "a", order, "a0", gate))
+        await asyncio.sleep(0)
+        names = [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1"), ("b", "b2")]
+        tasks = [
+            asyncio.create_task(hold(scheduler, "bulk", ws, order, name, gate))
+            for ws, name in names
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, *tasks)
+        assert order == ["a0", "a1", "b1", "a2", "b2", "a3"]
+
+    async def test_aging_promotes_starved_lane(self):
+        """Test that a long-waiting bulk request is served ahead of newer queries."""
+        scheduler = RequestScheduler(max_in_flight=1, aging=0.01)
+        order, gate = [], asyncio.Event()
+        first = asyncio.create_task(hold(scheduler, "query", "", order, "q0", gate))
+        await asyncio.sleep(0)
+        bulk = asyncio.create_task(hold(scheduler, "bulk", "", order, "bulk", gate))
+        await asyncio.sleep(0.02)
+        query = asyncio.create_task(hold(scheduler, "query", "", order, "q1", gate))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, bulk, query)
+        assert order == ["q0", "bulk", "q1"]
+        assert scheduler.promoted == 1
+
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Test that cancelling queued or just-granted waiters leaks no slots."""
+        scheduler = RequestScheduler(max_in_flight=1)
+        wait = await scheduler.acquire("read")
+        assert wait >= 0
+        queued = asyncio.create_task(scheduler.acquire("read"))
+        await asyncio.sleep(0)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert scheduler.stats()["queued"] == 0
+
+        granted = asyncio.create_task(scheduler.acquire("read"))
+        await asyncio.sleep(0)
+        scheduler.release("read")
+        granted.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await granted
+        assert scheduler.in_flight == 0
+
+    async def test_cancel_while_queued_then_release(self):
+        """Test a release that runs before a cancelled waiter's task resumes."""
+        scheduler = RequestScheduler(max_in_flight=1)
+        await scheduler.acquire("read")
+        cancelled = asyncio.create_task(scheduler.acquire("read"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        scheduler.release("read")
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert scheduler.in_flight == 0
+        assert scheduler.stats()["queued"] == 0
+        assert await scheduler.acquire("read") >= 0
+        assert scheduler.in_flight == 1
+
+
+class TestClientScheduling:
+    """Tests for scheduling inside LightRAGClient."""
+
+    async def test_queries_skip_queued_ingestion(self):
+        """Test that a query is sent before inserts queued behind the bulk cap."""
+        sent = []
+        blocked = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request.url.path)
+            if len(sent) == 1:
+                await blocked.wait()
+            return httpx.Response(200, json={"status": "success", "response": "ok"})
+
+        client = LightRAGClient(base_url="http://lightrag.test", max_in_flight=1)
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        inserts = [asyncio.create_task(client.insert_text(f"doc {i}")) for i in range(3)]
+        await asyncio.sleep(0.01)
+        query = asyncio.create_task(client.query_text("q"))
+        await asyncio.sleep(0.01)
+        blocked.set()
+        await asyncio.gather(query, *inserts)
+        await client.close()
+
+        assert sent[:2] == ["/documents/text", "/query"]
+        components = client.metrics.snapshot()["components"]["scheduler"]
+        assert components["lanes"]["bulk"]["granted"] == 3
+        assert components["lanes"]["bulk"]["max_queued"] == 2
+        assert 'lightrag_mcp_scheduler_wait_seconds_count{lane="query"} 1' in (
+            client.metrics.render()
+        )
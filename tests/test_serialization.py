@@ -0,0 +1,71 @@
+"""Tests for tool result serialization."""
+
+import json
+
+import pytest
+
+from lightrag_mcp_server import create_server
+from lightrag_mcp_server.serialization import ResultFormatter, dumps
+
+GRAPH = {
+    "nodes": [{"id": f"entity_{i}", "type": "PERSON"} for i in range(200)],
+    "edges": [{"source": f"entity_{i}", "target": f"entity_{i + 1}"} for i in range(199)],
+}
+
+
+class TestResultFormatter:
+    """Tests for ResultFormatter."""
+
+    def test_compact_json(self):
+        """Test that results are emitted as parseable compact JSON."""
+        content = ResultFormatter().format("get_status", {"status": "ok", "count": 3})
+        assert content[0].text == '{"status":"ok","count":3}'
+        assert dumps({1: "a"}) == '{"1":"a"}'
+
+    def test_text_results_pass_through(self):
+        """Test that string results are not JSON-quoted."""
+        content = ResultFormatter().format("query_text_stream", "An answer")
+        assert content[0].text == "An answer"
+
+    def test_truncate_keeps_valid_json(self):
+        """Test that over-budget results are shrunk to valid JSON."""
+        content = ResultFormatter(max_bytes=2000).format("get_knowledge_graph", GRAPH)
+        assert len(content[0].text.encode()) <= 2000
+        data = json.loads(content[0].text)
+        assert 0 < len(data["nodes"]) < 200
+        assert data["_truncated"]["original_bytes"] > 2000
+
+    def test_resource_overflow(self):
+        """Test that the full payload can be attached as an embedded resource."""
+        content = ResultFormatter(max_bytes=500, overflow="resource").format(
+            "get_knowledge_graph", GRAPH
+        )
+        summary = json.loads(content[0].text)
+        assert summary["summary"]["nodes"]["length"] == 200
+        assert json.loads(content[1].resource.text) == GRAPH
+
+    def test_structured_content(self):
+        """Test that dict results can be returned as structured content."""
+        content, structured = ResultFormatter(structured=True).format("get_health", {"ok": True})
+        assert structured == {"ok": True}
+        assert content[0].text == '{"ok":true}'
+
+    def test_invalid_overflow(self):
+        """Test that unknown overflow modes are rejected."""
+        with pytest.raises(ValueError):
+            ResultFormatter(overflow="drop")
+
+
+class TestServerResults:
+    """Tests for result serialization in the server."""
+
+    async def test_call_tool_returns_json(self, monkeypatch):
+        """Test that tool results are JSON rather than a Python repr."""
+        server = create_server()
+
+        async def get_health():
+            return {"status": "healthy", "ready": True, "version": None}
+
+        monkeypatch.setattr(server.client, "get_health", get_health)
+        result = await server._call_tool("get_health", {})
+        assert json.loads(result[0].text) == {"status": "healthy", "ready": True, "version": None}
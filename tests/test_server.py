@@ -1,5 +1,8 @@
 """Tests for LightRAG MCP Server."""
 
+import subprocess
+import sys
+
 import pytest
 from lightrag_mcp_server import create_server
 
@@ -25,6 +28,42 @@ class TestServer:
         assert server is not None
         assert server.server_url == "http://localhost:9621"
 
+    def test_stream_and_result_budgets(self, monkeypatch):
+        """Test that the streaming cap follows the result budget unless set on its own."""
+        monkeypatch.setenv("LIGHTRAG_RESULT_MAX_BYTES", "1000")
+        monkeypatch.delenv("LIGHTRAG_STREAM_MAX_BYTES", raising=False)
+        assert create_server().client.stream_max_bytes == 1000
+        monkeypatch.setenv("LIGHTRAG_STREAM_MAX_BYTES", "50")
+        server = create_server()
+        assert server.client.stream_max_bytes == 50
+        assert server.formatter.max_bytes == 1000
+
+
+class TestStartup:
+    """Tests for startup cost."""
+
+    def test_package_import_is_lazy(self):
+        """Test that importing the package does not pull in MCP or httpx."""
+        code = (
+            "import sys, lightrag_mcp_server; "
+            "print(any(m in sys.modules for m in ('mcp', 'httpx')))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert output.stdout.strip() == "False"
+
+    def test_http_client_created_on_first_use(self):
+        """Test that constructing the server does not build the HTTP client."""
+        server = create_server()
+        assert server.client._client is None
+        assert server.client.client is server.client.client
+
+    def test_tool_catalog_is_cached(self):
+        """Test that the tool list is built once."""
+        server = create_server()
+        assert server.tools.list_tools() is server.tools.list_tools()
+
 
 class TestClient:
     """Tests for LightRAG client."""
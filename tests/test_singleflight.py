@@ -0,0 +1,84 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+
+import httpx
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    async def test_concurrent_calls_share_result(self):
+        """Test that concurrent callers with one key share a single call."""
+        group = SingleFlight()
+        started = []
+
+        async def fetch():
+            started.append(1)
+            await asyncio.sleep(0.01)
+            return {"ok": True}
+
+        results = await asyncio.gather(*(group.do("k", fetch) for _ in range(5)))
+        assert results == [{"ok": True}] * 5
+        assert len(started) == 1
+        assert group.stats() == {"calls": 5, "coalesced": 4, "abandoned": 0, "in_flight": 0}
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that one caller going away leaves the shared call running."""
+        group = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return 42
+
+        first = asyncio.ensure_future(group.do("k", fetch))
+        second = asyncio.ensure_future(group.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 42
+
+    async def test_call_cancelled_when_every_caller_leaves(self):
+        """Test that the shared call stops once its last caller is cancelled."""
+        group = SingleFlight()
+        cancelled = []
+
+        async def fetch():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        callers = [asyncio.ensure_future(group.do("k", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        assert cancelled == [True]
+        assert group.stats()["abandoned"] == 1 and group.stats()["in_flight"] == 0
+
+
+class TestClientSingleFlight:
+    """Tests for coalescing in LightRAGClient."""
+
+    async def test_concurrent_graph_reads_coalesce(self):
+        """Test that identical GETs in flight together hit the backend once."""
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"nodes": []})
+
+        client = LightRAGClient(base_url="http://lightrag.test")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        results = await asyncio.gather(
+            *(client.get_knowledge_graph() for _ in range(3)),
+            client.get_graph_structure(),
+        )
+        assert results[0] == {"nodes": []}
+        assert sorted(calls) == ["/graph", "/graph/structure"]
+        assert client.single_flight.stats()["coalesced"] == 2
@@ -0,0 +1,89 @@
+"""Tests for incremental query streaming."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+from mcp.server.lowlevel.server import request_ctx
+
+from lightrag_mcp_server import create_server
+from lightrag_mcp_server.client import LightRAGClient
+
+
+def streaming_client(lines, gate=None):
+    """Create a client whose /query endpoint streams the given lines."""
+
+    async def body():
+        for i, line in enumerate(lines):
+            if gate is not None and i == 1:
+                await gate.wait()
+            yield (line + "\n").encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body())
+
+    client = LightRAGClient(base_url="http://lightrag.test")
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestQueryStream:
+    """Tests for LightRAGClient streaming."""
+
+    async def test_frames_arrive_before_body_completes(self):
+        """Test that the first frame is yielded before the rest is produced."""
+        gate = asyncio.Event()
+        client = streaming_client(
+            [json.dumps({"response": "Hello"}), json.dumps({"response": " world"})],
+            gate=gate,
+        )
+        frames = client.query_stream("q")
+        first = await frames.__anext__()
+        assert first == {"response": "Hello"}
+        gate.set()
+        rest = [frame async for frame in frames]
+        assert rest == [{"response": " world"}]
+
+    async def test_sse_frames(self):
+        """Test that SSE data lines are decoded."""
+        client = streaming_client(
+            ["event: message", 'data: {"response": "A"}', "", "data: B", "data: [DONE]"]
+        )
+        assert await client.query_text_stream("q") == "AB"
+
+    async def test_plain_text_keeps_line_breaks(self):
+        """Test that a plain-text answer keeps its newlines, blank lines and indentation."""
+        lines = ["Steps:", "", "  1. install", "  2. run {\"x\": 1}", "", "{\"not\": \"a frame\"}"]
+        client = streaming_client(lines)
+        assert await client.query_text_stream("q") == "\n".join(lines) + "\n"
+
+
+class TestServerStreamProgress:
+    """Tests for progress forwarding in the query_text_stream tool."""
+
+    async def test_chunks_sent_as_progress(self):
+        """Test that each chunk is forwarded as a progress notification."""
+        sent = []
+
+        class Session:
+            async def send_progress_notification(self, **kwargs):
+                sent.append(kwargs)
+
+        server = create_server()
+        server.client = streaming_client(
+            [json.dumps({"response": "Hel"}), json.dumps({"response": "lo"})]
+        )
+        ctx = SimpleNamespace(
+            request_id=7,
+            meta=SimpleNamespace(progressToken="tok"),
+            session=Session(),
+        )
+        token = request_ctx.set(ctx)
+        try:
+            result = await server._query_text_stream({"query": "q"})
+        finally:
+            request_ctx.reset(token)
+        assert result == "Hello"
+        assert [n["message"] for n in sent] == ["Hel", "lo"]
+        assert sent[0]["progress_token"] == "tok"
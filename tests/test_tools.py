@@ -0,0 +1,83 @@
+"""Tests for the tool registry and dispatcher."""
+
+import httpx
+
+from lightrag_mcp_server import create_server
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.tools import TOOLS
+
+
+class FakeClient:
+    """Record the keyword arguments of client calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, method):
+        async def call(**kwargs):
+            self.calls.append((method, kwargs))
+            return {"method": method}
+
+        return call
+
+
+class TestToolRegistry:
+    """Tests for registry-based dispatch."""
+
+    def test_every_tool_is_bound(self):
+        """Test that every spec resolves to an implementation at startup."""
+        server = create_server()
+        names = [tool.name for tool in server.tools.list_tools()]
+        assert len(names) == len(set(names)) == len(TOOLS)
+        assert all(server.tools.get(name) is not None for name in names)
+
+    async def test_arguments_bound_with_schema_defaults(self, monkeypatch):
+        """Test that optional arguments fall back to schema defaults."""
+        server = create_server()
+        client = FakeClient()
+        monkeypatch.setattr(server.client, "query_text", client.query_text)
+        await server._call_tool("query_text", {"query": "q", "top_k": 5})
+        assert client.calls == [
+            (
+                "query_text",
+                {
+                    "query": "q",
+                    "mode": "hybrid",
+                    "only_need_context": False,
+                    "top_k": 5,
+                    "max_tokens": None,
+                },
+            )
+        ]
+
+    async def test_replaced_client_is_used(self):
+        """Test that tools call the client set on the server after startup."""
+        sent = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request.url.path)
+            return httpx.Response(200, json={"status": "healthy"})
+
+        server = create_server(server_url="http://stale.test")
+        old = server.client
+        server.client = LightRAGClient(base_url="http://lightrag.test")
+        server.client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = await server._call_tool("get_health", {})
+        assert "healthy" in result[0].text
+        assert sent == ["/health"]
+        await server.client.close()
+        await old.close()
+
+    async def test_invalid_arguments_rejected(self):
+        """Test that arguments are validated before dispatch."""
+        server = create_server()
+        result = await server._call_tool("query_text", {"mode": "hybrid"})
+        assert result[0].text.startswith("Invalid arguments for query_text")
+        result = await server._call_tool("query_text", {"query": "q", "mode": "bogus"})
+        assert result[0].text.startswith("Invalid arguments for query_text")
+
+    async def test_unknown_tool(self):
+        """Test the response for an unregistered tool."""
+        server = create_server()
+        result = await server._call_tool("no_such_tool", {})
+        assert result[0].text == "Unknown tool: no_such_tool"
@@ -0,0 +1,134 @@
+"""Tests for tracing spans and exporters."""
+
+import asyncio
+import json
+
+import httpx
+
+from lightrag_mcp_server import create_server
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.tracing import (
+    InMemoryExporter,
+    JsonFileExporter,
+    Span,
+    Tracer,
+    create_tracer,
+    http_phases,
+)
+
+
+class TestSpans:
+    """Tests for Span, phases and exporters."""
+
+    def test_nested_spans_share_trace(self):
+        """Test parent links and that errors are recorded before re-raising."""
+        exporter = InMemoryExporter()
+        tracer = Tracer(exporter)
+        try:
+            with tracer.span("outer") as outer:
+                with tracer.span("inner") as inner:
+                    raise ValueError("boom")
+        except ValueError:
+            pass
+        assert inner.trace_id == outer.trace_id
+        assert inner.parent_id == outer.span_id
+        assert [s.name for s in exporter.spans] == ["inner", "outer"]
+        assert inner.status == outer.status == "error"
+        assert inner.events[0]["attributes"]["exception.message"] == "boom"
+
+    def test_http_phases(self):
+        """Test that trace marks are split into request phases."""
+        span = Span("GET /health", start_ns=0)
+        for event, at in [
+            ("connection.connect_tcp.started", 10),
+            ("connection.connect_tcp.complete", 30),
+            ("http11.send_request_headers.started", 30),
+            ("http11.send_request_body.complete", 35),
+            ("http11.receive_response_headers.complete", 80),
+            ("http11.receive_response_body.started", 80),
+            ("http11.receive_response_body.complete", 90),
+        ]:
+            span.marks[event] = at
+        assert http_phases(span) == [
+            ("pool_wait", 0, 10),
+            ("connect", 10, 30),
+            ("send", 30, 35),
+            ("ttfb", 35, 80),
+            ("body", 80, 90),
+        ]
+
+    def test_json_file_exporter(self, tmp_path):
+        """Test that spans are appended as JSON lines."""
+        path = tmp_path / "traces.jsonl"
+        tracer = create_tracer("json", str(path))
+        assert isinstance(tracer.exporter, JsonFileExporter)
+        with tracer.span("work", {"items": 3}):
+            pass
+        tracer.close()
+        (line,) = path.read_text().splitlines()
+        record = json.loads(line)
+        assert record["name"] == "work"
+        assert record["attributes"] == {"items": 3}
+        assert record["duration_ms"] >= 0
+
+    def test_disabled_tracer(self):
+        """Test that a tracer without exporter records nothing."""
+        with Tracer().span("noop") as span:
+            assert span is None
+
+
+class TestRequestTracing:
+    """Tests for spans around tool calls and HTTP requests."""
+
+    async def test_tool_call_propagates_trace_context(self):
+        """Test tool, request and serialize spans and the traceparent header."""
+        sent = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request.headers.get("traceparent"))
+            return httpx.Response(200, json={"status": "ok"})
+
+        exporter = InMemoryExporter()
+        server = create_server()
+        server.client.tracer = Tracer(exporter)
+        server.client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await server._call_tool("get_health", {})
+
+        spans = {span.name: span for span in exporter.spans}
+        tool, request = spans["tool get_health"], spans["GET /health"]
+        assert request.parent_id == tool.span_id
+        assert spans["serialize"].parent_id == tool.span_id
+        assert request.attributes["http.response.status_code"] == 200
+        assert tool.attributes["mcp.tool.outcome"] == "ok"
+        assert sent == [request.traceparent]
+
+    async def test_request_phases_over_a_socket(self):
+        """Test that a real connection produces pool wait, send and TTFB spans."""
+
+        async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            await asyncio.sleep(0.01)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: 2\r\nConnection: close\r\n\r\n{}"
+            )
+            await writer.drain()
+            writer.close()
+
+        listener = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        exporter = InMemoryExporter()
+        client = LightRAGClient(base_url=f"http://127.0.0.1:{port}", tracer=Tracer(exporter))
+        try:
+            await client.get_health()
+        finally:
+            await client.close()
+            listener.close()
+            await listener.wait_closed()
+
+        names = [span.name for span in exporter.spans]
+        assert names[-1] == "GET /health"
+        assert {"pool_wait", "connect", "send", "ttfb", "body"} <= set(names)
+        ttfb = next(span for span in exporter.spans if span.name == "ttfb")
+        assert ttfb.end_ns - ttfb.start_ns >= 5_000_000
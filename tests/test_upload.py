@@ -0,0 +1,71 @@
+"""Tests for streaming multipart uploads."""
+
+import asyncio
+
+import httpx
+
+from lightrag_mcp_server.client import LightRAGClient
+from lightrag_mcp_server.upload import MultipartUpload
+
+
+class TestMultipartUpload:
+    """Tests for MultipartUpload."""
+
+    async def test_body_matches_content_length(self, tmp_path):
+        """Test that the streamed body is chunked and has the declared length."""
+        path = tmp_path / "doc.txt"
+        path.write_bytes(b"x" * 10_000)
+        progress = []
+        upload = MultipartUpload(
+            str(path),
+            fields={"chunk_size": 512, "chunk_overlap": None},
+            chunk_size=4096,
+            progress=lambda p, sent, total: progress.append(sent),
+        )
+        body = b"".join([chunk async for chunk in upload])
+        assert len(body) == int(upload.headers["Content-Length"])
+        assert b'name="chunk_size"\r\n\r\n512' in body
+        assert b"chunk_overlap" not in body
+        assert b'filename="doc.txt"' in body
+        assert progress == [4096, 8192, 10_000]
+
+
+class TestClientUpload:
+    """Tests for uploads through LightRAGClient."""
+
+    async def test_upload_documents_bounded_concurrency(self, tmp_path):
+        """Test that uploads run concurrently but never exceed the limit."""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"doc{i}.txt"
+            path.write_text(f"document {i}")
+            paths.append(str(path))
+
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await request.aread()
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if not request.headers["Content-Type"].startswith("multipart/form-data"):
+                # Paths that are not local files are sent as JSON for the server to resolve
+                return httpx.Response(404, json={"detail": "file not found"})
+            return httpx.Response(200, json={"status": "success"})
+
+        client = LightRAGClient(base_url="http://lightrag.test")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        done = []
+        result = await client.upload_documents(
+            paths + [str(tmp_path / "missing.txt")],
+            max_concurrency=2,
+            progress=lambda p, sent, total: done.append(p) if sent == total else None,
+        )
+        assert peak == 2
+        assert result["uploaded"] == 6
+        assert result["failed"] == 1
+        assert result["status"] == "partial_success"
+        assert sorted(done) == sorted(paths)